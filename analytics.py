@@ -0,0 +1,348 @@
+"""
+Corpus analytics over many job postings
+
+Extracts every posting in a corpus (a folder, a JSONL stream or a large
+dump) one at a time and aggregates what the market asks for:
+
+- must_haves / nice_to_haves: The most frequent requirements
+- metrics: The most frequent success metrics, without their threshold
+- metric_thresholds: The most frequent thresholds (``≥ 5%``), plus their
+  minimum, maximum and mean
+- milestones: The most frequent milestone durations (``Day 1-30`` is 30
+  days, a single ``Week 2`` is 14 days), plus the same statistics in days
+
+Counts are postings, not mentions: a requirement listed twice in one
+posting counts once. Memory stays bounded however large the corpus: each
+field counts into a Count-Min sketch (a fixed grid of counters that may
+overestimate but never underestimates) and keeps only its ``top`` most
+frequent items in a heap. Requirements are compared lower-cased with
+whitespace collapsed.
+
+Usage:
+    python cli.py --input-dir ./postings --analytics market.json
+    python cli.py --input-jsonl postings.jsonl --analytics market.json --top 50
+    python cli.py --input-dump export.txt --analytics -
+
+    analytics = CorpusAnalytics(top=20)
+    for text in postings:
+        analytics.add_text(text)
+    print(format_report(analytics.report()))
+"""
+
+import hashlib
+import heapq
+import math
+import os
+import re
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from genai_agent import BULLET_PATTERN, BULLET_SECTIONS, JobDescriptionSummarizer
+
+
+DEFAULT_TOP = 20
+# 2048 x 4 counters per field: estimates are within e/2048 (0.13%) of the
+# number of postings of the true count with probability 1 - e^-4 (98%).
+DEFAULT_WIDTH = 2048
+DEFAULT_DEPTH = 4
+
+FIELDS = ('must_haves', 'nice_to_haves', 'metrics', 'metric_thresholds', 'milestones')
+
+# Days per timeline unit; months are counted as 30 days.
+UNIT_DAYS = {'day': 1, 'week': 7, 'month': 30}
+
+# Fragments the bullet pattern used to pick out of each section's own
+# heading ("Haves" from "Must-Haves"). Results written before the extractor
+# skipped heading lines start with them; requirement_bullets drops them.
+LEGACY_HEADING_FRAGMENTS = {
+    field: tuple(fragment.strip().lower() for fragment in BULLET_PATTERN.findall(heading))
+    for field, (heading, _) in BULLET_SECTIONS.items()
+}
+
+_METRIC_ENTRY = re.compile(r"(\d+)% (.*)", re.DOTALL)
+_TIMELINE_ENTRY = re.compile(r"(\w+) (\d+)(?:-(\d+))?:")
+_WHITESPACE = re.compile(r"\s+")
+
+# (record id, posting text, error): the tuples streaming.iter_records yields
+Record = Tuple[Any, Optional[str], Optional[str]]
+
+
+def normalize(item: str) -> str:
+    """Lower-case ``item``, collapse its whitespace and trim trailing punctuation."""
+    return _WHITESPACE.sub(" ", item).strip().rstrip(".,;:").lower()
+
+
+def requirement_bullets(extracted_info: Dict[str, Any], field: str) -> List[str]:
+    """``extracted_info[field]``, minus the heading fragments older results start with.
+
+    Only a run of fragments matching the field's own heading, at the start,
+    is dropped; a one-word requirement anywhere else is kept.
+    """
+    bullets = list(extracted_info.get(field) or ())
+    fragments = LEGACY_HEADING_FRAGMENTS.get(field, ())
+    if fragments and tuple(b.strip().lower() for b in bullets[:len(fragments)]) == fragments:
+        del bullets[:len(fragments)]
+    return bullets
+
+
+class CountMinSketch:
+    """Approximate counts of arbitrarily many distinct strings in fixed memory.
+
+    ``estimate`` never undercounts; it overcounts by at most
+    ``error_bound()`` with probability ``1 - e^-depth``.
+    """
+
+    __slots__ = ('width', 'depth', 'total', '_rows')
+
+    def __init__(self, width: int = DEFAULT_WIDTH, depth: int = DEFAULT_DEPTH):
+        if width < 1 or not 1 <= depth <= 8:
+            raise ValueError("width must be positive and depth between 1 and 8")
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        self._rows = [array('Q', bytes(8 * width)) for _ in range(depth)]
+
+    def _columns(self, item: str) -> Iterator[int]:
+        # Two 64-bit halves of one hash give every row its own column
+        # (Kirsch-Mitzenmacher), so each item is hashed once.
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + row * h2) % self.width for row in range(self.depth))
+
+    def add(self, item: str, count: int = 1) -> int:
+        """Count ``item`` ``count`` more times; return its new estimate."""
+        self.total += count
+        estimate = None
+        for row, column in zip(self._rows, self._columns(item)):
+            row[column] += count
+            if estimate is None or row[column] < estimate:
+                estimate = row[column]
+        return estimate
+
+    def estimate(self, item: str) -> int:
+        return min(row[column] for row, column in zip(self._rows, self._columns(item)))
+
+    def error_bound(self) -> float:
+        """Largest likely overcount for any item at the current total."""
+        return math.e / self.width * self.total
+
+
+class TopK:
+    """The ``k`` most frequent items of a stream, counted in a Count-Min sketch.
+
+    Only ``k`` candidates are kept. A new item replaces the least frequent
+    candidate once its estimate is higher, so an item frequent overall is
+    found even if it first appears late in the stream.
+    """
+
+    def __init__(self, k: int = DEFAULT_TOP, sketch: Optional[CountMinSketch] = None):
+        self.k = k
+        self.sketch = sketch or CountMinSketch()
+        self._counts: Dict[str, int] = {}
+        # Min-heap of (estimate, item); entries no longer matching _counts are stale
+        self._heap: List[Tuple[int, str]] = []
+
+    def add(self, item: str, count: int = 1):
+        estimate = self.sketch.add(item, count)
+        if item not in self._counts and len(self._counts) >= self.k:
+            if self.k == 0 or estimate <= self._least():
+                return
+            del self._counts[heapq.heappop(self._heap)[1]]
+        self._counts[item] = estimate
+        heapq.heappush(self._heap, (estimate, item))
+        if len(self._heap) > 4 * self.k + 16:
+            self._heap = [(count, item) for item, count in self._counts.items()]
+            heapq.heapify(self._heap)
+
+    def _least(self) -> int:
+        """Smallest candidate estimate; drops stale heap entries from the top."""
+        while self._counts.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return self._heap[0][0]
+
+    def most_common(self, n: Optional[int] = None) -> List[Tuple[str, int]]:
+        """``(item, estimated count)`` pairs, most frequent first."""
+        ranked = sorted(self._counts.items(), key=lambda pair: (-pair[1], pair[0]))
+        return ranked if n is None else ranked[:n]
+
+
+class RunningStats:
+    """Count, minimum, maximum and mean of a stream of numbers."""
+
+    __slots__ = ('count', 'total', 'minimum', 'maximum')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.minimum: Optional[float] = None
+        self.maximum: Optional[float] = None
+
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'min': self.minimum,
+            'max': self.maximum,
+            'mean': round(self.total / self.count, 2) if self.count else None,
+        }
+
+
+def milestone_days(entry: str) -> Optional[int]:
+    """Duration in days of one ``extracted_info["timeline"]`` entry, if it has one.
+
+    ``"Day 31-60: ..."`` spans 30 days; ``"Week 2: ..."`` is 14 days from the start.
+    """
+    match = _TIMELINE_ENTRY.match(entry)
+    if match is None:
+        return None
+    unit, start, end = match.groups()
+    days = UNIT_DAYS.get(unit.lower())
+    if days is None:
+        return None
+    span = int(end) - int(start) + 1 if end else int(start)
+    return span * days if span > 0 else None
+
+
+class CorpusAnalytics:
+    """Bounded-memory aggregate of the extracted information of many postings."""
+
+    def __init__(self, top: int = DEFAULT_TOP, width: int = DEFAULT_WIDTH,
+                 depth: int = DEFAULT_DEPTH,
+                 summarizer: Optional[JobDescriptionSummarizer] = None):
+        self.top = top
+        self.summarizer = summarizer or JobDescriptionSummarizer()
+        self.documents = 0
+        self.failed = 0
+        self.fields = {name: TopK(top, CountMinSketch(width, depth)) for name in FIELDS}
+        self.thresholds = RunningStats()
+        self.durations = RunningStats()
+
+    def add_text(self, job_text: str):
+        """Extract one posting and add it."""
+        self.add(self.summarizer.extract_key_information(job_text))
+
+    def add(self, extracted_info: Dict[str, Any]):
+        """Add one posting's ``extract_key_information`` output."""
+        self.documents += 1
+        found: Dict[str, set] = {name: set() for name in FIELDS}
+
+        for field in BULLET_SECTIONS:
+            for bullet in requirement_bullets(extracted_info, field):
+                item = normalize(bullet)
+                if item:
+                    found[field].add(item)
+
+        for entry in extracted_info['metrics']:
+            match = _METRIC_ENTRY.match(entry)
+            if match is None:
+                continue
+            value, description = match.groups()
+            found['metrics'].add(normalize(description))
+            if f"≥ {value}%" not in found['metric_thresholds']:
+                found['metric_thresholds'].add(f"≥ {value}%")
+                self.thresholds.add(int(value))
+
+        for entry in extracted_info['timeline']:
+            days = milestone_days(entry)
+            if days is not None and f"{days} days" not in found['milestones']:
+                found['milestones'].add(f"{days} days")
+                self.durations.add(days)
+
+        for name, items in found.items():
+            for item in items:
+                self.fields[name].add(item)
+
+    def add_records(self, records: Iterable[Record]) -> "CorpusAnalytics":
+        """Add every posting of ``(record id, text, error)`` tuples; errors are counted."""
+        for _, job_text, error in records:
+            if error is not None:
+                self.failed += 1
+                continue
+            try:
+                self.add_text(job_text)
+            except Exception:
+                self.failed += 1
+        return self
+
+    def report(self) -> Dict[str, Any]:
+        """Counts so far, as a JSON-ready dict."""
+        sketch = self.fields['must_haves'].sketch
+        return {
+            'documents': self.documents,
+            'failed': self.failed,
+            'top': self.top,
+            'sketch': {'width': sketch.width, 'depth': sketch.depth},
+            'fields': {
+                name: {
+                    'mentions': topk.sketch.total,
+                    'max_overcount': math.floor(topk.sketch.error_bound()),
+                    'most_common': [{'item': item, 'postings': count}
+                                    for item, count in topk.most_common()],
+                }
+                for name, topk in self.fields.items()
+            },
+            'metric_thresholds': self.thresholds.to_dict(),
+            'milestone_days': self.durations.to_dict(),
+        }
+
+
+def iter_directory(input_dir: str, pattern: str = "*.txt") -> Iterator[Record]:
+    """``(path, text, error)`` for every matching file, read one at a time."""
+    from batch import discover_inputs
+    from cli import read_job_description
+
+    for path in discover_inputs(input_dir, pattern):
+        try:
+            yield str(path), read_job_description(str(path)), None
+        except Exception as e:
+            yield str(path), None, f"{type(e).__name__}: {e}"
+
+
+def iter_jsonl(input_path: str, text_field: str = 'text', id_field: str = 'id'
+               ) -> Iterator[Record]:
+    """``(id, text, error)`` for every line of a JSONL file (``-`` for stdin)."""
+    from streaming import iter_records, open_stream
+
+    with open_stream(input_path, 'r') as f:
+        yield from iter_records(f, text_field, id_field)
+
+
+def iter_dump(input_path: str, separator=None) -> Iterator[Record]:
+    """``(id, text, error)`` for every posting of a concatenated dump (see ``chunking``)."""
+    from chunking import DEFAULT_SEPARATOR, MAX_POSTING_BYTES, find_postings, map_file
+
+    name = os.path.basename(input_path)
+    with map_file(input_path) as buf:
+        for n, (start, end) in enumerate(find_postings(buf, separator or DEFAULT_SEPARATOR),
+                                         start=1):
+            record_id = f"{name}#{n}"
+            if end - start > MAX_POSTING_BYTES:
+                yield record_id, None, f"ValueError: posting is {end - start} bytes"
+                continue
+            try:
+                yield record_id, buf[start:end].decode('utf-8'), None
+            except UnicodeDecodeError as e:
+                yield record_id, None, f"UnicodeDecodeError: {e}"
+
+
+def format_report(report: Dict[str, Any], limit: int = 10) -> str:
+    """Render a :meth:`CorpusAnalytics.report` as plain text, ``limit`` items per field."""
+    lines = [f"== corpus: {report['documents']} postings "
+             f"({report['failed']} failed) =="]
+    for name, field in report['fields'].items():
+        lines.append(f"\n{name} ({field['mentions']} mentions, "
+                     f"counts may exceed by {field['max_overcount']})")
+        for entry in field['most_common'][:limit]:
+            lines.append(f"{entry['postings']:>8}  {entry['item']}")
+    for name in ('metric_thresholds', 'milestone_days'):
+        stats = report[name]
+        if stats['count']:
+            lines.append(f"\n{name}: min {stats['min']}, max {stats['max']}, "
+                         f"mean {stats['mean']} over {stats['count']}")
+    return "\n".join(lines)
@@ -0,0 +1,309 @@
+"""
+Batch (corpus) mode for the GenAI Agent
+
+Runs the complete workflow over many job description files, spreading the
+documents across a process pool. Each document gets its own output folder
+(same layout as a single ``cli.py --input`` run) and a ``manifest.json``
+records every success and failure. A document that cannot be read or
+processed is recorded as failed; it never stops the rest of the batch.
+
+With deduplication on, exact and near-duplicate documents (see ``dedup``)
+are only processed once per cluster; the other members get a copy of the
+representative's results plus the lines in which they differ.
+
+With a bundle path, workers send their results back and the main process
+writes every document into that one file instead (see ``output_sinks``);
+each document's former output folder becomes its key in the bundle.
+
+Usage:
+    python cli.py --input-dir ./postings --glob "**/*.txt" --jobs 8 -o ./results
+    python cli.py --input-dir ./postings --dedup -o ./results
+    python cli.py --input-dir ./postings --bundle ./results/corpus.tar.gz
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from cli import read_job_description, save_results
+from dedup import Deduplicator, Match, line_differences
+from genai_agent import GenAIAgent
+from output_sinks import BundleSink
+
+
+MANIFEST_NAME = "manifest.json"
+
+# One warm agent per worker process, created by _init_worker.
+_worker_agent: Optional[GenAIAgent] = None
+# Whether workers return results to the main process instead of saving them.
+_worker_returns_results = False
+# Whether saved JSON files are indented.
+_worker_pretty = False
+# Search index that workers add results to (search_index.ResultIndex), and
+# the batch output folder its keys are relative to.
+_worker_index = None
+_worker_output_dir = ''
+
+
+def discover_inputs(input_dir: str, pattern: str = "*.txt") -> List[Path]:
+    """Return the files under ``input_dir`` matching ``pattern``, sorted."""
+    root = Path(input_dir)
+    return sorted(path for path in root.glob(pattern) if path.is_file())
+
+
+def plan_outputs(inputs: List[Path], input_dir: str, output_dir: str) -> List[Tuple[Path, Path]]:
+    """Map every input file to its own output folder.
+
+    Folders mirror the input's path relative to ``input_dir`` without the
+    file suffix; if two inputs would collide (``a.txt`` and ``a.md``) the
+    full file name is used instead (``a_txt``), with a numeric suffix
+    (``a_txt_2``) if that is taken too.
+    """
+    root = Path(input_dir)
+    out_root = Path(output_dir)
+    relative = [path.relative_to(root) for path in inputs]
+    stems = [rel.with_suffix('') for rel in relative]
+
+    seen: Dict[Path, int] = {}
+    for stem in stems:
+        seen[stem] = seen.get(stem, 0) + 1
+
+    taken = {stem for stem in stems if seen[stem] == 1}
+    plan = []
+    for path, rel, stem in zip(inputs, relative, stems):
+        target = stem
+        if seen[stem] > 1:
+            renamed = rel.parent / rel.name.replace('.', '_')
+            target, n = renamed, 1
+            while target in taken:
+                n += 1
+                target = renamed.with_name(f"{renamed.name}_{n}")
+            taken.add(target)
+        plan.append((path, out_root / target))
+    return plan
+
+
+def _init_worker(cache=None, return_results=False, pretty=False, index=None, output_dir=''):
+    """Create the per-process agent once, before any document arrives."""
+    global _worker_agent, _worker_returns_results, _worker_pretty
+    global _worker_index, _worker_output_dir
+    _worker_agent = GenAIAgent(cache=cache)
+    _worker_returns_results = return_results
+    _worker_pretty = pretty
+    _worker_index = index
+    _worker_output_dir = output_dir
+
+
+def _process_document(task: Tuple[Path, Path]) -> Dict[str, Any]:
+    """Run the workflow for one document and return its manifest entry.
+
+    Never raises for document-level problems: any error is captured in the
+    returned entry so the pool keeps going.
+    """
+    input_path, output_path = task
+    started = time.perf_counter()
+    entry: Dict[str, Any] = {
+        'input': str(input_path),
+        'output_dir': str(output_path),
+    }
+    try:
+        agent = _worker_agent if _worker_agent is not None else GenAIAgent()
+        job_text = read_job_description(str(input_path))
+        hits = agent.cache.hits if agent.cache is not None else 0
+        results = agent.run_complete_workflow(job_text)
+        if _worker_returns_results:
+            entry['results'] = results
+        else:
+            save_results(results, str(output_path), verbose=False, pretty=_worker_pretty)
+        if _worker_index is not None:
+            _worker_index.write(_bundle_key(output_path, _worker_output_dir), results)
+        entry['status'] = 'ok'
+        if agent.cache is not None:
+            entry['cache'] = 'hit' if agent.cache.hits > hits else 'miss'
+    except Exception as e:
+        entry['status'] = 'error'
+        entry['error'] = f"{type(e).__name__}: {e}"
+    entry['elapsed_seconds'] = round(time.perf_counter() - started, 6)
+    return entry
+
+
+def _chunksize(total: int, jobs: int) -> int:
+    """Pick a map chunksize that amortizes IPC without starving workers."""
+    return max(1, min(64, total // (jobs * 4) or 1))
+
+
+def _cluster_tasks(tasks: List[Tuple[Path, Path]], threshold: float
+                   ) -> Tuple[List[int], Dict[int, Tuple[Match, Dict[str, List[str]]]]]:
+    """Split tasks into representatives and duplicates.
+
+    Returns the indices of the tasks to process and, for every duplicate
+    index, its :class:`dedup.Match` (whose representative is a task index)
+    and line differences. Unreadable documents are left as representatives
+    so the worker records the error.
+    """
+    dedup = Deduplicator(threshold)
+    texts: Dict[int, str] = {}
+    unique: List[int] = []
+    duplicates: Dict[int, Tuple[Match, Dict[str, List[str]]]] = {}
+    for i, (input_path, _) in enumerate(tasks):
+        try:
+            text = read_job_description(str(input_path))
+        except Exception:
+            unique.append(i)
+            continue
+
+        match = dedup.add(i, text)
+        if match.is_duplicate:
+            duplicates[i] = (match, line_differences(texts[match.representative], text))
+        else:
+            texts[i] = text
+            unique.append(i)
+    return unique, duplicates
+
+
+def _fan_out(task: Tuple[Path, Path], rep_task: Tuple[Path, Path], rep_entry: Dict[str, Any],
+             match: Match, differences: Dict[str, List[str]],
+             rep_results: Optional[Dict[str, Any]] = None, pretty: bool = False,
+             index=None, output_dir: str = '') -> Dict[str, Any]:
+    """Give a duplicate the representative's results and return its manifest entry.
+
+    The representative's results are read back from its output folder
+    unless given as ``rep_results``; with them, the duplicate's results are
+    returned in the entry rather than saved. Saved JSON is indented if
+    ``pretty``; with an ``index`` the results are also indexed.
+    """
+    input_path, output_path = task
+    entry: Dict[str, Any] = {
+        'input': str(input_path),
+        'output_dir': str(output_path),
+        'duplicate_of': str(rep_task[0]),
+        'similarity': round(match.similarity, 4),
+    }
+    try:
+        if rep_entry['status'] != 'ok':
+            raise RuntimeError(f"representative {rep_task[0]} failed")
+        if rep_results is None:
+            with open(Path(rep_task[1]) / "complete_results.json", 'r', encoding='utf-8') as f:
+                results = json.load(f)
+        else:
+            results = dict(rep_results)
+        results.update(duplicate_of=entry['duplicate_of'], similarity=entry['similarity'],
+                       differences=differences)
+        if rep_results is None:
+            save_results(results, str(output_path), verbose=False, pretty=pretty)
+        else:
+            entry['results'] = results
+        if index is not None:
+            index.write(_bundle_key(output_path, output_dir), results)
+        entry['status'] = 'ok'
+    except Exception as e:
+        entry['status'] = 'error'
+        entry['error'] = f"{type(e).__name__}: {e}"
+    return entry
+
+
+def _bundle_key(output_path: Path, output_dir: str) -> str:
+    """Key of a document in a bundle: its output folder relative to ``output_dir``."""
+    try:
+        return Path(output_path).relative_to(output_dir).as_posix()
+    except ValueError:
+        return Path(output_path).as_posix()
+
+
+def _store(entry: Dict[str, Any], key: str, sink: BundleSink) -> Optional[Dict[str, Any]]:
+    """Move a returned entry's results into the bundle; return the results."""
+    results = entry.pop('results', None)
+    del entry['output_dir']
+    entry['bundle_key'] = key
+    if results is not None:
+        sink.write(key, results)
+    return results
+
+
+def run_batch(tasks: Iterable[Tuple[Path, Path]], output_dir: str,
+              jobs: Optional[int] = None, cache=None,
+              dedup_threshold: Optional[float] = None,
+              bundle: Optional[str] = None, pretty: bool = False,
+              index=None) -> Dict[str, Any]:
+    """Process every ``(input, output_folder)`` task and write the manifest.
+
+    ``jobs`` is the number of worker processes (defaults to the CPU count);
+    ``jobs=1`` runs in the current process, which is handy for debugging.
+    ``cache`` is an optional ``cache.ResultCache`` shared by all workers.
+    ``dedup_threshold`` turns on near-duplicate clustering at that
+    similarity (0-1). ``bundle`` is a bundle file path (``.json``,
+    ``.tar.gz``, ``.zip``, ...) that receives all results in place of the
+    output folders. Result JSON is compact unless ``pretty`` is set.
+    ``index`` is a ``search_index.ResultIndex`` that every result is also
+    added to, keyed like bundle entries. Returns the manifest that was written to ``output_dir/manifest.json``.
+    """
+    tasks = list(tasks)
+    jobs = jobs or os.cpu_count() or 1
+    started_at = datetime.now().isoformat()
+    started = time.perf_counter()
+
+    if dedup_threshold is not None:
+        unique, duplicates = _cluster_tasks(tasks, dedup_threshold)
+    else:
+        unique, duplicates = list(range(len(tasks))), {}
+    to_process = [tasks[i] for i in unique]
+
+    by_index: Dict[int, Dict[str, Any]] = {}
+    with ExitStack() as stack:
+        sink = stack.enter_context(BundleSink(bundle, pretty=pretty)) if bundle else None
+        if jobs == 1 or len(to_process) <= 1:
+            _init_worker(cache, sink is not None, pretty, index, output_dir)
+            processed = map(_process_document, to_process)
+        else:
+            pool = stack.enter_context(ProcessPoolExecutor(
+                max_workers=jobs, initializer=_init_worker,
+                initargs=(cache, sink is not None, pretty, index, output_dir)))
+            processed = pool.map(_process_document, to_process,
+                                 chunksize=_chunksize(len(to_process), jobs))
+
+        # Results of representatives with duplicates, kept to fan out from
+        needed = {match.representative for match, _ in duplicates.values()}
+        rep_results: Dict[int, Dict[str, Any]] = {}
+        for i, entry in zip(unique, processed):
+            by_index[i] = entry
+            if sink is not None:
+                results = _store(entry, _bundle_key(tasks[i][1], output_dir), sink)
+                if i in needed and results is not None:
+                    rep_results[i] = results
+
+        for i, (match, differences) in duplicates.items():
+            rep = match.representative
+            entry = _fan_out(tasks[i], tasks[rep], by_index[rep], match, differences,
+                             rep_results.get(rep, {}) if sink is not None else None,
+                             pretty, index, output_dir)
+            if sink is not None:
+                _store(entry, _bundle_key(tasks[i][1], output_dir), sink)
+            by_index[i] = entry
+    entries = [by_index[i] for i in range(len(tasks))]
+
+    failed = [entry for entry in entries if entry['status'] != 'ok']
+    manifest = {
+        'started_at': started_at,
+        'completed_at': datetime.now().isoformat(),
+        'elapsed_seconds': round(time.perf_counter() - started, 6),
+        'jobs': jobs,
+        'total': len(entries),
+        'succeeded': len(entries) - len(failed),
+        'failed': len(failed),
+        'cache_hits': sum(1 for entry in entries if entry.get('cache') == 'hit'),
+        'duplicates': len(duplicates),
+        **({'bundle': str(bundle)} if bundle else {}),
+        'documents': entries,
+    }
+
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    with open(output_path / MANIFEST_NAME, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+
+    return manifest
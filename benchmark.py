@@ -0,0 +1,499 @@
+#!/usr/bin/env python3
+"""
+Benchmark harness for the extraction and email pipeline
+
+Generates synthetic job postings (small through very large, few through
+many bullets), times every pipeline stage and reports latency percentiles,
+throughput and peak memory. Results can be saved as a JSON baseline and
+later runs compared against it; any stage whose median latency grows by
+more than the threshold is flagged as a regression.
+
+Usage:
+    python benchmark.py                                  # all cases, print report
+    python benchmark.py --save bench_baseline.json       # record a baseline
+    python benchmark.py --compare bench_baseline.json    # exit 1 on regression
+    python benchmark.py --cases small-few,large-many --repeat 50
+    python benchmark.py --memory 20000                   # dict vs compact results
+    python benchmark.py --serialization 2000             # JSON encoding throughput
+    python benchmark.py --matching 5000                  # candidate ranking throughput
+"""
+
+import argparse
+import gc
+import json
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import serialization
+from cli import save_results
+from genai_agent import GenAIAgent, JobDescriptionSummarizer
+
+
+# Posting size (filler paragraphs per section) and bullets per list section.
+SIZES = {'small': 1, 'medium': 8, 'large': 64, 'xlarge': 512}
+BULLETS = {'few': 3, 'many': 40}
+
+DEFAULT_CASES = [f"{size}-{bullets}" for size in SIZES for bullets in BULLETS]
+DEFAULT_THRESHOLD = 0.10
+# Changes smaller than this are timer noise, whatever their relative size.
+DEFAULT_MIN_DELTA_MS = 0.05
+
+_WORDS = (
+    "agent workflow latency adoption pipeline prompt model evaluation telemetry "
+    "dashboard executive automation roadmap platform integration review strategy "
+    "python typescript langchain retrieval fine-tune deploy observe ship measure"
+).split()
+
+
+def _sentence(rng: random.Random, words: int = 12) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words)).capitalize() + "."
+
+
+def synthesize_posting(size: str = 'medium', bullets: str = 'few', seed: int = 0) -> str:
+    """Build a deterministic posting with every section the extractor knows.
+
+    ``size`` scales the free text around the sections; ``bullets`` sets how
+    many items the requirement, responsibility and metric lists carry.
+    """
+    rng = random.Random(f"{size}-{bullets}-{seed}")
+    paragraphs = SIZES[size]
+    count = BULLETS[bullets]
+
+    def filler():
+        return "\n".join(" ".join(_sentence(rng) for _ in range(4)) for _ in range(paragraphs))
+
+    def items():
+        return "\n".join(f"* {_sentence(rng, rng.randint(6, 18))}" for _ in range(count))
+
+    timeline = "\n".join(
+        f"* {rng.choice(['Day', 'Week', 'Month'])} {i * 30 + 1}-{i * 30 + 30} — "
+        f"{_sentence(rng, 5)} {_sentence(rng)}"
+        for i in range(count)
+    )
+    metrics = "\n".join(
+        f"* ≥ {rng.randint(1, 95)} % {_sentence(rng, 8)}" for _ in range(count)
+    )
+
+    return "\n\n".join([
+        "Vibe Coder-in-Residence (GenAI Tech EA)",
+        "Mission\n" + filler(),
+        "What You'll Do (First 6 Months)\n" + timeline,
+        "Daily Responsibilities\n" + items(),
+        filler(),
+        "Must-Haves\n" + items(),
+        "Nice-to-Haves\n" + items(),
+        "Success Metrics\n" + metrics,
+        filler(),
+    ]) + "\n"
+
+
+def _stage_callables(job_text: str, workdir: str) -> Dict[str, Callable[[], Any]]:
+    """Return the zero-argument callables timed for one posting."""
+    summarizer = JobDescriptionSummarizer()
+    agent = GenAIAgent()
+    extracted = summarizer.extract_key_information(job_text)
+    results = agent.run_complete_workflow(job_text)
+
+    return {
+        'extract_key_information': lambda: summarizer.extract_key_information(job_text),
+        '_extract_section': lambda: summarizer._extract_section(
+            job_text, "Must-Haves", "Nice-to-Haves"),
+        'generate_summary': lambda: summarizer.generate_summary(job_text, extracted),
+        'generate_intro_email': lambda: agent.generate_vp_intro_email(results['job_summary']),
+        'save_results': lambda: save_results(results, workdir, verbose=False),
+        'run_complete_workflow': lambda: agent.run_complete_workflow(job_text),
+    }
+
+
+def percentile(samples: List[float], q: float) -> float:
+    """Linear-interpolated percentile of ``samples`` (``q`` in 0..100)."""
+    ordered = sorted(samples)
+    if len(ordered) == 1:
+        return ordered[0]
+    position = (len(ordered) - 1) * q / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def _time_stage(fn: Callable[[], Any], repeat: int, warmup: int) -> List[float]:
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            fn()
+            samples.append(time.perf_counter() - started)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return samples
+
+
+def _peak_memory(fn: Callable[[], Any]) -> int:
+    """Peak bytes allocated by Python while running ``fn`` once."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def benchmark_case(case: str, repeat: int = 20, warmup: int = 2,
+                   stages: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Benchmark every stage on one synthetic posting (``"<size>-<bullets>"``)."""
+    size, bullets = case.split('-')
+    job_text = synthesize_posting(size, bullets)
+    input_bytes = len(job_text.encode('utf-8'))
+    workdir = tempfile.mkdtemp(prefix='genai-bench-')
+
+    try:
+        callables = _stage_callables(job_text, workdir)
+        report = {}
+        for name, fn in callables.items():
+            if stages and name not in stages:
+                continue
+            samples = _time_stage(fn, repeat, warmup)
+            mean = statistics.fmean(samples)
+            report[name] = {
+                'p50_ms': percentile(samples, 50) * 1000,
+                'p90_ms': percentile(samples, 90) * 1000,
+                'p99_ms': percentile(samples, 99) * 1000,
+                'mean_ms': mean * 1000,
+                'ops_per_sec': 1.0 / mean if mean else float('inf'),
+                'mb_per_sec': input_bytes / mean / 1e6 if mean else float('inf'),
+                'peak_memory_bytes': _peak_memory(fn),
+            }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {'input_bytes': input_bytes, 'stages': report}
+
+
+def run_benchmarks(cases: Optional[List[str]] = None, repeat: int = 20, warmup: int = 2,
+                   stages: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Run every case and return a JSON-serializable report."""
+    return {
+        'created_at': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': repeat,
+        'cases': {case: benchmark_case(case, repeat, warmup, stages)
+                  for case in (cases or DEFAULT_CASES)},
+    }
+
+
+def memory_benchmark(count: int = 10000, case: str = 'small-few') -> Dict[str, Any]:
+    """Memory retained by ``count`` analyses held at once, dicts against ``results`` types.
+
+    Every posting is distinct and dropped after analysis, so only what the
+    results keep alive is counted (including the list holding them).
+    """
+    size, bullets = case.split('-')
+    agent = GenAIAgent()
+    variants = {
+        'dict': agent.analyze_job_description,
+        'compact': agent.analyze,
+        'compact_with_text': lambda text: agent.analyze(text, keep_text=True),
+    }
+
+    report: Dict[str, Any] = {'count': count, 'case': case, 'variants': {}}
+    for name, analyze in variants.items():
+        gc.collect()
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            held = [analyze(synthesize_posting(size, bullets, seed=i)) for i in range(count)]
+            gc.collect()
+            retained = tracemalloc.get_traced_memory()[0] - before
+        finally:
+            tracemalloc.stop()
+        del held
+        report['variants'][name] = {'bytes': retained, 'bytes_per_result': retained / count}
+
+    baseline = report['variants']['dict']['bytes']
+    for stats in report['variants'].values():
+        stats['ratio_to_dict'] = stats['bytes'] / baseline if baseline else 0.0
+    return report
+
+
+def format_memory_report(report: Dict[str, Any]) -> str:
+    """Render a :func:`memory_benchmark` report as a plain-text table."""
+    lines = [f"\n== memory: {report['count']} analyses ({report['case']}) ==",
+             f"{'variant':<26}{'total MB':>10}{'B/result':>10}{'vs dict':>10}"]
+    for name, stats in report['variants'].items():
+        lines.append(f"{name:<26}{stats['bytes'] / 1e6:>10.2f}"
+                     f"{stats['bytes_per_result']:>10.0f}{stats['ratio_to_dict']:>10.2f}")
+    return "\n".join(lines)
+
+
+def serialization_benchmark(count: int = 1000, case: str = 'medium-few',
+                            repeat: int = 5) -> Dict[str, Any]:
+    """JSON encoding throughput for ``count`` workflow results, per encoder.
+
+    ``before`` is the previous output path (stdlib, indented, ASCII-escaped);
+    every installed encoder is then timed compact and indented. Throughput
+    is the best of ``repeat`` runs, in output bytes per second.
+    """
+    size, bullets = case.split('-')
+    agent = GenAIAgent()
+    results = [agent.run_complete_workflow(synthesize_posting(size, bullets, seed=i))
+               for i in range(count)]
+
+    variants: Dict[str, Callable[[Any], bytes]] = {
+        'before': lambda obj: json.dumps(obj, indent=2).encode('utf-8'),
+    }
+    for name in serialization.PREFERENCE:
+        try:
+            encoder = serialization.get_encoder(name)
+        except ImportError:
+            continue
+        variants[f"{name}-compact"] = encoder.dumps
+        variants[f"{name}-pretty"] = lambda obj, encoder=encoder: encoder.dumps(obj, True)
+
+    report: Dict[str, Any] = {'count': count, 'case': case,
+                              'selected': serialization.current_encoder().name, 'variants': {}}
+    for name, encode in variants.items():
+        best = float('inf')
+        for _ in range(repeat):
+            started = time.perf_counter()
+            total = sum(len(encode(result)) for result in results)
+            best = min(best, time.perf_counter() - started)
+        report['variants'][name] = {'bytes': total, 'seconds': best,
+                                    'bytes_per_second': total / best if best else 0.0}
+
+    baseline = report['variants']['before']['bytes_per_second']
+    for stats in report['variants'].values():
+        stats['speedup'] = stats['bytes_per_second'] / baseline if baseline else 0.0
+    return report
+
+
+def _loop_scores(vectorizer, requirements: List[Dict[str, float]],
+                 texts: List[str]) -> List[List[float]]:
+    """Reference scorer: one candidate, posting and requirement at a time."""
+    def vector(text):
+        rows, cols, values = vectorizer.sparse([text])
+        return dict(zip(cols.tolist(), values.tolist()))
+
+    line_vectors = {line: vector(line) for posting in requirements for line in posting}
+    scores = []
+    for text in texts:
+        candidate = vector(text)
+        scores.append([
+            sum(weight * sum(value * candidate.get(bucket, 0.0)
+                             for bucket, value in line_vectors[line].items())
+                for line, weight in posting.items())
+            for posting in requirements
+        ])
+    return scores
+
+
+def matching_benchmark(candidates: int = 5000, postings: int = 200, k: int = 10,
+                       case: str = 'small-many', loop_candidates: int = 50) -> Dict[str, Any]:
+    """Throughput of ``matching.RequirementMatcher`` ranking candidates against postings.
+
+    Candidate profiles mix requirement lines of random postings with filler
+    sentences. The vectorized ranking of all ``candidates`` is compared
+    with a per-pair Python loop over the first ``loop_candidates``, in
+    candidate-posting pairs scored per second.
+    """
+    from matching import RequirementMatcher
+
+    size, bullets = case.split('-')
+    summarizer = JobDescriptionSummarizer()
+    extracted = [summarizer.extract_key_information(synthesize_posting(size, bullets, seed=i))
+                 for i in range(postings)]
+    rng = random.Random(f"candidates-{candidates}")
+    profiles = []
+    for i in range(candidates):
+        lines = rng.choice(extracted)['must_haves'] or ["Generalist"]
+        picked = [rng.choice(lines) for _ in range(4)] + [_sentence(rng) for _ in range(4)]
+        profiles.append((i, " ".join(picked)))
+
+    started = time.perf_counter()
+    matcher = RequirementMatcher(enumerate(extracted))
+    build = time.perf_counter() - started
+
+    started = time.perf_counter()
+    matcher.top_matches(profiles, k=k)
+    vectorized = time.perf_counter() - started
+
+    sample = [text for _, text in profiles[:loop_candidates]]
+    started = time.perf_counter()
+    _loop_scores(matcher.vectorizer, matcher.requirements, sample)
+    loop = time.perf_counter() - started
+
+    vectorized_rate = candidates * postings / vectorized if vectorized else 0.0
+    loop_rate = len(sample) * postings / loop if loop else 0.0
+    return {
+        'candidates': candidates, 'postings': postings, 'k': k, 'case': case,
+        'requirement_lines': sum(len(r) for r in matcher.requirements),
+        'build_seconds': build,
+        'vectorized': {'seconds': vectorized, 'candidates_per_second': candidates / vectorized
+                       if vectorized else 0.0, 'pairs_per_second': vectorized_rate},
+        'loop': {'candidates': len(sample), 'seconds': loop, 'pairs_per_second': loop_rate},
+        'speedup': vectorized_rate / loop_rate if loop_rate else 0.0,
+    }
+
+
+def format_matching_report(report: Dict[str, Any]) -> str:
+    """Render a :func:`matching_benchmark` report as a plain-text table."""
+    vectorized, loop = report['vectorized'], report['loop']
+    return "\n".join([
+        f"\n== matching: {report['candidates']} candidates x {report['postings']} postings "
+        f"({report['requirement_lines']} requirement lines, {report['case']}), top {report['k']} ==",
+        f"{'variant':<20}{'candidates':>12}{'seconds':>10}{'pairs/s':>14}",
+        f"{'vectorized':<20}{report['candidates']:>12}{vectorized['seconds']:>10.3f}"
+        f"{vectorized['pairs_per_second']:>14.0f}",
+        f"{'python loop':<20}{loop['candidates']:>12}{loop['seconds']:>10.3f}"
+        f"{loop['pairs_per_second']:>14.0f}",
+        f"index build {report['build_seconds']:.3f} s; speedup {report['speedup']:.0f}x",
+    ])
+
+
+def format_serialization_report(report: Dict[str, Any]) -> str:
+    """Render a :func:`serialization_benchmark` report as a plain-text table."""
+    lines = [f"\n== serialization: {report['count']} results ({report['case']}), "
+             f"selected encoder: {report['selected']} ==",
+             f"{'variant':<20}{'MB':>10}{'MB/s':>10}{'results/s':>12}{'speedup':>10}"]
+    for name, stats in report['variants'].items():
+        per_second = report['count'] / stats['seconds'] if stats['seconds'] else 0.0
+        lines.append(f"{name:<20}{stats['bytes'] / 1e6:>10.2f}"
+                     f"{stats['bytes_per_second'] / 1e6:>10.1f}{per_second:>12.0f}"
+                     f"{stats['speedup']:>10.2f}")
+    return "\n".join(lines)
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any],
+                    threshold: float = DEFAULT_THRESHOLD,
+                    min_delta_ms: float = DEFAULT_MIN_DELTA_MS) -> List[Dict[str, Any]]:
+    """Return stages whose median latency regressed by more than ``threshold``.
+
+    Slowdowns under ``min_delta_ms`` in absolute terms are ignored.
+    """
+    regressions = []
+    for case, result in current['cases'].items():
+        base_case = baseline.get('cases', {}).get(case)
+        if base_case is None:
+            continue
+        for stage, stats in result['stages'].items():
+            base = base_case['stages'].get(stage)
+            if base is None or base['p50_ms'] <= 0:
+                continue
+            change = stats['p50_ms'] / base['p50_ms'] - 1.0
+            if change > threshold and stats['p50_ms'] - base['p50_ms'] >= min_delta_ms:
+                regressions.append({
+                    'case': case,
+                    'stage': stage,
+                    'baseline_p50_ms': base['p50_ms'],
+                    'current_p50_ms': stats['p50_ms'],
+                    'change': change,
+                })
+    return regressions
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Render a report as a plain-text table."""
+    lines = []
+    header = (f"{'stage':<26}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}"
+              f"{'ops/s':>12}{'MB/s':>10}{'peak KB':>10}")
+    for case, result in report['cases'].items():
+        lines.append(f"\n== {case} ({result['input_bytes'] / 1024:.1f} KB) ==")
+        lines.append(header)
+        for stage, stats in result['stages'].items():
+            lines.append(
+                f"{stage:<26}{stats['p50_ms']:>10.3f}{stats['p90_ms']:>10.3f}"
+                f"{stats['p99_ms']:>10.3f}{stats['ops_per_sec']:>12.1f}"
+                f"{stats['mb_per_sec']:>10.1f}{stats['peak_memory_bytes'] / 1024:>10.1f}"
+            )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the GenAI Agent pipeline")
+    parser.add_argument('--cases', type=str, default=",".join(DEFAULT_CASES),
+                        help='Comma-separated <size>-<bullets> cases '
+                             f'(sizes: {", ".join(SIZES)}; bullets: {", ".join(BULLETS)})')
+    parser.add_argument('--stages', type=str, default=None,
+                        help='Comma-separated stages to run (default: all)')
+    parser.add_argument('--repeat', type=int, default=20, help='Timed runs per stage (default: 20)')
+    parser.add_argument('--warmup', type=int, default=2, help='Untimed runs per stage (default: 2)')
+    parser.add_argument('--save', type=str, help='Write the report to this JSON file')
+    parser.add_argument('--compare', type=str, help='Baseline JSON file to compare against')
+    parser.add_argument('--memory', type=int, metavar='N',
+                        help='Instead of timing, compare memory held by N dict and compact '
+                             'analyses of the first case')
+    parser.add_argument('--serialization', type=int, metavar='N',
+                        help='Instead of timing stages, measure JSON encoding throughput '
+                             'for N results of the first case, per installed encoder')
+    parser.add_argument('--matching', type=int, metavar='N',
+                        help='Instead of timing stages, measure ranking N candidate profiles '
+                             'against postings with matching.RequirementMatcher (needs NumPy)')
+    parser.add_argument('--postings', type=int, default=200,
+                        help='Postings ranked against in --matching (default: 200)')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Allowed p50 slowdown before flagging, e.g. 0.1 = 10%% (default: 0.1)')
+    parser.add_argument('--min-delta-ms', type=float, default=DEFAULT_MIN_DELTA_MS,
+                        help='Ignore slowdowns smaller than this many ms (default: 0.05)')
+    args = parser.parse_args()
+
+    cases = [case.strip() for case in args.cases.split(',') if case.strip()]
+    for case in cases:
+        size, _, bullets = case.partition('-')
+        if size not in SIZES or bullets not in BULLETS:
+            parser.error(f"Unknown case '{case}'")
+    stages = args.stages.split(',') if args.stages else None
+
+    if args.memory or args.serialization or args.matching:
+        if args.memory:
+            report = memory_benchmark(args.memory, cases[0])
+            print(format_memory_report(report))
+        elif args.matching:
+            report = matching_benchmark(args.matching, args.postings)
+            print(format_matching_report(report))
+        else:
+            report = serialization_benchmark(args.serialization, cases[0])
+            print(format_serialization_report(report))
+        if args.save:
+            with open(args.save, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+            print(f"\nReport saved to: {args.save}")
+        return
+
+    report = run_benchmarks(cases, args.repeat, args.warmup, stages)
+    print(format_report(report))
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport saved to: {args.save}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_results(baseline, report, args.threshold, args.min_delta_ms)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for r in regressions:
+                print(f"- {r['case']} / {r['stage']}: {r['baseline_p50_ms']:.3f} ms -> "
+                      f"{r['current_p50_ms']:.3f} ms (+{r['change']:.0%})")
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.threshold:.0%}.")
+
+
+if __name__ == "__main__":
+    main()
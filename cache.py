@@ -0,0 +1,244 @@
+"""
+Content-addressed result cache for the GenAI Agent
+
+Stores complete workflow results in a local SQLite database keyed by a hash
+of the (normalized) job text, the voice profile used for the email and the
+version of the agent code. Re-running an unchanged posting with an
+unchanged profile returns the stored result without any recomputation;
+editing the posting, the profile or any module in ``OUTPUT_MODULES``
+(the agent, the email template, the built-in voice) yields a new key.
+A result served from the cache carries the current run's
+``workflow_completed_at``; ``extracted_data['extracted_at']`` keeps the
+time the stored analysis was made.
+
+The cache is bounded by size and evicts least-recently-used entries. Hit,
+miss, store and eviction counters are kept per cache instance.
+
+Usage:
+    cache = ResultCache("~/.cache/genai-agent")
+    agent = GenAIAgent(cache=cache)
+    agent.run_complete_workflow(job_text)  # computed and stored
+    agent.run_complete_workflow(job_text)  # served from the cache
+    print(cache.stats())
+"""
+
+import hashlib
+import importlib.util
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import genai_agent
+from serialization import dumps_str, loads
+
+
+DB_NAME = "results.sqlite3"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# Bump when the stored value format changes.
+CACHE_SCHEMA = 1
+
+# Modules whose source shapes workflow output: the extraction and summary,
+# the email template and subject, and the built-in voice.
+OUTPUT_MODULES = ('genai_agent', 'email_templates', 'voice_profiles', 'analytics')
+
+_code_version: Optional[str] = None
+
+
+def default_cache_dir() -> str:
+    """Return the per-user cache directory (honours ``XDG_CACHE_HOME``)."""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'genai-agent')
+
+
+def code_version() -> str:
+    """Hash of the ``OUTPUT_MODULES`` sources, so any change to them invalidates old entries.
+
+    The files are located without importing the modules.
+    """
+    global _code_version
+    if _code_version is None:
+        digest = hashlib.sha256(f"schema={CACHE_SCHEMA}\n".encode('utf-8'))
+        for name in OUTPUT_MODULES:
+            with open(importlib.util.find_spec(name).origin, 'rb') as f:
+                digest.update(f"{name}\0".encode('utf-8'))
+                digest.update(f.read())
+        _code_version = digest.hexdigest()
+    return _code_version
+
+
+def normalize_job_text(job_text: str) -> str:
+    """Normalize job text for hashing.
+
+    Only transformations that cannot change the workflow output are applied
+    (currently CRLF -> LF); anything stronger, such as stripping trailing
+    whitespace, can change what the extraction patterns match.
+    """
+    return job_text.replace('\r\n', '\n')
+
+
+def cache_key(job_text: str, voice_profile: genai_agent.VoiceProfile,
+              backend: str = '') -> str:
+    """Build the content address for a job text and voice profile.
+
+    ``backend`` is the email backend's signature (empty for templates).
+    """
+    digest = hashlib.sha256()
+    digest.update(code_version().encode('utf-8'))
+    digest.update(b'\0')
+    if backend:
+        digest.update(backend.encode('utf-8'))
+        digest.update(b'\0')
+    digest.update(json.dumps(voice_profile.to_dict(), sort_keys=True).encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(normalize_job_text(job_text).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class SQLiteStore:
+    """Base for classes backed by one lazily opened SQLite database.
+
+    The connection is opened on first use of ``conn``, in WAL mode, and is
+    shared by every thread holding ``_lock``. Pickling drops the connection
+    and the lock, so instances can be sent to worker processes and reopen
+    the database there. Subclasses create their tables in ``_setup``.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    def __getstate__(self):
+        # Connections and locks cannot cross process boundaries; recreate them.
+        state = self.__dict__.copy()
+        state['_conn'] = None
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    def _setup(self, conn: sqlite3.Connection):
+        """Create the tables of a newly opened connection."""
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        with self._lock:
+            if self._conn is None:
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                self._setup(conn)
+                self._conn = conn
+            return self._conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class ResultCache(SQLiteStore):
+    """SQLite-backed, size-bounded LRU cache of workflow results."""
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(os.path.expanduser(cache_dir or default_cache_dir()))
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        super().__init__(self.cache_dir / DB_NAME)
+
+    def _setup(self, conn: sqlite3.Connection):
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS results_lru ON results (last_access)")
+        conn.commit()
+
+    def key_for(self, job_text: str, voice_profile: genai_agent.VoiceProfile,
+                backend: str = '') -> str:
+        """Return the cache key for a job text, voice profile and backend."""
+        return cache_key(job_text, voice_profile, backend)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached result for ``key`` or ``None``."""
+        with self._lock:
+            row = self.conn.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            with self.conn:
+                self.conn.execute("UPDATE results SET last_access = ? WHERE key = ?",
+                                  (time.time(), key))
+            self.hits += 1
+        return loads(row[0])
+
+    def put(self, key: str, result: Dict[str, Any]):
+        """Store ``result`` under ``key`` and evict if over the size budget."""
+        value = dumps_str(result)
+        with self._lock:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO results (key, value, size, last_access) VALUES (?, ?, ?, ?)",
+                    (key, value, len(value), time.time())
+                )
+            self.stores += 1
+            self.evict()
+
+    def evict(self):
+        """Drop least-recently-used entries until the cache fits ``max_bytes``."""
+        with self._lock:
+            total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+
+            # Trim to 90% so a full cache doesn't evict on every store.
+            target = int(self.max_bytes * 0.9)
+            doomed = []
+            for key, size in self.conn.execute("SELECT key, size FROM results ORDER BY last_access"):
+                if total <= target:
+                    break
+                doomed.append((key,))
+                total -= size
+
+            with self.conn:
+                self.conn.executemany("DELETE FROM results WHERE key = ?", doomed)
+            self.evictions += len(doomed)
+
+    def clear(self):
+        """Remove every entry."""
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM results")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return counters for this instance plus the current cache size."""
+        with self._lock:
+            entries, total = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'stores': self.stores,
+            'evictions': self.evictions,
+            'entries': entries,
+            'bytes': total,
+            'max_bytes': self.max_bytes,
+        }
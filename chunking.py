@@ -0,0 +1,210 @@
+"""
+Chunked processing of large posting dumps
+
+Concatenated exports can run to hundreds of MB. Rather than reading such a
+file into one string, the file is memory-mapped and split at posting
+boundaries (by default a line of five or more ``=``; any regular
+expression can be given instead, e.g. ``\\f`` for form feeds). Each
+posting is decoded and run through the workflow on its own, and mapped
+pages are released once the scan has moved past them, so peak memory
+follows the largest posting rather than the size of the file.
+
+With ``jobs > 1`` the main process only finds the boundaries; workers are
+sent byte ranges and map the file themselves, so no posting text crosses
+process boundaries.
+
+Results are written as JSONL in the streaming format, with ids of the form
+``<file name>#<n>`` and each posting's byte offset and length::
+
+    {"id": "dump.txt#3", "offset": 20480, "length": 5120, "job_summary": "...", ...}
+
+Usage:
+    python cli.py --input-dump postings_dump.txt --output-jsonl results.jsonl
+    python cli.py --input-dump postings_dump.txt --split-on '^-{5,}$' --jobs 4
+"""
+
+import mmap
+import os
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from genai_agent import GenAIAgent
+from streaming import open_stream, write_jsonl
+
+
+# A line of five or more "=". Matching from the preceding newline lets the
+# regex engine jump between candidates; anchors or alternatives at the
+# front made the scan 5-10x slower. A separator on the very first line is
+# found separately (see find_postings).
+DEFAULT_SEPARATOR = rb"\n[ \t]*={5,}[ \t]*(?=\r?\n|\Z)"
+
+# How much of the start of a dump is checked for a leading separator.
+LEADING_SEPARATOR_BYTES = 64 * 1024
+
+# Postings larger than this are reported as errors instead of decoded.
+MAX_POSTING_BYTES = 16 * 1024 * 1024
+
+# Postings sent to a worker per task, and tasks in flight per worker.
+POSTINGS_PER_TASK = 32
+TASKS_IN_FLIGHT = 4
+
+_NON_BLANK = re.compile(rb"\S")
+
+Buffer = Union[mmap.mmap, bytes]
+
+# Per-worker state, created by _init_worker.
+_worker_agent: Optional[GenAIAgent] = None
+_worker_map: Optional[Buffer] = None
+
+
+@contextmanager
+def map_file(path: str) -> Iterator[Buffer]:
+    """Memory-map ``path`` read-only (empty files give ``b''``)."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b''
+            return
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield buf
+        finally:
+            buf.close()
+
+
+def _release(buf: Buffer, start: int, end: int):
+    """Drop the mapped pages of ``[start, end)``; they re-fault from the file if read again."""
+    if not isinstance(buf, mmap.mmap) or not hasattr(mmap, 'MADV_DONTNEED'):
+        return
+    start -= start % mmap.PAGESIZE
+    if end > start:
+        buf.madvise(mmap.MADV_DONTNEED, start, end - start)
+
+
+def find_postings(buf: Buffer, separator: Union[str, bytes] = DEFAULT_SEPARATOR
+                  ) -> Iterator[Tuple[int, int]]:
+    """Yield the ``(start, end)`` byte range of every non-blank posting in ``buf``.
+
+    ``separator`` is a regular expression (compiled with MULTILINE) whose
+    matches divide postings. Pages already scanned are released as the
+    iteration advances.
+    """
+    if isinstance(separator, str):
+        separator = separator.encode('utf-8')
+    pattern = re.compile(separator, re.MULTILINE)
+
+    # A separator pattern that starts at a newline cannot match the first
+    # line, so match the start of the dump again as if a newline came first.
+    start = 0
+    leading = pattern.match(b"\n" + bytes(buf[:LEADING_SEPARATOR_BYTES]))
+    if leading is not None and leading.end() > 1:
+        start = leading.end() - 1
+
+    released = 0
+    for match in pattern.finditer(buf, start):
+        if _NON_BLANK.search(buf, start, match.start()):
+            yield start, match.start()
+        start = match.end()
+        _release(buf, released, start)
+        released = start
+
+    if _NON_BLANK.search(buf, start, len(buf)):
+        yield start, len(buf)
+    _release(buf, released, len(buf))
+
+
+def _process_posting(buf: Buffer, agent: GenAIAgent, record_id: str, start: int, end: int,
+                     max_bytes: int) -> Dict[str, Any]:
+    """Run the workflow on one posting and return its output record."""
+    result: Dict[str, Any] = {'id': record_id, 'offset': start, 'length': end - start}
+    try:
+        if end - start > max_bytes:
+            raise ValueError(f"posting is {end - start} bytes (limit {max_bytes})")
+        job_text = buf[start:end].decode('utf-8')
+        result.update(agent.run_complete_workflow(job_text))
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    return result
+
+
+def _init_worker(path: str, cache=None):
+    """Map the input and create the agent once per worker process."""
+    global _worker_agent, _worker_map
+    _worker_agent = GenAIAgent(cache=cache)
+    with open(path, 'rb') as f:
+        _worker_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _process_ranges(task: Tuple[List[Tuple[str, int, int]], int]) -> List[Dict[str, Any]]:
+    """Worker entry point: process a list of ``(id, start, end)`` postings."""
+    ranges, max_bytes = task
+    results = []
+    for record_id, start, end in ranges:
+        results.append(_process_posting(_worker_map, _worker_agent, record_id,
+                                        start, end, max_bytes))
+        _release(_worker_map, start, end)
+    return results
+
+
+def _tasks(ranges: Iterable[Tuple[str, int, int]], size: int
+           ) -> Iterator[List[Tuple[str, int, int]]]:
+    task = []
+    for item in ranges:
+        task.append(item)
+        if len(task) == size:
+            yield task
+            task = []
+    if task:
+        yield task
+
+
+def process_dump(input_path: str, separator: Union[str, bytes] = DEFAULT_SEPARATOR,
+                 jobs: Optional[int] = 1, cache=None, agent: Optional[GenAIAgent] = None,
+                 max_posting_bytes: int = MAX_POSTING_BYTES) -> Iterator[Dict[str, Any]]:
+    """Lazily yield one output record per posting in ``input_path``, in file order.
+
+    ``jobs`` is the number of worker processes (``None`` means the CPU
+    count); with ``jobs=1`` postings are processed in this process by
+    ``agent`` (a new one with ``cache`` if not given). Only a bounded number
+    of tasks is in flight at once, so results never pile up in memory.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    name = os.path.basename(input_path)
+
+    with map_file(input_path) as buf:
+        ranges = ((f"{name}#{n}", start, end)
+                  for n, (start, end) in enumerate(find_postings(buf, separator), start=1))
+
+        if jobs == 1:
+            agent = agent or GenAIAgent(cache=cache)
+            for record_id, start, end in ranges:
+                yield _process_posting(buf, agent, record_id, start, end, max_posting_bytes)
+            return
+
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                 initargs=(input_path, cache)) as pool:
+            pending = deque()
+            for task in _tasks(ranges, POSTINGS_PER_TASK):
+                pending.append(pool.submit(_process_ranges, (task, max_posting_bytes)))
+                if len(pending) >= jobs * TASKS_IN_FLIGHT:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+
+
+def run_dump(input_path: str, output_path: str = '-',
+             separator: Union[str, bytes] = DEFAULT_SEPARATOR, jobs: Optional[int] = 1,
+             cache=None, agent: Optional[GenAIAgent] = None,
+             max_posting_bytes: int = MAX_POSTING_BYTES, index=None) -> Dict[str, int]:
+    """Process a dump into JSONL at ``output_path`` (``-`` = stdout).
+
+    Successful results are also added to ``index`` (a
+    ``search_index.ResultIndex``) under their id, if given.
+    """
+    with open_stream(output_path, 'w') as out:
+        results = process_dump(input_path, separator, jobs, cache, agent, max_posting_bytes)
+        if index is not None:
+            results = index.index_stream(results)
+        return write_jsonl(results, out)
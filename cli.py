@@ -4,22 +4,41 @@ Command Line Interface for GenAI Agent Challenge
 
 Usage:
     python cli.py --input job_description.txt --output-dir ./results
+    python cli.py --input-dir ./postings --glob "*.txt" --jobs 8  # Batch mode
+    python cli.py --input-dir ./postings --dedup  # Batch mode, duplicates processed once
+    python cli.py --input-jsonl postings.jsonl --output-jsonl -  # Streaming mode
+    python cli.py --input-dump export.txt --output-jsonl results.jsonl  # Large dump mode
+    python cli.py --input-dir ./postings --bundle results/corpus.tar.gz  # One output file
+    python cli.py --input-dir ./postings --analytics market.json  # Corpus-wide counts
+    python cli.py --input-dir ./postings --index postings.db  # Searchable results
+    python cli.py --index postings.db --search langchain --min-metric 30
+    python cli.py --input job.txt --trace-json trace.json --metrics-prom metrics.prom
     python cli.py --demo  # Run with sample data
+    python cli.py --profile-startup --help  # Where startup time goes
+
+The CLI is often run from shell loops, so modules beyond argparse are
+imported by the code paths that need them: ``--help`` and argument errors
+never load the agent, its regexes or the output and JSON libraries.
 """
 
 import argparse
-import json
 import os
 import sys
+import time
 from pathlib import Path
-from genai_agent import GenAIAgent
+from typing import List, Optional
+
+
+def read_job_description(file_path: str) -> str:
+    """Read job description from file, raising on any I/O or decode error."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return f.read()
 
 
 def load_job_description(file_path: str) -> str:
-    """Load job description from file."""
+    """Load job description from file, exiting the process on failure."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return f.read()
+        return read_job_description(file_path)
     except FileNotFoundError:
         print(f"Error: File '{file_path}' not found.")
         sys.exit(1)
@@ -28,37 +47,40 @@ def load_job_description(file_path: str) -> str:
         sys.exit(1)
 
 
-def save_results(results: dict, output_dir: str):
-    """Save agent results to output directory."""
-    output_path = Path(output_dir)
-    output_path.mkdir(parents=True, exist_ok=True)
+def save_results(results: dict, output_dir: str, verbose: bool = True, tracer=None,
+                 pretty: bool = False):
+    """Save agent results to output directory; JSON is indented only if ``pretty``."""
+    from instrumentation import NULL_TRACER
+    from output_sinks import DirectorySink
     
-    # Save job summary
-    summary_path = output_path / "job_summary.md"
-    with open(summary_path, 'w', encoding='utf-8') as f:
-        f.write("# Job Description Summary\n\n")
-        f.write(results['job_summary'])
+    tracer = tracer or NULL_TRACER
+    with tracer.span('save_results'):
+        output_path = Path(output_dir)
+        paths = DirectorySink(output_path, pretty).write('', results)
+        tracer.incr('files_written', len(paths))
     
-    # Save intro email
-    email_path = output_path / "vp_intro_email.md"
-    with open(email_path, 'w', encoding='utf-8') as f:
-        f.write(results['intro_email'])
-    
-    # Save extracted data as JSON
-    data_path = output_path / "extracted_data.json"
-    with open(data_path, 'w', encoding='utf-8') as f:
-        json.dump(results['extracted_data'], f, indent=2)
+    if verbose:
+        print(f"Results saved to: {output_path.absolute()}")
+        print(f"- Job Summary: {paths['job_summary.md']}")
+        print(f"- VP Email: {paths['vp_intro_email.md']}")
+        print(f"- Extracted Data: {paths['extracted_data.json']}")
+        print(f"- Complete Results: {paths['complete_results.json']}")
+
+
+def save_bundle(results: dict, bundle_path: str, key: str, verbose: bool = True, tracer=None,
+                pretty: bool = False):
+    """Save agent results as a single bundle file (see output_sinks)."""
+    from instrumentation import NULL_TRACER
+    from output_sinks import BundleSink
     
-    # Save complete results
-    complete_path = output_path / "complete_results.json"
-    with open(complete_path, 'w', encoding='utf-8') as f:
-        json.dump(results, f, indent=2)
+    tracer = tracer or NULL_TRACER
+    with tracer.span('save_results'):
+        with BundleSink(bundle_path, pretty=pretty) as sink:
+            sink.write(key, results)
+        tracer.incr('files_written')
     
-    print(f"Results saved to: {output_path.absolute()}")
-    print(f"- Job Summary: {summary_path}")
-    print(f"- VP Email: {email_path}")
-    print(f"- Extracted Data: {data_path}")
-    print(f"- Complete Results: {complete_path}")
+    if verbose:
+        print(f"Results saved to: {Path(bundle_path).absolute()}")
 
 
 def run_demo():
@@ -105,6 +127,8 @@ Success Metrics
 * ≥ 2 external media features or conference demos by month 6.
 """
     
+    from genai_agent import GenAIAgent
+    
     print("Running GenAI Agent Demo...")
     print("=" * 50)
     
@@ -120,6 +144,201 @@ Success Metrics
     save_results(results, "./demo_results")
 
 
+def open_cache(cache_dir: Optional[str], max_mb: int):
+    """Open the on-disk result cache."""
+    from cache import ResultCache
+    
+    return ResultCache(cache_dir, max_bytes=max_mb * 1024 * 1024)
+
+
+def run_batch_mode(input_dir: str, pattern: str, output_dir: str,
+                   jobs: Optional[int] = None, cache=None,
+                   dedup_threshold: Optional[float] = None, bundle: Optional[str] = None,
+                   pretty: bool = False, index=None):
+    """Process every matching file in input_dir and write a manifest."""
+    import sqlite3
+    from batch import MANIFEST_NAME, discover_inputs, plan_outputs, run_batch
+    
+    if not os.path.isdir(input_dir):
+        print(f"Error: Directory '{input_dir}' not found.")
+        sys.exit(1)
+    
+    inputs = discover_inputs(input_dir, pattern)
+    if not inputs:
+        print(f"Error: No files matching '{pattern}' in '{input_dir}'.")
+        sys.exit(1)
+    
+    print(f"Processing {len(inputs)} job descriptions...")
+    try:
+        manifest = run_batch(plan_outputs(inputs, input_dir, output_dir), output_dir, jobs,
+                             cache, dedup_threshold, bundle, pretty, index)
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    
+    for entry in manifest['documents']:
+        if entry['status'] != 'ok':
+            print(f"- Failed: {entry['input']} ({entry['error']})")
+    
+    print(f"Batch completed: {manifest['succeeded']} succeeded, "
+          f"{manifest['failed']} failed in {manifest['elapsed_seconds']:.2f}s")
+    if cache is not None:
+        print(f"Cache hits: {manifest['cache_hits']}/{manifest['total']}")
+    if dedup_threshold is not None:
+        print(f"Duplicates reusing another document's results: "
+              f"{manifest['duplicates']}/{manifest['total']}")
+    if bundle:
+        print(f"Bundle: {bundle}")
+    if index is not None:
+        print(f"Index: {index.path} ({index.count()} postings)")
+    print(f"Manifest: {Path(output_dir) / MANIFEST_NAME}")
+    
+    if manifest['failed']:
+        sys.exit(1)
+
+
+def run_stream_mode(input_path: str, output_path: str, text_field: str, id_field: str,
+                    cache=None, tracer=None, index=None):
+    """Stream JSONL postings through the agent, one record at a time."""
+    import sqlite3
+    from genai_agent import GenAIAgent
+    from streaming import run_stream
+    
+    # stdout may carry the JSONL results, so status goes to stderr
+    try:
+        counts = run_stream(input_path, output_path, text_field, id_field,
+                            GenAIAgent(cache=cache, tracer=tracer), index)
+    except (OSError, sqlite3.Error) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    
+    print(f"Stream completed: {counts['succeeded']} succeeded, "
+          f"{counts['failed']} failed", file=sys.stderr)
+    if cache is not None:
+        stats = cache.stats()
+        print(f"Cache: {stats['hits']} hits, {stats['misses']} misses", file=sys.stderr)
+    
+    if counts['failed']:
+        sys.exit(1)
+
+
+def export_trace(tracer, trace_json: Optional[str], metrics_prom: Optional[str],
+                 verbose: bool = False):
+    """Write the tracer's data to the requested files, if any."""
+    if tracer is None:
+        return
+    if trace_json:
+        tracer.export_json(trace_json)
+    if metrics_prom:
+        tracer.export_prometheus(metrics_prom)
+    if verbose and trace_json:
+        print(f"- Trace: {trace_json}")
+    if verbose and metrics_prom:
+        print(f"- Metrics: {metrics_prom}")
+
+
+def run_dump_mode(input_path: str, output_path: str, separator: Optional[str],
+                  jobs: Optional[int] = None, cache=None, index=None):
+    """Split a large concatenated dump at posting boundaries and stream the results."""
+    import re
+    import sqlite3
+    from chunking import DEFAULT_SEPARATOR, run_dump
+    
+    # stdout may carry the JSONL results, so status goes to stderr
+    try:
+        counts = run_dump(input_path, output_path, separator or DEFAULT_SEPARATOR, jobs, cache,
+                          index=index)
+    except (OSError, ValueError, re.error, sqlite3.Error) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    
+    print(f"Dump completed: {counts['succeeded']} succeeded, "
+          f"{counts['failed']} failed", file=sys.stderr)
+    
+    if counts['failed']:
+        sys.exit(1)
+
+
+def run_analytics_mode(records, report_path: str, top: int, pretty: bool = False):
+    """Aggregate requirements, metrics and milestones over a corpus into a report."""
+    import re
+    from analytics import CorpusAnalytics, format_report
+    from serialization import dumps
+    
+    try:
+        report = CorpusAnalytics(top).add_records(records).report()
+        data = dumps(report, pretty)
+        if report_path == '-':
+            sys.stdout.buffer.write(data + b"\n")
+        else:
+            with open(report_path, 'wb') as f:
+                f.write(data)
+    except (OSError, re.error) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    
+    # stdout may carry the report, so the summary then goes to stderr
+    out = sys.stderr if report_path == '-' else sys.stdout
+    print(format_report(report), file=out)
+    if report_path != '-':
+        print(f"\nReport saved to: {report_path}", file=out)
+
+
+def run_search_mode(index, query: str, requires: Optional[str], min_metric: Optional[int],
+                    limit: int):
+    """Print the indexed postings matching a search."""
+    import sqlite3
+    
+    try:
+        hits = index.search(query or None, requires, min_metric, limit)
+    except (ValueError, sqlite3.Error) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    
+    print(f"{len(hits)} matching postings" + (f" (first {limit})" if len(hits) == limit else ""))
+    for hit in hits:
+        print(f"\n{hit['key'] or '(root)'}  [{hit['completed_at']}]")
+        for requirement in hit['must_haves']:
+            print(f"  - {requirement}")
+        for metric in hit['metrics']:
+            print(f"  ≥ {metric}")
+
+
+def profile_startup(argv: List[str], top: int = 15) -> int:
+    """Run the CLI with ``argv`` under ``python -X importtime`` and report its imports.
+
+    The run's own output passes through; the report goes to stderr. Returns
+    the run's exit code.
+    """
+    import subprocess
+    
+    started = time.perf_counter()
+    proc = subprocess.run([sys.executable, '-X', 'importtime', os.path.abspath(__file__), *argv],
+                          stderr=subprocess.PIPE, text=True)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    
+    # Lines look like "import time:  self [us] | cumulative | <indent>name"
+    imports = []
+    for line in proc.stderr.splitlines():
+        fields = line[len('import time:'):].split('|') if line.startswith('import time:') else None
+        if fields is None or len(fields) != 3 or not fields[0].strip().isdigit():
+            if fields is None:
+                print(line, file=sys.stderr)
+            continue
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        imports.append((int(fields[1]) / 1000, int(fields[0]) / 1000, depth, name.strip()))
+    
+    top_level = sorted((entry for entry in imports if entry[2] == 0), reverse=True)
+    print(f"\n== startup: {elapsed_ms:.1f} ms wall, "
+          f"{sum(entry[0] for entry in top_level):.1f} ms importing {len(imports)} modules ==",
+          file=sys.stderr)
+    print(f"{'cumulative ms':>14}{'self ms':>9}  module", file=sys.stderr)
+    for cumulative, self_ms, _, name in top_level[:top]:
+        print(f"{cumulative:>14.1f}{self_ms:>9.1f}  {name}", file=sys.stderr)
+    return proc.returncode
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="GenAI Agent for Job Description Analysis and Email Generation"
@@ -144,14 +363,268 @@ def main():
         help='Run demo with sample job description'
     )
     
+    parser.add_argument(
+        '--input-dir',
+        type=str,
+        help='Directory of job description files to process in batch mode'
+    )
+    
+    parser.add_argument(
+        '--glob',
+        type=str,
+        default='*.txt',
+        help='File pattern inside --input-dir, e.g. "**/*.txt" (default: *.txt)'
+    )
+    
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=None,
+        help='Worker processes for batch or dump mode (default: number of CPUs)'
+    )
+    
+    parser.add_argument(
+        '--dedup',
+        action='store_true',
+        help='In batch mode, process near-duplicate documents once per cluster'
+    )
+    
+    parser.add_argument(
+        '--dedup-threshold',
+        type=float,
+        default=0.8,
+        help='Similarity (0-1) at which documents count as duplicates (default: 0.8)'
+    )
+    
+    parser.add_argument(
+        '--input-jsonl',
+        type=str,
+        help='Stream job postings from a JSONL file ("-" for stdin)'
+    )
+    
+    parser.add_argument(
+        '--input-dump',
+        type=str,
+        help='Memory-map a large file of concatenated postings and process it posting by posting'
+    )
+    
+    parser.add_argument(
+        '--split-on',
+        type=str,
+        default=None,
+        help='Regex separating postings in --input-dump (default: a line of five or more "=")'
+    )
+    
+    parser.add_argument(
+        '--output-jsonl',
+        type=str,
+        default='-',
+        help='Where to write JSONL results in streaming or dump mode (default: stdout)'
+    )
+    
+    parser.add_argument(
+        '--text-field',
+        type=str,
+        default='text',
+        help='JSONL field holding the job description text (default: text)'
+    )
+    
+    parser.add_argument(
+        '--id-field',
+        type=str,
+        default='id',
+        help='JSONL field holding the record id (default: id)'
+    )
+    
+    parser.add_argument(
+        '--cache-dir',
+        type=str,
+        default=None,
+        help='Result cache directory (default: ~/.cache/genai-agent)'
+    )
+    
+    parser.add_argument(
+        '--cache-max-mb',
+        type=int,
+        default=512,
+        help='Result cache size limit in MB before LRU eviction (default: 512)'
+    )
+    
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Always recompute results instead of using the result cache'
+    )
+    
+    parser.add_argument(
+        '--bundle',
+        type=str,
+        help='Write all results into one file instead of per-file folders; the format '
+             'follows the name: .json, .tar or .zip, with .gz or .zst for compression'
+    )
+    
+    parser.add_argument(
+        '--pretty',
+        action='store_true',
+        help='Indent saved JSON files for reading (default: compact)'
+    )
+    
+    parser.add_argument(
+        '--analytics',
+        type=str,
+        metavar='REPORT',
+        help='Instead of running the workflow, count the most frequent requirements, metrics '
+             'and milestones over --input-dir, --input-jsonl or --input-dump and write the '
+             'report to this JSON file ("-" for stdout)'
+    )
+    
+    parser.add_argument(
+        '--top',
+        type=int,
+        default=20,
+        help='Items kept per field in --analytics reports, and hits shown by --search '
+             '(default: 20)'
+    )
+    
+    parser.add_argument(
+        '--index',
+        type=str,
+        metavar='DB',
+        help='Add every result to this SQLite full-text index (created if missing)'
+    )
+    
+    parser.add_argument(
+        '--index-outputs',
+        type=str,
+        metavar='DIR',
+        help='Add the complete_results.json files already under DIR to --index'
+    )
+    
+    parser.add_argument(
+        '--search',
+        type=str,
+        metavar='QUERY',
+        help='Search --index instead of processing; QUERY uses FTS5 syntax '
+             '(e.g. \'langchain OR "agent frameworks"\', "" for any posting)'
+    )
+    
+    parser.add_argument(
+        '--requires',
+        type=str,
+        help='With --search, only postings whose requirements contain this phrase'
+    )
+    
+    parser.add_argument(
+        '--min-metric',
+        type=int,
+        metavar='PERCENT',
+        help='With --search, only postings with a success metric of at least PERCENT'
+    )
+    
+    parser.add_argument(
+        '--trace-json',
+        type=str,
+        help='Write per-stage timings and spans to this JSON file'
+    )
+    
+    parser.add_argument(
+        '--metrics-prom',
+        type=str,
+        help='Write per-stage metrics in Prometheus text format to this file'
+    )
+    
+    parser.add_argument(
+        '--profile-startup',
+        action='store_true',
+        help='Run the rest of the command line and report the time spent importing modules'
+    )
+    
+    if '--profile-startup' in sys.argv[1:]:
+        sys.exit(profile_startup([arg for arg in sys.argv[1:] if arg != '--profile-startup']))
+    
     args = parser.parse_args()
     
+    if args.dedup and not 0 < args.dedup_threshold <= 1:
+        parser.error("--dedup-threshold must be greater than 0 and at most 1")
+    if args.bundle:
+        from output_sinks import is_bundle_path
+        if not is_bundle_path(args.bundle):
+            parser.error("--bundle must end in .json, .tar or .zip (optionally .gz or .zst)")
+    
+    if args.analytics and not (args.input_dir or args.input_jsonl or args.input_dump):
+        parser.error("--analytics needs --input-dir, --input-jsonl or --input-dump")
+    if args.top < 1:
+        parser.error("--top must be at least 1")
+    if (args.search is not None or args.index_outputs) and not args.index:
+        parser.error("--search and --index-outputs need --index")
+    if (args.requires or args.min_metric is not None) and args.search is None:
+        parser.error("--requires and --min-metric need --search")
+    
     if args.demo:
         run_demo()
         return
     
+    if args.analytics:
+        from analytics import iter_directory, iter_dump, iter_jsonl
+        if args.input_dir:
+            records = iter_directory(args.input_dir, args.glob)
+        elif args.input_jsonl:
+            records = iter_jsonl(args.input_jsonl, args.text_field, args.id_field)
+        else:
+            records = iter_dump(args.input_dump, args.split_on)
+        run_analytics_mode(records, args.analytics, args.top, args.pretty)
+        return
+    
+    index = None
+    if args.index:
+        from search_index import ResultIndex
+        index = ResultIndex(args.index)
+    
+    if args.search is not None:
+        run_search_mode(index, args.search, args.requires, args.min_metric, args.top)
+        return
+    
+    if args.index_outputs:
+        import sqlite3
+        try:
+            count = index.index_outputs(args.index_outputs)
+        except (OSError, ValueError, sqlite3.Error) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        print(f"Indexed {count} results from {args.index_outputs} "
+              f"({index.count()} postings in {args.index})")
+        return
+    
+    cache = None if args.no_cache else open_cache(args.cache_dir, args.cache_max_mb)
+    tracer = None
+    if args.trace_json or args.metrics_prom:
+        from instrumentation import Tracer
+        tracer = Tracer()
+    
+    if args.input_jsonl:
+        try:
+            run_stream_mode(args.input_jsonl, args.output_jsonl,
+                            args.text_field, args.id_field, cache, tracer, index)
+        finally:
+            export_trace(tracer, args.trace_json, args.metrics_prom)
+        return
+    
+    if args.input_dump:
+        run_dump_mode(args.input_dump, args.output_jsonl, args.split_on, args.jobs, cache,
+                      index)
+        return
+    
+    if args.input_dir:
+        if tracer is not None:
+            print("Note: --trace-json/--metrics-prom are not collected from batch workers.")
+        run_batch_mode(args.input_dir, args.glob, args.output_dir, args.jobs, cache,
+                       args.dedup_threshold if args.dedup else None, args.bundle, args.pretty,
+                       index)
+        return
+    
     if not args.input:
-        print("Error: Please provide --input file or use --demo")
+        print("Error: Please provide --input file, --input-dir, --input-jsonl, --input-dump "
+              "or use --demo")
         parser.print_help()
         sys.exit(1)
     
@@ -160,13 +633,28 @@ def main():
     
     # Initialize and run agent
     print("Initializing GenAI Agent...")
-    agent = GenAIAgent()
+    from genai_agent import GenAIAgent
+    agent = GenAIAgent(cache=cache, tracer=tracer)
     
     print("Processing job description...")
     results = agent.run_complete_workflow(job_text)
+    if cache is not None:
+        print("Result served from cache." if cache.hits else "Result computed and cached.")
     
     # Save results
-    save_results(results, args.output_dir)
+    if args.bundle:
+        try:
+            save_bundle(results, args.bundle, Path(args.input).stem, tracer=tracer,
+                        pretty=args.pretty)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+    else:
+        save_results(results, args.output_dir, tracer=tracer, pretty=args.pretty)
+    if index is not None:
+        index.write(Path(args.input).stem, results)
+        print(f"- Index: {args.index}")
+    export_trace(tracer, args.trace_json, args.metrics_prom, verbose=True)
     
     print("\nWorkflow completed successfully!")
 
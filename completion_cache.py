@@ -0,0 +1,269 @@
+"""
+Response cache for LLM backends
+
+Summaries and email sections written by a model cost a request each, and
+most requests repeat: re-running a batch, revising a posting or rendering
+the same job for another voice sends prompts the provider has already
+answered. ``CachedBackend`` wraps any ``llm_backend.EmailBackend`` and
+stores its completions in a local SQLite database:
+
+- Keys hash the normalized messages together with the backend's
+  signature (model, temperature, token limit), so changing any parameter
+  misses rather than returning another model's answer.
+- Entries expire after ``ttl`` seconds, and the least recently used are
+  evicted beyond ``max_entries``.
+- ``stats()`` reports the hit rate and estimated tokens saved. It also
+  counts how often a request that did reach the provider started with a
+  prefix already sent. The prompts built by ``genai_agent`` put the
+  shared instructions first and the posting last, so providers that cache
+  prompt prefixes only process the posting.
+
+Token counts are estimates (about four characters per token); use the
+provider's usage reports for billing.
+
+Usage:
+    cache = CompletionCache("~/.cache/genai-agent", ttl=7 * 24 * 3600)
+    backend = CachedBackend(ChatCompletionsBackend(url, model="gpt-4o-mini"), cache)
+    agent = GenAIAgent(summary_backend=backend, email_backend=backend)
+    agent.run_complete_workflow(job_text)
+    print(format_stats(backend.stats()))
+"""
+
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from cache import SQLiteStore, default_cache_dir
+from instrumentation import NULL_TRACER
+from llm_backend import EmailBackend, Message
+from serialization import dumps
+
+
+DB_NAME = "completions.sqlite3"
+DEFAULT_MAX_ENTRIES = 100_000
+DEFAULT_TTL = 30 * 24 * 3600
+
+# Bump when the key or stored value format changes.
+COMPLETION_SCHEMA = 1
+
+# Rough size of a token in English text, for the savings estimates.
+CHARS_PER_TOKEN = 4
+
+# Distinct prompt prefixes remembered for the prefix reuse counters.
+MAX_TRACKED_PREFIXES = 1024
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of ``text``."""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def normalize_text(text: str) -> str:
+    """Normalize prompt text for hashing.
+
+    Applies NFC, turns CRLF into LF, strips trailing whitespace from each
+    line and drops leading and trailing blank lines. None of these change
+    what a model reads.
+    """
+    text = unicodedata.normalize('NFC', text.replace('\r\n', '\n'))
+    return "\n".join(line.rstrip() for line in text.split('\n')).strip('\n')
+
+
+def completion_key(messages: List[Message], signature: str) -> str:
+    """Content address of a request: backend signature plus normalized messages."""
+    normalized = [[message['role'], normalize_text(message['content'])] for message in messages]
+    return hashlib.sha256(dumps([COMPLETION_SCHEMA, signature, normalized])).hexdigest()
+
+
+class CompletionCache(SQLiteStore):
+    """SQLite-backed LRU cache of completions with per-entry expiry."""
+
+    def __init__(self, cache_dir: Optional[str] = None, ttl: Optional[float] = DEFAULT_TTL,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.cache_dir = Path(os.path.expanduser(cache_dir or default_cache_dir()))
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.expired = 0
+        self.evictions = 0
+        super().__init__(self.cache_dir / DB_NAME)
+
+    def _setup(self, conn: sqlite3.Connection):
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS completions ("
+            " key TEXT PRIMARY KEY,"
+            " completion TEXT NOT NULL,"
+            " prompt_tokens INTEGER NOT NULL,"
+            " expires_at REAL,"
+            " last_access REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS completions_lru ON completions (last_access)")
+        conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the stored completion for ``key``, or None if absent or expired."""
+        now = time.time()
+        with self._lock:
+            row = self.conn.execute("SELECT completion, expires_at FROM completions WHERE key = ?",
+                                    (key,)).fetchone()
+            if row is not None and row[1] is not None and row[1] <= now:
+                with self.conn:
+                    self.conn.execute("DELETE FROM completions WHERE key = ?", (key,))
+                self.expired += 1
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+
+            with self.conn:
+                self.conn.execute("UPDATE completions SET last_access = ? WHERE key = ?",
+                                  (now, key))
+            self.hits += 1
+        return row[0]
+
+    def put(self, key: str, completion: str, prompt_tokens: int = 0):
+        """Store ``completion`` under ``key`` and evict if over ``max_entries``."""
+        now = time.time()
+        expires_at = now + self.ttl if self.ttl is not None else None
+        with self._lock:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO completions"
+                    " (key, completion, prompt_tokens, expires_at, last_access)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (key, completion, prompt_tokens, expires_at, now)
+                )
+            self.stores += 1
+            self.evict()
+
+    def evict(self):
+        """Drop least-recently-used entries until at most ``max_entries`` remain."""
+        with self._lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM completions").fetchone()[0]
+            if entries <= self.max_entries:
+                return
+
+            # Trim to 90% so a full cache doesn't evict on every store.
+            doomed = entries - int(self.max_entries * 0.9)
+            with self.conn:
+                self.conn.execute(
+                    "DELETE FROM completions WHERE key IN"
+                    " (SELECT key FROM completions ORDER BY last_access LIMIT ?)", (doomed,))
+            self.evictions += doomed
+
+    def purge_expired(self) -> int:
+        """Delete every expired entry; return how many."""
+        with self._lock, self.conn:
+            purged = self.conn.execute("DELETE FROM completions WHERE expires_at <= ?",
+                                       (time.time(),)).rowcount
+        self.expired += purged
+        return purged
+
+    def clear(self):
+        """Remove every entry."""
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM completions")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return counters for this instance plus the current number of entries."""
+        with self._lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM completions").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'stores': self.stores,
+            'expired': self.expired,
+            'evictions': self.evictions,
+            'entries': entries,
+            'max_entries': self.max_entries,
+        }
+
+
+class CachedBackend(EmailBackend):
+    """Backend answering repeated requests from a :class:`CompletionCache`."""
+
+    def __init__(self, backend: EmailBackend, cache: CompletionCache, tracer=None):
+        self.backend = backend
+        self.cache = cache
+        self.tracer = tracer or NULL_TRACER
+        self.prompt_tokens_saved = 0
+        self.completion_tokens_saved = 0
+        self.prompt_tokens_sent = 0
+        self.prefix_hits = 0
+        self.prefix_tokens_reused = 0
+        self._prefixes = set()
+        self._lock = threading.Lock()
+
+    def signature(self) -> str:
+        # Cached completions are the backend's own, so results are keyed the same.
+        return self.backend.signature()
+
+    async def complete(self, messages: List[Message]) -> str:
+        key = completion_key(messages, self.backend.signature())
+        prompt_tokens = sum(estimate_tokens(message['content']) for message in messages)
+
+        # SQLite calls block, so they run on a worker thread, not the event loop.
+        completion = await asyncio.to_thread(self.cache.get, key)
+        if completion is not None:
+            self.tracer.incr('completion_cache_hits')
+            with self._lock:
+                self.prompt_tokens_saved += prompt_tokens
+                self.completion_tokens_saved += estimate_tokens(completion)
+            return completion
+
+        self.tracer.incr('completion_cache_misses')
+        # Everything before the last message is what a provider's prefix
+        # cache can reuse; the last message carries the posting.
+        prefix = messages[:-1]
+        prefix_key = completion_key(prefix, self.backend.signature()) if prefix else None
+        with self._lock:
+            self.prompt_tokens_sent += prompt_tokens
+            if prefix_key in self._prefixes:
+                self.prefix_hits += 1
+                self.prefix_tokens_reused += sum(estimate_tokens(m['content']) for m in prefix)
+            elif prefix_key is not None and len(self._prefixes) < MAX_TRACKED_PREFIXES:
+                self._prefixes.add(prefix_key)
+
+        completion = await self.backend.complete(messages)
+        await asyncio.to_thread(self.cache.put, key, completion, prompt_tokens)
+        return completion
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache counters plus estimated token savings and prefix reuse."""
+        stats = self.cache.stats()
+        with self._lock:
+            stats.update({
+                'prompt_tokens_saved': self.prompt_tokens_saved,
+                'completion_tokens_saved': self.completion_tokens_saved,
+                'prompt_tokens_sent': self.prompt_tokens_sent,
+                'prefix_hits': self.prefix_hits,
+                'prefix_hit_rate': self.prefix_hits / stats['misses'] if stats['misses'] else 0.0,
+                'prefix_tokens_reused': self.prefix_tokens_reused,
+            })
+        return stats
+
+    async def aclose(self):
+        await self.backend.aclose()
+
+
+def format_stats(stats: Dict[str, Any]) -> str:
+    """One-paragraph summary of :meth:`CachedBackend.stats`."""
+    return (
+        f"Completion cache: {stats['hits']} hits, {stats['misses']} misses "
+        f"({stats['hit_rate']:.0%} hit rate), {stats['entries']} entries\n"
+        f"Saved ~{stats['prompt_tokens_saved']} prompt and "
+        f"~{stats['completion_tokens_saved']} completion tokens\n"
+        f"Sent ~{stats['prompt_tokens_sent']} prompt tokens; "
+        f"~{stats['prefix_tokens_reused']} were a prefix already sent "
+        f"({stats['prefix_hit_rate']:.0%} of requests)"
+    )
@@ -0,0 +1,210 @@
+"""
+Duplicate and near-duplicate detection for batches of postings
+
+Feeds often carry the same job reposted across regions with small edits.
+Before a batch is processed, every posting is fingerprinted twice:
+
+- Exact: SHA-256 of the text (line endings normalized)
+- Near: a MinHash signature over word shingles, split into bands for
+  locality-sensitive hashing so only likely matches are ever compared
+
+A posting whose estimated Jaccard similarity to an earlier cluster
+representative reaches the threshold joins that cluster; otherwise it
+becomes a representative itself. The workflow (and any LLM backend) runs
+once per representative, and each member receives the representative's
+results together with the lines in which it differs.
+
+Usage:
+    python cli.py --input-dir ./postings --dedup --dedup-threshold 0.85
+
+    dedup = Deduplicator(threshold=0.85)
+    for job_id, text in postings:
+        match = dedup.add(job_id, text)
+"""
+
+import difflib
+import hashlib
+import re
+import zlib
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from genai_agent import GenAIAgent
+
+
+DEFAULT_THRESHOLD = 0.8
+NUM_HASHES = 64
+BANDS = 16
+SHINGLE_SIZE = 5
+
+_WORD_PATTERN = re.compile(r"\w+")
+_EMPTY_SLOT = 1 << 32
+
+
+class Match(NamedTuple):
+    """Where :meth:`Deduplicator.add` placed a posting."""
+
+    representative: Hashable
+    similarity: float
+    exact: bool
+
+    @property
+    def is_duplicate(self) -> bool:
+        return self.similarity > 0
+
+
+def exact_fingerprint(text: str) -> str:
+    """Hash identifying byte-for-byte equal postings (CRLF and LF treated alike)."""
+    return hashlib.sha256(text.replace('\r\n', '\n').encode('utf-8')).hexdigest()
+
+
+def minhash_signature(text: str, num_hashes: int = NUM_HASHES,
+                      shingle_size: int = SHINGLE_SIZE) -> Tuple[int, ...]:
+    """MinHash signature of the lower-cased word shingles of ``text``.
+
+    Uses one-permutation hashing: every shingle is hashed once and the hash
+    picks both a slot and the value competing for that slot's minimum.
+    Empty slots borrow from the next filled slot, so the signature behaves
+    like ``num_hashes`` independent permutations at the cost of one.
+    """
+    words = _WORD_PATTERN.findall(text.lower())
+    if len(words) < shingle_size:
+        shingles = [" ".join(words)] if words else []
+    else:
+        shingles = [" ".join(words[i:i + shingle_size])
+                    for i in range(len(words) - shingle_size + 1)]
+
+    slots = [_EMPTY_SLOT] * num_hashes
+    for shingle in shingles:
+        h = zlib.crc32(shingle.encode('utf-8'))
+        slot, value = h % num_hashes, h // num_hashes
+        if value < slots[slot]:
+            slots[slot] = value
+
+    if not shingles:
+        return tuple(slots)
+
+    # Densify: an empty slot takes the value of the next filled one, offset
+    # by the distance so borrowed values never collide with real ones.
+    for slot in range(num_hashes):
+        if slots[slot] == _EMPTY_SLOT:
+            distance = 1
+            while slots[(slot + distance) % num_hashes] == _EMPTY_SLOT:
+                distance += 1
+            slots[slot] = -(slots[(slot + distance) % num_hashes] * num_hashes + distance)
+    return tuple(slots)
+
+
+def signature_similarity(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity: the fraction of equal signature slots."""
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+
+def line_differences(original: str, changed: str) -> Dict[str, List[str]]:
+    """Lines of ``changed`` missing from ``original`` and vice versa."""
+    a = [line.strip() for line in original.splitlines() if line.strip()]
+    b = [line.strip() for line in changed.splitlines() if line.strip()]
+    added: List[str] = []
+    removed: List[str] = []
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, a, b, autojunk=False).get_opcodes():
+        if tag in ('replace', 'delete'):
+            removed.extend(a[i1:i2])
+        if tag in ('replace', 'insert'):
+            added.extend(b[j1:j2])
+    return {'added': added, 'removed': removed}
+
+
+class Deduplicator:
+    """Incrementally assigns postings to clusters of (near-)duplicates.
+
+    Only representatives are indexed, so memory grows with the number of
+    distinct postings rather than the number seen.
+    """
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, num_hashes: int = NUM_HASHES,
+                 bands: int = BANDS, shingle_size: int = SHINGLE_SIZE):
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be in (0, 1]")
+        if num_hashes % bands:
+            raise ValueError("num_hashes must be a multiple of bands")
+        self.threshold = threshold
+        self.num_hashes = num_hashes
+        self.bands = bands
+        self.rows = num_hashes // bands
+        self.shingle_size = shingle_size
+
+        self._exact: Dict[str, Hashable] = {}
+        self._signatures: Dict[Hashable, Tuple[int, ...]] = {}
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], List[Hashable]] = {}
+
+    def _bands(self, signature: Tuple[int, ...]) -> Iterator[Tuple[int, Tuple[int, ...]]]:
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows]
+
+    def add(self, key: Hashable, text: str) -> Match:
+        """Place ``text`` in a cluster and return the match.
+
+        ``match.representative`` is ``key`` itself when the posting starts a
+        new cluster; ties between candidates go to the most similar, then the
+        earliest representative.
+        """
+        fingerprint = exact_fingerprint(text)
+        if fingerprint in self._exact:
+            return Match(self._exact[fingerprint], 1.0, True)
+
+        signature = minhash_signature(text, self.num_hashes, self.shingle_size)
+        candidates = []
+        for band_key in self._bands(signature):
+            for candidate in self._buckets.get(band_key, ()):
+                if candidate not in candidates:
+                    candidates.append(candidate)
+
+        best: Optional[Hashable] = None
+        best_similarity = 0.0
+        for candidate in candidates:
+            similarity = signature_similarity(signature, self._signatures[candidate])
+            if similarity > best_similarity:
+                best, best_similarity = candidate, similarity
+
+        if best is not None and best_similarity >= self.threshold:
+            return Match(best, best_similarity, False)
+
+        self._exact[fingerprint] = key
+        self._signatures[key] = signature
+        for band_key in self._bands(signature):
+            self._buckets.setdefault(band_key, []).append(key)
+        return Match(key, 0.0, False)
+
+    @property
+    def clusters(self) -> int:
+        """Number of representatives seen so far."""
+        return len(self._signatures)
+
+
+def process_deduplicated(items: Iterable[Tuple[Hashable, str]],
+                         agent: Optional[GenAIAgent] = None,
+                         threshold: float = DEFAULT_THRESHOLD) -> Iterator[Dict[str, Any]]:
+    """Run the workflow once per cluster and yield a result per ``(id, text)``, in order.
+
+    Duplicates carry ``duplicate_of``, ``similarity`` and ``differences``
+    (lines added and removed relative to the representative).
+    """
+    agent = agent or GenAIAgent()
+    dedup = Deduplicator(threshold)
+    texts: Dict[Hashable, str] = {}
+    results: Dict[Hashable, Dict[str, Any]] = {}
+
+    for key, text in items:
+        match = dedup.add(key, text)
+        if not match.is_duplicate:
+            texts[key] = text
+            results[key] = agent.run_complete_workflow(text)
+            yield {'id': key, **results[key]}
+            continue
+
+        yield {
+            'id': key,
+            **results[match.representative],
+            'duplicate_of': match.representative,
+            'similarity': round(match.similarity, 4),
+            'differences': line_differences(texts[match.representative], text),
+        }
@@ -0,0 +1,161 @@
+"""
+Precompiled email templates for EmailGenerator
+
+Templates are plain text with ``{{ slot }}`` placeholders. Compiling one
+splits it into literal text and slots a single time and produces a format
+string, so rendering is one ``str.format_map`` call running in C. Slots
+known at compile time (the subject and the voice's sections, which depend
+only on the voice) are baked in as literal text; the rest are filled per
+email from the job summary, the extracted information and per-recipient
+personalization.
+
+Slots available to intro email templates:
+
+- Voice: subject, opening, vision, execution, metrics, closing
+- Job: job_summary, summary_headline, top_requirement, requirement_count,
+  first_milestone, key_metric, job_highlights (a paragraph listing the
+  last three that are known, led by a blank line; empty without
+  extracted information, so it can follow another slot directly)
+- Recipient: recipient_name (default "Team"), sender_name (default
+  "[VP Name]"), sender_title (default: the voice profile's name)
+
+Slots left unfilled render as their default, or as an empty string.
+Values are inserted verbatim; braces in them are never interpreted.
+
+Usage:
+    template = compile_template("Dear {{recipient_name}},\\n\\n{{opening}}",
+                                static={"opening": "Hello."})
+    template.render({"recipient_name": "Ada"})
+
+    generator = EmailGenerator()
+    emails = generator.render_intro_emails(summary, [{"recipient_name": "Ada"}],
+                                           extracted_info=info)
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+
+SLOT_PATTERN = re.compile(r"\{\{\s*([A-Za-z_]\w*)\s*\}\}")
+
+INTRO_EMAIL_TEMPLATE = """Subject: {{subject}}
+
+Dear {{recipient_name}},
+
+{{opening}}
+
+{{vision}}
+
+{{execution}}{{job_highlights}}
+
+{{metrics}}
+
+{{closing}}
+
+Best regards,
+{{sender_name}}
+{{sender_title}}
+
+P.S. If you're reading this and thinking "this sounds impossible," you're exactly the kind of person we need. The impossible is just another word for "not automated yet."
+"""
+
+INTRO_EMAIL_SUBJECT = "Welcome to the Future of AI-Powered Executive Operations"
+
+# (label, slot) of the job_highlights lines, in order
+_HIGHLIGHTS = (
+    ("Top requirement", 'top_requirement'),
+    ("First milestone", 'first_milestone'),
+    ("Key metric", 'key_metric'),
+)
+
+RECIPIENT_DEFAULTS = {
+    'recipient_name': 'Team',
+    'sender_name': '[VP Name]',
+}
+
+
+def _escape(text: str) -> str:
+    return text.replace('{', '{{').replace('}', '}}')
+
+
+class CompiledTemplate:
+    """A template split into literal text and slots once, rendered by ``format_map``."""
+
+    __slots__ = ('source', 'slots', 'defaults', '_format')
+
+    def __init__(self, source: str, slots: Tuple[str, ...], format_string: str,
+                 defaults: Dict[str, Any]):
+        self.source = source
+        self.slots = slots
+        # Every slot has a value, so rendering never needs a missing-key hook
+        self.defaults = {slot: defaults.get(slot, '') for slot in slots}
+        self._format = format_string
+
+    def render(self, values: Optional[Mapping[str, Any]] = None, **extra: Any) -> str:
+        """Fill the slots from ``values`` and keyword arguments; unknown keys are ignored."""
+        merged = self.defaults.copy()
+        if values:
+            merged.update(values)
+        if extra:
+            merged.update(extra)
+        return self._format.format_map(merged)
+
+    def render_many(self, rows: Iterable[Mapping[str, Any]],
+                    shared: Optional[Mapping[str, Any]] = None) -> List[str]:
+        """Render once per row; ``shared`` values apply to every row (rows win)."""
+        base = self.defaults.copy()
+        if shared:
+            base.update(shared)
+        fmt = self._format.format_map
+        out = []
+        for row in rows:
+            values = base.copy()
+            values.update(row)
+            out.append(fmt(values))
+        return out
+
+
+def compile_template(source: str, static: Optional[Mapping[str, Any]] = None,
+                     defaults: Optional[Mapping[str, Any]] = None) -> CompiledTemplate:
+    """Compile ``source``, baking in the slots given in ``static``.
+
+    ``defaults`` supplies values for slots a render call leaves out.
+    """
+    static = static or {}
+    parts = []
+    slots: List[str] = []
+    pos = 0
+    for match in SLOT_PATTERN.finditer(source):
+        parts.append(_escape(source[pos:match.start()]))
+        name = match.group(1)
+        if name in static:
+            parts.append(_escape(str(static[name])))
+        else:
+            parts.append('{' + name + '}')
+            if name not in slots:
+                slots.append(name)
+        pos = match.end()
+    parts.append(_escape(source[pos:]))
+    return CompiledTemplate(source, tuple(slots), ''.join(parts), dict(defaults or {}))
+
+
+def email_slots(summary: str, extracted_info: Optional[Mapping[str, Any]] = None) -> Dict[str, Any]:
+    """Job-specific slot values from a summary and ``extract_key_information`` output."""
+    headline = next((line.strip().lstrip('#').strip()
+                     for line in summary.splitlines() if line.strip()), '')
+    slots: Dict[str, Any] = {'job_summary': summary, 'summary_headline': headline,
+                             'job_highlights': ''}
+    if extracted_info:
+        requirements = list(extracted_info.get('must_haves') or ())
+        timeline = extracted_info.get('timeline') or ['']
+        metrics = extracted_info.get('metrics') or ['']
+        slots.update(
+            top_requirement=requirements[0] if requirements else '',
+            requirement_count=len(requirements),
+            first_milestone=timeline[0],
+            key_metric=metrics[0],
+        )
+        highlights = [f"- {label}: {slots[slot]}" for label, slot in _HIGHLIGHTS if slots[slot]]
+        if highlights:
+            slots['job_highlights'] = "\n\nWhat the role looks like:\n" + "\n".join(highlights)
+    return slots
@@ -11,28 +11,140 @@ Architecture:
 - Summarizer: Handles job description analysis and summarization
 - EmailGenerator: Handles email composition in specific voices
 - VoiceProfile: Defines communication style and characteristics
+- SectionIndex: Locates the section headings of a posting in one scan
 """
 
-import json
+# llm_backend (and with it asyncio), hashlib and json are imported where
+# they are used: only LLM backends, custom templates and prompt contexts
+# need them, and asyncio alone took most of this module's import time.
 import re
-from typing import Dict, List, Optional, Any
+from bisect import bisect_right
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional, Any, Tuple, Union
 from dataclasses import dataclass
 from datetime import datetime
 
+from email_templates import (
+    INTRO_EMAIL_SUBJECT, INTRO_EMAIL_TEMPLATE, RECIPIENT_DEFAULTS, CompiledTemplate,
+    compile_template, email_slots,
+)
+from instrumentation import NULL_TRACER
+from results import JobAnalysis
 
-@dataclass
+
+# Precompiled extraction patterns, shared by every summarizer instance.
+#
+# The timeline pattern is equivalent to
+#   (?i)(Day|Month|Week)\s+(\d+(?:-\d+)?)[:\s—-]+([^•\n]+)
+# but starts with a plain character class so the regex engine can skip
+# ahead to candidate positions instead of trying the case-insensitive
+# alternation at every offset. The lookbehinds pin each branch to its first
+# letter; U+212A (Kelvin sign) is kept because IGNORECASE folds it to "k".
+TIMELINE_PATTERN = re.compile(
+    r"([DdMmWw](?:(?<=[Dd])[Aa][Yy]"
+    r"|(?<=[Mm])[Oo][Nn][Tt][Hh]"
+    r"|(?<=[Ww])[Ee][Ee][Kk\u212a]))"
+    r"\s+(\d+(?:-\d+)?)[:\s—-]+([^•\n]+)"
+)
+METRICS_PATTERN = re.compile(r"≥\s*(\d+)\s*%?\s*([^.\n]+)")
+BULLET_PATTERN = re.compile(r'[•*\-]\s*([^•*\-\n]+)')
+
+# Postings containing this get the fixed "Position Overview" summary section.
+OVERVIEW_MARKER = "Vibe Coder-in-Residence"
+
+# extracted_info field -> (section heading, heading that cuts the section short)
+BULLET_SECTIONS = {
+    "must_haves": ("Must-Haves", "Nice-to-Haves"),
+    "nice_to_haves": ("Nice-to-Haves", "Success Metrics"),
+}
+
+# Headings a posting is divided into. Longer names come first in the
+# pattern so "Core Mission" is matched whole rather than as "Mission".
+SECTION_HEADINGS = (
+    "Mission", "Core Mission", "What You'll Do", "Key Responsibilities",
+    "Responsibilities", "Daily Responsibilities", "Daily Technical Responsibilities",
+    "Must-Haves", "Required Qualifications", "Nice-to-Haves", "Preferred Qualifications",
+    "Success Metrics", "About Us", "Benefits", "Compensation",
+)
+_HEADING_NAMES = "|".join(re.escape(h) for h in sorted(SECTION_HEADINGS, key=len, reverse=True))
+# A heading alone on its line, e.g. "Must-Haves" or "What You'll Do (First 6
+# Months)". Matching from the preceding newline gives the regex engine a
+# literal to search for; the first line is checked with the anchored form.
+_HEADING_LINE = (r"[ \t#*]*(" + _HEADING_NAMES + r")"
+                 r"[ \t*]*(?:\([^)\n]*\))?[ \t*:]*(?=\r?\n|\Z)")
+HEADING_PATTERN = re.compile(r"\n" + _HEADING_LINE)
+FIRST_HEADING_PATTERN = re.compile(_HEADING_LINE)
+
+# System prompt for LLM-written summaries; the analysis framework's questions follow.
+SUMMARY_SYSTEM_PROMPT = (
+    "You summarize job descriptions for the people who will work with the new hire. "
+    "Answer each question below from the posting, under a markdown heading per question, "
+    "and keep requirements and metrics verbatim.\n"
+)
+
+# System prompt for LLM-written email sections; the voice's prompt context follows.
+EMAIL_SYSTEM_PROMPT = (
+    "You write internal introduction emails in the voice described below. "
+    "Reply with the requested paragraph only.\n"
+)
+
+# Instructions sent to an LLM backend for each generated email section.
+EMAIL_SECTION_PROMPTS = {
+    "opening": "Write the opening paragraph introducing the initiative and why it matters now.",
+    "vision": "Write a paragraph on the long-term vision and strategic impact.",
+    "execution": "Write a paragraph on how the work will be executed, starting immediately.",
+    "metrics": "Write a paragraph on the success metrics and how results will be measured.",
+    "closing": "Write a short, energetic closing of one or two sentences.",
+}
+
+# Sections an LLM-written section builds on: it is requested once these are
+# written, with their text in its prompt. The others are requested at once.
+EMAIL_SECTION_DEPENDENCIES = {
+    "closing": ("metrics",),
+}
+
+
+@dataclass(frozen=True)
 class VoiceProfile:
-    """Defines the communication style and characteristics for email generation."""
+    """Defines the communication style and characteristics for email generation.
+    
+    Profiles are immutable: the lists are stored as tuples and the style as
+    a read-only mapping, so a profile shared by generators and registries,
+    and the prompt context compiled from it, cannot drift apart. Use
+    ``dataclasses.replace`` to derive a changed profile.
+    """
     
     name: str
     role: str
-    communication_style: Dict[str, Any]
-    key_phrases: List[str]
-    priorities: List[str]
-    tone_descriptors: List[str]
+    communication_style: Mapping[str, Any]
+    key_phrases: Tuple[str, ...]
+    priorities: Tuple[str, ...]
+    tone_descriptors: Tuple[str, ...]
+    
+    def __post_init__(self):
+        object.__setattr__(self, 'communication_style',
+                           MappingProxyType(dict(self.communication_style)))
+        for field in ('key_phrases', 'priorities', 'tone_descriptors'):
+            object.__setattr__(self, field, tuple(getattr(self, field)))
+    
+    def __reduce__(self):
+        return (type(self), (self.name, self.role, dict(self.communication_style),
+                             self.key_phrases, self.priorities, self.tone_descriptors))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """The profile as plain JSON-serializable data (``asdict`` cannot copy the style)."""
+        return {
+            'name': self.name,
+            'role': self.role,
+            'communication_style': dict(self.communication_style),
+            'key_phrases': list(self.key_phrases),
+            'priorities': list(self.priorities),
+            'tone_descriptors': list(self.tone_descriptors),
+        }
     
     def to_prompt_context(self) -> str:
         """Convert voice profile to prompt context for LLM."""
+        import json
         return f"""
 Voice Profile: {self.name} ({self.role})
 
@@ -42,14 +154,151 @@ Communication Style:
 - Typical Phrases: {', '.join(self.key_phrases)}
 
 Style Characteristics:
-{json.dumps(self.communication_style, indent=2)}
+{json.dumps(dict(self.communication_style), indent=2)}
 """
 
 
+# The built-in voice, used when no other profile is requested.
+VP_EDGE_AI_PROFILE = VoiceProfile(
+    name="VP of Edge AI",
+    role="Vice President of Edge AI",
+    communication_style={
+        "directness": "high",
+        "technical_depth": "advanced",
+        "urgency": "high",
+        "vision_focus": "future-oriented",
+        "metrics_driven": True,
+        "evangelism": True
+    },
+    key_phrases=[
+        "ship daily",
+        "metrics or it didn't happen",
+        "the future of work",
+        "competitive advantage",
+        "unprecedented",
+        "non-negotiable",
+        "extraordinary"
+    ],
+    priorities=[
+        "Speed and execution",
+        "Measurable results",
+        "Innovation and disruption",
+        "AI evangelism",
+        "Operational excellence"
+    ],
+    tone_descriptors=[
+        "confident",
+        "visionary",
+        "results-oriented",
+        "technically sophisticated",
+        "urgency-driven"
+    ]
+)
+
+
+def timeline_entry(period: str, duration: str, task: str) -> str:
+    """Format one ``TIMELINE_PATTERN`` match for ``extracted_info["timeline"]``."""
+    return f"{period} {duration}: {task.strip()}"
+
+
+def metric_entry(value: str, description: str) -> str:
+    """Format one ``METRICS_PATTERN`` match for ``extracted_info["metrics"]``."""
+    return f"{value}% {description.strip()}"
+
+
+class SectionIndex:
+    """Offsets of the section headings in one posting.
+    
+    The text is scanned once for lines holding one of ``SECTION_HEADINGS``.
+    Each such line starts a section that runs to the next one, whatever
+    order the sections come in, so looking up a section is a dictionary
+    access rather than a new search of the text. Offsets are character
+    positions in the ``str``.
+    """
+    
+    def __init__(self, text: str):
+        self.text = text
+        # First heading line of each name -> (start, end) of its section
+        self.ranges: Dict[str, Tuple[int, int]] = {}
+        
+        headings = []
+        first = FIRST_HEADING_PATTERN.match(text)
+        if first:
+            headings.append((first.start(1), first.group(1)))
+        headings.extend((m.start(1), m.group(1)) for m in HEADING_PATTERN.finditer(text))
+        
+        self.headings = headings
+        self._starts = [start for start, _ in headings]
+        for i, (start, name) in enumerate(headings):
+            if name not in self.ranges:
+                end = self._starts[i + 1] if i + 1 < len(headings) else len(text)
+                self.ranges[name] = (start, end)
+    
+    def bounds(self, name: str, end_marker: Optional[str] = None) -> Optional[Tuple[int, int]]:
+        """Return ``(start, end)`` of section ``name``, or None if absent.
+        
+        A name that never stands on its own line starts at its first
+        occurrence and runs to the next heading. ``end_marker``, if it
+        appears inside the section, cuts it short there, as the old
+        start/end marker search did.
+        """
+        if name in self.ranges:
+            start, end = self.ranges[name]
+        else:
+            start = self.text.find(name)
+            if start == -1:
+                return None
+            i = bisect_right(self._starts, start)
+            end = self._starts[i] if i < len(self._starts) else len(self.text)
+        
+        if end_marker:
+            marker_idx = self.text.find(end_marker, start + 1, end)
+            if marker_idx != -1:
+                end = marker_idx
+        
+        return start, end
+    
+    def segments(self) -> List[Tuple[str, int, int]]:
+        """Split the whole text at every heading line, as ``(name, start, end)``.
+        
+        Text before the first heading is included with the name ``''``.
+        """
+        bounds = self._starts + [len(self.text)]
+        segments = [('', 0, bounds[0])] if bounds[0] > 0 else []
+        segments.extend((name, start, bounds[i + 1])
+                        for i, (start, name) in enumerate(self.headings))
+        return segments
+    
+    def section(self, name: str, end_marker: Optional[str] = None) -> str:
+        """Return the text of section ``name`` (heading included), or ''."""
+        bounds = self.bounds(name, end_marker)
+        return self.text[bounds[0]:bounds[1]] if bounds else ""
+    
+    def bullets(self, name: str, end_marker: Optional[str] = None) -> List[str]:
+        """Return the bullet points in section ``name``.
+        
+        The scan starts after the heading, so the hyphens of a heading such
+        as ``Must-Haves`` are not read as bullets.
+        """
+        bounds = self.bounds(name, end_marker)
+        if bounds is None:
+            return []
+        start, end = bounds
+        bullets = BULLET_PATTERN.findall(self.text, min(start + len(name), end), end)
+        return [bullet.strip() for bullet in bullets if bullet.strip()]
+
+
 class JobDescriptionSummarizer:
-    """Handles analysis and summarization of job descriptions."""
+    """Handles analysis and summarization of job descriptions.
     
-    def __init__(self):
+    Summaries come from a fixed layout by default. With a ``backend`` (see
+    ``llm_backend.EmailBackend``) they are written by a model, prompted with
+    ``analysis_framework``.
+    """
+    
+    def __init__(self, tracer=None, backend=None):
+        self.tracer = tracer or NULL_TRACER
+        self.backend = backend
         self.analysis_framework = {
             "core_mission": "What is the primary purpose and mission?",
             "key_responsibilities": "What are the main tasks and duties?",
@@ -59,145 +308,342 @@ class JobDescriptionSummarizer:
             "cultural_fit": "What type of person/culture is this role suited for?"
         }
     
-    def extract_key_information(self, job_text: str) -> Dict[str, Any]:
-        """Extract structured information from job description text."""
+    def extract_key_information(self, job_text: str,
+                                timestamp: Optional[str] = None) -> Dict[str, Any]:
+        """Extract structured information from job description text.
+
+        Uses the module-level precompiled patterns. Callers that also need a
+        summary should pass the result to :meth:`generate_summary` rather
+        than extracting a second time. ``timestamp`` is used for
+        ``extracted_at`` instead of reading the clock.
+        """
         
-        # Parse timeline information
-        timeline_pattern = r"(Day|Month|Week)\s+(\d+(?:-\d+)?)[:\s—-]+([^•\n]+)"
-        timeline_matches = re.findall(timeline_pattern, job_text, re.IGNORECASE)
+        with self.tracer.span('extract', input_size=len(job_text)):
+            # Parse timeline information
+            timeline_matches = TIMELINE_PATTERN.findall(job_text)
         
-        # Parse metrics
-        metrics_pattern = r"≥\s*(\d+)\s*%?\s*([^.\n]+)"
-        metrics_matches = re.findall(metrics_pattern, job_text)
+            # Parse metrics
+            metrics_matches = METRICS_PATTERN.findall(job_text)
         
-        # Extract requirements sections
-        must_haves = self._extract_section(job_text, "Must-Haves", "Nice-to-Haves")
-        nice_to_haves = self._extract_section(job_text, "Nice-to-Haves", "Success Metrics")
+            # Extract requirements sections from one index of the headings
+            index = SectionIndex(job_text)
+            must_haves = index.bullets(*BULLET_SECTIONS["must_haves"])
+            nice_to_haves = index.bullets(*BULLET_SECTIONS["nice_to_haves"])
         
-        return {
-            "timeline": [f"{period} {duration}: {task.strip()}" 
-                        for period, duration, task in timeline_matches],
-            "metrics": [f"{value}% {description.strip()}" 
-                       for value, description in metrics_matches],
-            "must_haves": must_haves,
-            "nice_to_haves": nice_to_haves,
-            "extracted_at": datetime.now().isoformat()
-        }
+            return {
+                "timeline": [timeline_entry(*match) for match in timeline_matches],
+                "metrics": [metric_entry(*match) for match in metrics_matches],
+                "must_haves": must_haves,
+                "nice_to_haves": nice_to_haves,
+                "extracted_at": timestamp or datetime.now().isoformat()
+            }
     
-    def _extract_section(self, text: str, start_marker: str, end_marker: str) -> List[str]:
-        """Extract bullet points from a specific section."""
-        start_idx = text.find(start_marker)
-        if start_idx == -1:
-            return []
+    def signature(self) -> str:
+        """Identify what shapes the summary besides the posting (for cache keys)."""
+        return self.backend.signature() if self.backend is not None else ''
+    
+    def system_prompt(self) -> str:
+        """The system prompt for LLM-written summaries; the same for every posting."""
+        questions = "\n".join(f"- {key}: {question}"
+                              for key, question in self.analysis_framework.items())
+        return SUMMARY_SYSTEM_PROMPT + questions
+    
+    def summary_messages(self, job_text: str, extracted_info: Dict[str, Any]
+                         ) -> List[Dict[str, str]]:
+        """Build the chat messages asking the backend to summarize ``job_text``.
         
-        end_idx = text.find(end_marker, start_idx)
-        if end_idx == -1:
-            section_text = text[start_idx:]
-        else:
-            section_text = text[start_idx:end_idx]
+        The framework comes first and the posting last, so every request
+        starts with the same prefix and providers that cache prompt prefixes
+        only process the posting. ``extracted_at`` is left out to keep the
+        prompt identical between runs.
+        """
+        facts = []
+        for field in ("timeline", "must_haves", "nice_to_haves", "metrics"):
+            if extracted_info.get(field):
+                facts.append(f"{field}:\n" + "\n".join(f"- {item}" for item in extracted_info[field]))
+        return [
+            {"role": "system", "content": self.system_prompt()},
+            {"role": "user", "content": (
+                "Extracted facts:\n" + "\n\n".join(facts) + f"\n\nJob description:\n{job_text}"
+            )},
+        ]
+    
+    def _extract_section(self, text: str, start_marker: str, end_marker: str,
+                         index: Optional[SectionIndex] = None) -> List[str]:
+        """Extract bullet points from a specific section.
         
-        # Extract bullet points
-        bullets = re.findall(r'[•*\-]\s*([^•*\-\n]+)', section_text)
-        return [bullet.strip() for bullet in bullets if bullet.strip()]
+        Pass an ``index`` already built for ``text`` to avoid scanning the
+        text again when extracting several sections.
+        """
+        if index is None:
+            index = SectionIndex(text)
+        return index.bullets(start_marker, end_marker)
     
-    def generate_summary(self, job_text: str) -> str:
-        """Generate a comprehensive summary of the job description."""
+    def generate_summary(self, job_text: str,
+                         extracted_info: Optional[Dict[str, Any]] = None) -> str:
+        """Generate a comprehensive summary of the job description.
+
+        If ``extracted_info`` (as returned by :meth:`extract_key_information`)
+        is given it is used as-is and the text is not scanned again.
+        """
+        
+        if self.backend is not None:
+            from llm_backend import run_sync
+            with self.tracer.span('summary', input_size=len(job_text), backend=True):
+                if extracted_info is None:
+                    extracted_info = self.extract_key_information(job_text)
+                return run_sync(self.backend.complete(
+                    self.summary_messages(job_text, extracted_info)))
         
-        extracted_info = self.extract_key_information(job_text)
+        with self.tracer.span('summary', input_size=len(job_text)):
+            if extracted_info is None:
+                extracted_info = self.extract_key_information(job_text)
         
-        # Create structured summary
-        summary_sections = []
+            # Create structured summary
+            summary_sections = []
         
-        # Overview section
-        if "Vibe Coder-in-Residence" in job_text:
-            summary_sections.append(
-                "## Position Overview\n"
-                "**Role**: Vibe Coder-in-Residence (GenAI Tech EA)\n"
-                "**Focus**: Shadow VP of Edge AI to build automated GenAI workflows and digital twin\n"
-                "**Duration**: 6-month program with aggressive milestones\n"
-            )
+            # Overview section
+            if OVERVIEW_MARKER in job_text:
+                summary_sections.append(
+                    "## Position Overview\n"
+                    "**Role**: Vibe Coder-in-Residence (GenAI Tech EA)\n"
+                    "**Focus**: Shadow VP of Edge AI to build automated GenAI workflows and digital twin\n"
+                    "**Duration**: 6-month program with aggressive milestones\n"
+                )
         
-        # Timeline section
-        if extracted_info["timeline"]:
-            summary_sections.append("## Key Timeline Milestones")
-            for milestone in extracted_info["timeline"][:6]:  # Top 6 milestones
-                summary_sections.append(f"- {milestone}")
-            summary_sections.append("")
+            # Timeline section
+            if extracted_info["timeline"]:
+                summary_sections.append("## Key Timeline Milestones")
+                for milestone in extracted_info["timeline"][:6]:  # Top 6 milestones
+                    summary_sections.append(f"- {milestone}")
+                summary_sections.append("")
         
-        # Requirements section
-        if extracted_info["must_haves"]:
-            summary_sections.append("## Critical Requirements")
-            for req in extracted_info["must_haves"][:5]:  # Top 5 requirements
-                summary_sections.append(f"- {req}")
-            summary_sections.append("")
+            # Requirements section
+            if extracted_info["must_haves"]:
+                summary_sections.append("## Critical Requirements")
+                for req in extracted_info["must_haves"][:5]:  # Top 5 requirements
+                    summary_sections.append(f"- {req}")
+                summary_sections.append("")
         
-        # Success metrics section
-        if extracted_info["metrics"]:
-            summary_sections.append("## Success Metrics")
-            for metric in extracted_info["metrics"]:
-                summary_sections.append(f"- {metric}")
-            summary_sections.append("")
+            # Success metrics section
+            if extracted_info["metrics"]:
+                summary_sections.append("## Success Metrics")
+                for metric in extracted_info["metrics"]:
+                    summary_sections.append(f"- {metric}")
+                summary_sections.append("")
         
-        return "\n".join(summary_sections)
+            return "\n".join(summary_sections)
 
 
 class EmailGenerator:
-    """Handles email generation in specific voices and styles."""
+    """Handles email generation in specific voices and styles.
     
-    def __init__(self):
-        self.vp_voice_profile = VoiceProfile(
-            name="VP of Edge AI",
-            role="Vice President of Edge AI",
-            communication_style={
-                "directness": "high",
-                "technical_depth": "advanced",
-                "urgency": "high",
-                "vision_focus": "future-oriented",
-                "metrics_driven": True,
-                "evangelism": True
-            },
-            key_phrases=[
-                "ship daily",
-                "metrics or it didn't happen",
-                "the future of work",
-                "competitive advantage",
-                "unprecedented",
-                "non-negotiable",
-                "extraordinary"
-            ],
-            priorities=[
-                "Speed and execution",
-                "Measurable results",
-                "Innovation and disruption",
-                "AI evangelism",
-                "Operational excellence"
-            ],
-            tone_descriptors=[
-                "confident",
-                "visionary",
-                "results-oriented",
-                "technically sophisticated",
-                "urgency-driven"
-            ]
+    By default every section comes from a fixed template. When a ``backend``
+    (see ``llm_backend.EmailBackend``) is given, the sections are written by
+    the model instead. They are scheduled by ``task_graph``: each section is
+    requested as soon as the sections it builds on are written (see
+    ``EMAIL_SECTION_DEPENDENCIES``), so an email takes about as long as its
+    slowest chain of requests. ``section_timeout`` bounds each request, in
+    seconds. With ``fallback``, a section that times out or fails uses the
+    template's text; without it, the error is raised.
+    """
+    
+    def __init__(self, backend=None, tracer=None, voice_profiles=None,
+                 template: Optional[str] = None, section_timeout: Optional[float] = None,
+                 fallback: bool = False):
+        self.backend = backend
+        self.section_timeout = section_timeout
+        self.fallback = fallback
+        self.tracer = tracer or NULL_TRACER
+        if voice_profiles is None:
+            from voice_profiles import builtin_registry
+            voice_profiles = builtin_registry()
+        self.voice_profiles = voice_profiles
+        # See email_templates for the slots a template can use
+        self.template = template or INTRO_EMAIL_TEMPLATE
+        # Compiled with every slot open, for sections known only at render time
+        self._open_template = compile_template(self.template, defaults=RECIPIENT_DEFAULTS)
+        # Voice name -> (voice version, template sections / compiled template);
+        # kept per generator because subclasses may write the sections differently
+        self._sections: Dict[str, Tuple[str, Dict[str, str]]] = {}
+        self._templates: Dict[str, Tuple[str, CompiledTemplate]] = {}
+    
+    @property
+    def vp_voice_profile(self) -> VoiceProfile:
+        """The registry's default voice profile."""
+        return self.voice_profiles.profile()
+    
+    def signature(self) -> str:
+        """Identify everything besides the voice that shapes the email (for cache keys)."""
+        signature = self.backend.signature() if self.backend is not None else ''
+        if self.template != INTRO_EMAIL_TEMPLATE:
+            import hashlib
+            signature += ':template=' + hashlib.sha256(self.template.encode('utf-8')).hexdigest()[:16]
+        return signature
+    
+    def _resolve_voice(self, voice_profile: Union[VoiceProfile, str, None]):
+        """Return the compiled voice for a profile, a registered name or None (default)."""
+        if voice_profile is None or isinstance(voice_profile, str):
+            return self.voice_profiles.get(voice_profile)
+        
+        registered = self.voice_profiles.find(voice_profile.name)
+        if registered is not None and registered.profile is voice_profile:
+            return registered
+        from voice_profiles import CompiledVoice
+        return CompiledVoice(voice_profile)
+    
+    def _voice_template(self, voice, context: str = '') -> CompiledTemplate:
+        """Return this generator's template compiled for ``voice``.
+        
+        The template sections depend only on the voice, so they are built
+        once per voice version and baked into the template with the
+        subject; only job and recipient slots are left to fill.
+        """
+        cached = self._templates.get(voice.profile.name)
+        if cached is not None and cached[0] == voice.version:
+            return cached[1]
+        
+        compiled = compile_template(
+            self.template,
+            static={"subject": INTRO_EMAIL_SUBJECT, **self._template_sections(voice, context)},
+            defaults={**RECIPIENT_DEFAULTS, "sender_title": voice.profile.name},
         )
+        self._templates[voice.profile.name] = (voice.version, compiled)
+        return compiled
+    
+    def _template_sections(self, voice, context: str = '') -> Dict[str, str]:
+        """The template text of every section for ``voice``, built once per voice version."""
+        cached = self._sections.get(voice.profile.name)
+        if cached is not None and cached[0] == voice.version:
+            return cached[1]
+        
+        sections = {
+            "opening": self._generate_opening(context, voice.profile),
+            "vision": self._generate_vision_section(context, voice.profile),
+            "execution": self._generate_execution_section(context, voice.profile),
+            "metrics": self._generate_metrics_section(context, voice.profile),
+            "closing": self._generate_closing(voice.profile)
+        }
+        self._sections[voice.profile.name] = (voice.version, sections)
+        return sections
+    
+    def compiled_template(self, voice_profile: Union[VoiceProfile, str, None] = None
+                          ) -> CompiledTemplate:
+        """The compiled intro email template for a voice (see :meth:`_resolve_voice`)."""
+        return self._voice_template(self._resolve_voice(voice_profile))
+    
+    def generate_intro_email(self, context: str,
+                             voice_profile: Union[VoiceProfile, str, None] = None,
+                             extracted_info: Optional[Dict[str, Any]] = None,
+                             recipient: Optional[Dict[str, Any]] = None) -> str:
+        """Generate an introduction email in the specified voice.
+        
+        ``voice_profile`` is a :class:`VoiceProfile`, the name of one in the
+        registry, or None for the registry's default. ``extracted_info`` and
+        ``recipient`` fill the template's job and recipient slots.
+        """
+        
+        if self.backend is not None:
+            from llm_backend import run_sync
+            return run_sync(self.agenerate_intro_email(context, voice_profile,
+                                                       extracted_info, recipient))
+        
+        voice = self._resolve_voice(voice_profile)
+        
+        with self.tracer.span('email', input_size=len(context)):
+            values = email_slots(context, extracted_info)
+            if recipient:
+                values.update(recipient)
+            return self._voice_template(voice, context).render(values)
+    
+    def render_intro_emails(self, context: str, recipients: Iterable[Dict[str, Any]],
+                            voice_profile: Union[VoiceProfile, str, None] = None,
+                            extracted_info: Optional[Dict[str, Any]] = None) -> List[str]:
+        """Render one intro email per recipient from a single compiled template.
+        
+        Each recipient is a mapping of slot values (``recipient_name`` and so
+        on). The job slots are computed once; with a backend the sections are
+        also requested once and shared by every recipient.
+        """
+        
+        recipients = list(recipients)
+        voice = self._resolve_voice(voice_profile)
+        
+        if self.backend is not None:
+            from llm_backend import run_sync
+            sections = run_sync(self._backend_sections(voice, context))
+            with self.tracer.span('email_bulk', input_size=len(recipients), backend=True):
+                shared = {"subject": INTRO_EMAIL_SUBJECT, "sender_title": voice.profile.name,
+                          **sections, **email_slots(context, extracted_info)}
+                return self._open_template.render_many(recipients, shared)
+        
+        with self.tracer.span('email_bulk', input_size=len(recipients)):
+            return self._voice_template(voice, context).render_many(
+                recipients, email_slots(context, extracted_info))
+    
+    async def agenerate_intro_email(self, context: str,
+                                    voice_profile: Union[VoiceProfile, str, None] = None,
+                                    extracted_info: Optional[Dict[str, Any]] = None,
+                                    recipient: Optional[Dict[str, Any]] = None) -> str:
+        """Async variant of :meth:`generate_intro_email`.
+        
+        With a backend, the voice profile's prompt context and ``context``
+        are sent once per section and the sections are awaited together.
+        """
+        
+        if self.backend is None:
+            return self.generate_intro_email(context, voice_profile, extracted_info, recipient)
+        
+        voice = self._resolve_voice(voice_profile)
+        
+        with self.tracer.span('email', input_size=len(context), backend=True):
+            values = {"subject": INTRO_EMAIL_SUBJECT, "sender_title": voice.profile.name}
+            values.update(await self._backend_sections(voice, context))
+            values.update(email_slots(context, extracted_info))
+            if recipient:
+                values.update(recipient)
+            return self._open_template.render(values)
     
-    def generate_intro_email(self, context: str, voice_profile: Optional[VoiceProfile] = None) -> str:
-        """Generate an introduction email in the specified voice."""
+    async def _backend_sections(self, voice, context: str) -> Dict[str, str]:
+        """Ask the backend for every email section, each once its dependencies are written."""
+        from task_graph import Task, run_graph
+        
+        def request(section):
+            async def run(earlier):
+                return await self.backend.complete(
+                    self._section_messages(voice.system_prompt, context, section, earlier))
+            return run
+        
+        def fall_back(section):
+            return lambda earlier: self._template_sections(voice, context)[section]
         
-        if voice_profile is None:
-            voice_profile = self.vp_voice_profile
+        def on_fallback(section, error):
+            self.tracer.incr('email_section_fallbacks')
         
-        # Email template structure based on VP characteristics
-        email_template = {
-            "subject": "Welcome to the Future of AI-Powered Executive Operations",
-            "opening": self._generate_opening(context, voice_profile),
-            "vision": self._generate_vision_section(context, voice_profile),
-            "execution": self._generate_execution_section(context, voice_profile),
-            "metrics": self._generate_metrics_section(context, voice_profile),
-            "closing": self._generate_closing(voice_profile)
+        tasks = {
+            section: Task(request(section), EMAIL_SECTION_DEPENDENCIES.get(section, ()),
+                          fall_back(section) if self.fallback else None)
+            for section in EMAIL_SECTION_PROMPTS
         }
+        return await run_graph(tasks, self.section_timeout, on_fallback)
+    
+    def _section_messages(self, system_prompt: str, context: str, section: str,
+                          earlier: Optional[Dict[str, str]] = None) -> List[Dict[str, str]]:
+        """Build the chat messages asking the backend for one email section.
         
-        return self._assemble_email(email_template)
+        ``system_prompt`` is the voice's complete system prompt
+        (``CompiledVoice.system_prompt``); ``earlier`` maps the sections this
+        one builds on to their text. The job-specific parts go last so that
+        the voice and section instructions form a prefix shared by every job.
+        """
+        content = (f"Section: {section}\n{EMAIL_SECTION_PROMPTS[section]}\n\n"
+                   f"Job summary:\n{context}")
+        for name, text in (earlier or {}).items():
+            content += f"\n\nThe {name} section reads:\n{text}"
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": content},
+        ]
     
     def _generate_opening(self, context: str, voice_profile: VoiceProfile) -> str:
         """Generate email opening paragraph."""
@@ -245,80 +691,208 @@ class EmailGenerator:
     
     def _assemble_email(self, template: Dict[str, str]) -> str:
         """Assemble the complete email from template sections."""
-        return f"""Subject: {template['subject']}
-
-Dear Team,
-
-{template['opening']}
-
-{template['vision']}
+        return self._open_template.render({"sender_title": self.vp_voice_profile.name, **template})
 
-{template['execution']}
 
-{template['metrics']}
-
-{template['closing']}
-
-Best regards,
-[VP Name]
-VP of Edge AI
-
-P.S. If you're reading this and thinking "this sounds impossible," you're exactly the kind of person we need. The impossible is just another word for "not automated yet."
-"""
+class AgentSession:
+    """Per-caller state for multi-step use of a shared :class:`GenAIAgent`.
+    
+    The agent itself keeps no request data, so one instance can serve many
+    threads or asyncio tasks. Callers that want ``generate_vp_intro_email``
+    to pick up their last analysis create a session and pass it along.
+    """
+    
+    def __init__(self):
+        self.data: Dict[str, Any] = {}
+    
+    @property
+    def job_analysis(self) -> Optional[Dict[str, Any]]:
+        return self.data.get('job_analysis')
 
 
 class GenAIAgent:
-    """Main agent orchestrator for job analysis and email generation."""
+    """Main agent orchestrator for job analysis and email generation.
     
-    def __init__(self):
-        self.summarizer = JobDescriptionSummarizer()
-        self.email_generator = EmailGenerator()
+    ``analyze_job_description`` and ``run_complete_workflow`` are stateless
+    and safe to call concurrently on a shared instance. Continuity between
+    calls lives in an :class:`AgentSession`; methods called without one fall
+    back to ``session_data``, the agent's default session, which should only
+    be relied on from a single thread.
+    """
+    
+    def __init__(self, cache=None, email_backend=None, tracer=None, voice_profiles=None,
+                 summary_backend=None, section_timeout: Optional[float] = None,
+                 fallback: bool = False):
+        """Create the agent.
+        
+        ``cache`` is an optional result cache (see ``cache.ResultCache``);
+        when given, complete workflow results are looked up by content and
+        only recomputed on a miss. ``email_backend`` is passed on to the
+        :class:`EmailGenerator`, as is ``voice_profiles`` (a
+        ``voice_profiles.VoiceProfileRegistry``; the built-in VP voice only
+        by default), ``section_timeout`` and ``fallback``. ``summary_backend`` has summaries written by a model
+        (see :class:`JobDescriptionSummarizer`); wrap either backend in a
+        ``completion_cache.CachedBackend`` to reuse completions.
+        ``tracer`` (see ``instrumentation.Tracer``) records per-stage
+        timings; by default nothing is recorded.
+        """
+        self.tracer = tracer or NULL_TRACER
+        self.summarizer = JobDescriptionSummarizer(tracer=self.tracer, backend=summary_backend)
+        self.email_generator = EmailGenerator(backend=email_backend, tracer=self.tracer,
+                                              voice_profiles=voice_profiles,
+                                              section_timeout=section_timeout, fallback=fallback)
+        self.cache = cache
         self.session_data = {}
     
-    def process_job_description(self, job_text: str) -> Dict[str, Any]:
-        """Process a job description and return analysis results."""
+    def signature(self) -> str:
+        """Identify the backends and template shaping the results (for cache keys)."""
+        signature = self.email_generator.signature()
+        summary = self.summarizer.signature()
+        return f"{signature}:summary={summary}" if summary else signature
+    
+    def new_session(self) -> AgentSession:
+        """Create a session for a caller that needs continuity between calls."""
+        return AgentSession()
+    
+    def _session_data(self, session: Optional[AgentSession]) -> Dict[str, Any]:
+        return session.data if session is not None else self.session_data
+    
+    def analyze_job_description(self, job_text: str,
+                                timestamp: Optional[str] = None) -> Dict[str, Any]:
+        """Analyze a job description without touching any session state.
         
-        # Generate summary
-        summary = self.summarizer.generate_summary(job_text)
+        The clock is read once; pass ``timestamp`` to use a run's own.
+        """
         
-        # Extract structured information
-        extracted_info = self.summarizer.extract_key_information(job_text)
+        with self.tracer.span('analyze', input_size=len(job_text)):
+            timestamp = timestamp or datetime.now().isoformat()
+            # Extract structured information
+            extracted_info = self.summarizer.extract_key_information(job_text, timestamp)
+        
+            # Generate summary from the same extraction
+            summary = self.summarizer.generate_summary(job_text, extracted_info)
+        
+            return {
+                'original_text': job_text,
+                'summary': summary,
+                'extracted_info': extracted_info,
+                'processed_at': timestamp
+            }
+    
+    def analyze(self, job_text: str, keep_text: bool = False) -> JobAnalysis:
+        """Compact, immutable form of :meth:`analyze_job_description`.
+        
+        The posting text is kept in ``original_text`` only if ``keep_text``
+        is set; use this when holding many analyses in memory (see
+        ``results``).
+        """
+        return JobAnalysis.from_dict(self.analyze_job_description(job_text), keep_text)
+    
+    def process_job_description(self, job_text: str,
+                                session: Optional[AgentSession] = None,
+                                compact: bool = False) -> Union[Dict[str, Any], JobAnalysis]:
+        """Process a job description and return analysis results.
+        
+        The analysis is also stored in ``session`` (or the default session)
+        so that :meth:`generate_vp_intro_email` can use it. With ``compact``
+        a :class:`JobAnalysis` without the posting text is returned and
+        stored instead of the dict.
+        """
+        
+        if compact:
+            job_analysis = self.analyze(job_text)
+        else:
+            job_analysis = self.analyze_job_description(job_text)
         
         # Store in session for email generation
-        self.session_data['job_analysis'] = {
-            'original_text': job_text,
-            'summary': summary,
-            'extracted_info': extracted_info,
-            'processed_at': datetime.now().isoformat()
-        }
+        self._session_data(session)['job_analysis'] = job_analysis
+        
+        return job_analysis
+    
+    def revise_job_description(self, job_text: str,
+                               session: Optional[AgentSession] = None) -> Dict[str, Any]:
+        """Update the session's analysis for an edited revision of its posting.
+        
+        Only sections that changed since the previous revision are
+        re-extracted; the summary and email are regenerated only if their
+        inputs changed (see ``incremental``). Returns the results of
+        :meth:`run_complete_workflow` plus a ``changes`` report. The first
+        revision in a session is analyzed in full.
+        """
+        from incremental import reanalyze
         
-        return self.session_data['job_analysis']
+        return reanalyze(self, job_text, self._session_data(session))
     
-    def generate_vp_intro_email(self, job_context: Optional[str] = None) -> str:
-        """Generate VP introduction email based on job context."""
+    def generate_vp_intro_email(self, job_context: Optional[str] = None,
+                                session: Optional[AgentSession] = None,
+                                voice_profile: Union[VoiceProfile, str, None] = None) -> str:
+        """Generate VP introduction email based on job context.
         
-        if job_context is None and 'job_analysis' in self.session_data:
-            job_context = self.session_data['job_analysis']['summary']
+        ``voice_profile`` selects another voice, by profile or registered name.
+        """
+        
+        session_data = self._session_data(session)
+        if job_context is None and 'job_analysis' in session_data:
+            job_context = session_data['job_analysis']['summary']
         elif job_context is None:
             job_context = "GenAI and automation initiative"
         
-        return self.email_generator.generate_intro_email(job_context)
+        return self.email_generator.generate_intro_email(job_context, voice_profile)
     
-    def run_complete_workflow(self, job_text: str) -> Dict[str, Any]:
-        """Run the complete workflow: analyze job + generate email."""
+    def run_complete_workflow(self, job_text: str,
+                              session: Optional[AgentSession] = None) -> Dict[str, Any]:
+        """Run the complete workflow: analyze job + generate email.
         
-        # Process job description
-        job_analysis = self.process_job_description(job_text)
+        Stateless unless a ``session`` is given, in which case the analysis
+        is recorded there as :meth:`process_job_description` would.
+        """
         
-        # Generate intro email
-        intro_email = self.generate_vp_intro_email()
+        self.tracer.incr('workflows')
+        with self.tracer.span('workflow', input_size=len(job_text)):
+            # One timestamp for every field of this run
+            now = datetime.now().isoformat()
+            cache_key = None
+            if self.cache is not None:
+                cache_key = self.cache.key_for(job_text, self.email_generator.vp_voice_profile,
+                                               self.signature())
+                with self.tracer.span('cache.get'):
+                    cached = self.cache.get(cache_key)
+                if cached is not None:
+                    self.tracer.incr('cache_hits')
+                    if session is not None:
+                        session.data['job_analysis'] = {
+                            'original_text': job_text,
+                            'summary': cached['job_summary'],
+                            'extracted_info': cached['extracted_data'],
+                            'processed_at': now
+                        }
+                    # The run completes now; extracted_at keeps when the
+                    # cached analysis was actually made.
+                    cached['workflow_completed_at'] = now
+                    return cached
+                self.tracer.incr('cache_misses')
         
-        return {
-            'job_summary': job_analysis['summary'],
-            'intro_email': intro_email,
-            'extracted_data': job_analysis['extracted_info'],
-            'workflow_completed_at': datetime.now().isoformat()
-        }
+            # Process job description
+            job_analysis = self.analyze_job_description(job_text, now)
+            if session is not None:
+                session.data['job_analysis'] = job_analysis
+        
+            # Generate intro email
+            intro_email = self.email_generator.generate_intro_email(
+                job_analysis['summary'], extracted_info=job_analysis['extracted_info'])
+        
+            results = {
+                'job_summary': job_analysis['summary'],
+                'intro_email': intro_email,
+                'extracted_data': job_analysis['extracted_info'],
+                'workflow_completed_at': now
+            }
+        
+            if cache_key is not None:
+                with self.tracer.span('cache.put'):
+                    self.cache.put(cache_key, results)
+        
+            return results
 
 
 # Example usage and testing
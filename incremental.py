@@ -0,0 +1,240 @@
+"""
+Incremental re-analysis of edited job postings
+
+Hiring managers revise a posting many times a day, usually in one section.
+Rather than extracting everything again, a new revision is split at its
+section headings and compared with the previous revision, section by
+section:
+
+- Timeline and metric matches are cached per section text, so only new or
+  edited sections are scanned. If a match runs on from one section into the
+  next it cannot be attributed to either, and the whole posting is
+  re-extracted instead.
+- Requirement bullets are re-read only when their section changed.
+- The summary is rebuilt only if a field it is built from changed, and the
+  email only if the summary or the extracted information changed.
+
+The session's ``job_analysis`` is patched in place, and the results equal
+those of a full ``run_complete_workflow`` on the new text, plus a
+``changes`` report::
+
+    {"sections": {"added": [], "removed": [], "modified": ["Must-Haves"]},
+     "fields": ["must_haves"], "summary_changed": true,
+     "email_regenerated": true, "sections_scanned": 1, "full_reanalysis": false}
+
+Usage:
+    session = agent.new_session()
+    agent.revise_job_description(first_draft, session)
+    results = agent.revise_job_description(edited_draft, session)
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from genai_agent import (
+    BULLET_SECTIONS, METRICS_PATTERN, OVERVIEW_MARKER, TIMELINE_PATTERN, SectionIndex,
+    metric_entry, timeline_entry
+)
+
+
+# Name reported for the text before the first heading
+PREAMBLE = "(preamble)"
+
+EXTRACTED_FIELDS = ("timeline", "metrics", "must_haves", "nice_to_haves")
+# The extracted_info fields generate_summary reads
+SUMMARY_FIELDS = ("timeline", "must_haves", "metrics")
+
+# (section text, is last section) -> (timeline entries, metric entries)
+Scans = Dict[Tuple[str, bool], Tuple[List[str], List[str]]]
+
+
+class RevisionState:
+    """What is kept of one revision to diff the next one against."""
+
+    __slots__ = ('text', 'sections', 'scans', 'bullets')
+
+    def __init__(self, text: str, sections: Dict[str, str], scans: Scans,
+                 bullets: Dict[str, Tuple[str, List[str]]]):
+        self.text = text
+        # Section name -> section text, in text order
+        self.sections = sections
+        self.scans = scans
+        # Bullet field -> (text of its section, bullets)
+        self.bullets = bullets
+
+
+def split_sections(text: str, index: Optional[SectionIndex] = None
+                   ) -> List[Tuple[str, int, int]]:
+    """Split ``text`` at every heading line into uniquely named ``(name, start, end)``.
+
+    A heading that appears again is named ``"Mission (2)"`` and so on.
+    """
+    index = index or SectionIndex(text)
+    seen: Dict[str, int] = {}
+    sections = []
+    for name, start, end in index.segments():
+        name = name or PREAMBLE
+        seen[name] = seen.get(name, 0) + 1
+        sections.append((name if seen[name] == 1 else f"{name} ({seen[name]})", start, end))
+    return sections
+
+
+def diff_sections(old: Dict[str, str], new: Dict[str, str]) -> Dict[str, List[str]]:
+    """Names of the sections added, removed and modified between two revisions."""
+    return {
+        'added': [name for name in new if name not in old],
+        'removed': [name for name in old if name not in new],
+        'modified': [name for name, text in new.items() if name in old and old[name] != text],
+    }
+
+
+def _scan(text: str, start: int, end: int, limit: int
+          ) -> Optional[Tuple[List[str], List[str]]]:
+    """Timeline and metric entries of the section ``[start, end)``.
+
+    Matching may read up to ``limit`` (the end of the next section) so a
+    match running past ``end`` is noticed; None is returned in that case.
+    """
+    found = []
+    for pattern, entry in ((TIMELINE_PATTERN, timeline_entry), (METRICS_PATTERN, metric_entry)):
+        entries = []
+        for match in pattern.finditer(text, start, limit):
+            if match.start() >= end:
+                break
+            if match.end() > end:
+                return None
+            entries.append(entry(*match.groups()))
+        found.append(entries)
+    return found[0], found[1]
+
+
+def extract_revision(text: str, previous: Optional[RevisionState] = None
+                     ) -> Tuple[Optional[Dict[str, List[str]]], RevisionState, int]:
+    """Extract the fields of ``text``, rescanning only sections not seen in ``previous``.
+
+    Returns the extracted fields (None if a match crossed a section
+    boundary and the caller must extract from the whole text), the state to
+    keep for the next revision and the number of sections scanned.
+    """
+    index = SectionIndex(text)
+    sections = split_sections(text, index)
+    old_scans: Scans = previous.scans if previous is not None else {}
+
+    scans: Scans = {}
+    scanned = 0
+    crossed = False
+    timeline: List[str] = []
+    metrics: List[str] = []
+    for i, (_, start, end) in enumerate(sections):
+        last = i + 1 == len(sections)
+        key = (text[start:end], last)
+        result = old_scans.get(key) or scans.get(key)
+        if result is None:
+            scanned += 1
+            result = _scan(text, start, end, len(text) if last else sections[i + 1][2])
+            if result is None:
+                crossed, scans = True, {}
+                break
+        scans[key] = result
+        timeline.extend(result[0])
+        metrics.extend(result[1])
+
+    fields: Optional[Dict[str, List[str]]] = (
+        None if crossed else {'timeline': timeline, 'metrics': metrics}
+    )
+
+    bullets = {}
+    for field, (name, end_marker) in BULLET_SECTIONS.items():
+        section_text = index.section(name, end_marker)
+        if previous is not None and previous.bullets[field][0] == section_text:
+            bullets[field] = previous.bullets[field]
+        else:
+            bullets[field] = (section_text, index.bullets(name, end_marker))
+        if fields is not None:
+            fields[field] = bullets[field][1]
+
+    state = RevisionState(text, {name: text[start:end] for name, start, end in sections},
+                          scans, bullets)
+    return fields, state, scanned
+
+
+def reanalyze(agent, job_text: str, session_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Bring the analysis in ``session_data`` up to date with ``job_text``.
+
+    Backs :meth:`genai_agent.GenAIAgent.revise_job_description`; returns
+    the workflow results with a ``changes`` report.
+    """
+    with agent.tracer.span('reanalyze', input_size=len(job_text)):
+        analysis = session_data.get('job_analysis')
+        if analysis is not None and not isinstance(analysis, dict):
+            # A compact analysis can't be patched and has no text to diff against
+            analysis = None
+        previous: Optional[RevisionState] = session_data.get('revision')
+        if previous is not None and (analysis is None or analysis['original_text'] != previous.text):
+            # The session was analyzed some other way since; its scans don't apply
+            previous = None
+
+        with agent.tracer.span('extract', input_size=len(job_text), incremental=True):
+            fields, state, scanned = extract_revision(job_text, previous)
+        full = fields is None
+        if full:
+            fields = agent.summarizer.extract_key_information(job_text)
+            scanned = len(state.sections)
+
+        if previous is not None:
+            old_sections = previous.sections
+        elif analysis is not None:
+            old_sections = {name: analysis['original_text'][start:end]
+                            for name, start, end in split_sections(analysis['original_text'])}
+        else:
+            old_sections = {}
+
+        now = datetime.now().isoformat()
+        if analysis is None:
+            analysis = session_data['job_analysis'] = {
+                'original_text': job_text, 'summary': None, 'extracted_info': {},
+            }
+        extracted_info = analysis['extracted_info']
+        had_overview = OVERVIEW_MARKER in analysis['original_text']
+
+        changed_fields = [field for field in EXTRACTED_FIELDS
+                          if field not in extracted_info or extracted_info[field] != fields[field]]
+        for field in changed_fields:
+            extracted_info[field] = fields[field]
+        if changed_fields or 'extracted_at' not in extracted_info:
+            extracted_info['extracted_at'] = now
+
+        summary_changed = False
+        # An LLM-written summary reads the whole posting, not just these fields
+        llm_summary = agent.summarizer.backend is not None
+        if (analysis['summary'] is None or had_overview != (OVERVIEW_MARKER in job_text)
+                or any(field in SUMMARY_FIELDS for field in changed_fields)
+                or (llm_summary and job_text != analysis['original_text'])):
+            summary = agent.summarizer.generate_summary(job_text, extracted_info)
+            summary_changed = summary != analysis['summary']
+            analysis['summary'] = summary
+
+        email_regenerated = (previous is None or summary_changed or bool(changed_fields)
+                             or 'intro_email' not in session_data)
+        if email_regenerated:
+            session_data['intro_email'] = agent.email_generator.generate_intro_email(
+                analysis['summary'], extracted_info=extracted_info)
+
+        analysis['original_text'] = job_text
+        analysis['processed_at'] = now
+        session_data['revision'] = state
+
+        return {
+            'job_summary': analysis['summary'],
+            'intro_email': session_data['intro_email'],
+            'extracted_data': extracted_info,
+            'workflow_completed_at': now,
+            'changes': {
+                'sections': diff_sections(old_sections, state.sections),
+                'fields': changed_fields,
+                'summary_changed': summary_changed,
+                'email_regenerated': email_regenerated,
+                'sections_scanned': scanned,
+                'full_reanalysis': full,
+            },
+        }
@@ -0,0 +1,252 @@
+"""
+Per-stage timing and tracing for the GenAI Agent
+
+Components take an optional tracer and wrap each stage in
+``with tracer.span("stage", input_size=...)``. Two tracers exist:
+
+- NULL_TRACER: The default. ``span`` returns a shared no-op context manager
+  and ``incr`` does nothing, so uninstrumented runs pay one method call.
+- Tracer: Records every span (duration, input size, parent stage) and
+  counter, keeps per-stage aggregates and a bounded window of recent
+  spans, and exports them as JSON or Prometheus text.
+
+Usage:
+    tracer = Tracer()
+    agent = GenAIAgent(tracer=tracer)
+    agent.run_complete_workflow(job_text)
+    tracer.export_json("trace.json")
+    tracer.export_prometheus("metrics.prom")
+"""
+
+import contextvars
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+
+# Stage of the innermost open span in the current thread / task.
+_current_stage: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    'genai_current_stage', default=None
+)
+
+# Per-stage durations kept for percentile estimates.
+RESERVOIR_SIZE = 1024
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+class _NullSpan:
+    """No-op context manager shared by every disabled span."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class NullTracer:
+    """Tracer that records nothing."""
+
+    enabled = False
+
+    def span(self, name: str, **attrs) -> _NullSpan:
+        return _NULL_SPAN
+
+    def incr(self, name: str, value: float = 1):
+        pass
+
+
+NULL_TRACER = NullTracer()
+
+
+class _Span:
+    """A timed stage, reported to its tracer on exit."""
+
+    __slots__ = ('tracer', 'name', 'attrs', 'parent', 'started_at', '_start', '_token')
+
+    def __init__(self, tracer: "Tracer", name: str, attrs: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        self.parent = _current_stage.get()
+        self._token = _current_stage.set(self.name)
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self._start
+        _current_stage.reset(self._token)
+        if exc_type is not None:
+            self.attrs['error'] = exc_type.__name__
+        self.tracer._record(self, duration)
+        return False
+
+    def set(self, **attrs):
+        """Attach attributes discovered while the span is open."""
+        self.attrs.update(attrs)
+
+
+class _StageStats:
+    __slots__ = ('count', 'errors', 'total', 'min', 'max', 'input_size', 'recent')
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+        self.input_size = 0
+        self.recent: Deque[float] = deque(maxlen=RESERVOIR_SIZE)
+
+    def quantile(self, q: float) -> float:
+        ordered = sorted(self.recent)
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'total_seconds': self.total,
+            'mean_seconds': self.total / self.count if self.count else 0.0,
+            'min_seconds': self.min if self.count else 0.0,
+            'max_seconds': self.max,
+            'input_size_total': self.input_size,
+            **{f"p{int(q * 100)}_seconds": self.quantile(q) for q in QUANTILES},
+        }
+
+
+class Tracer:
+    """Thread-safe span and counter recorder."""
+
+    enabled = True
+
+    def __init__(self, max_spans: int = 10000):
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+        self.stages: Dict[str, _StageStats] = {}
+        self.counters: Dict[str, float] = {}
+        self.spans: Deque[Dict[str, Any]] = deque(maxlen=max_spans)
+
+    def span(self, name: str, **attrs) -> _Span:
+        """Time the enclosed block as stage ``name``.
+
+        Pass ``input_size`` (characters or items processed) to have it
+        aggregated per stage; any other attributes are kept on the span.
+        """
+        return _Span(self, name, attrs)
+
+    def incr(self, name: str, value: float = 1):
+        """Add ``value`` to counter ``name``."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def _record(self, span: _Span, duration: float):
+        with self._lock:
+            stats = self.stages.get(span.name)
+            if stats is None:
+                stats = self.stages[span.name] = _StageStats()
+            stats.count += 1
+            stats.total += duration
+            stats.min = min(stats.min, duration)
+            stats.max = max(stats.max, duration)
+            stats.input_size += span.attrs.get('input_size', 0)
+            stats.recent.append(duration)
+            if 'error' in span.attrs:
+                stats.errors += 1
+
+            self.spans.append({
+                'stage': span.name,
+                'parent': span.parent,
+                'started_at': span.started_at,
+                'duration_seconds': duration,
+                **span.attrs,
+            })
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return aggregates, counters and recent spans as plain data."""
+        with self._lock:
+            return {
+                'started_at': self.started_at,
+                'exported_at': time.time(),
+                'stages': {name: stats.to_dict() for name, stats in self.stages.items()},
+                'counters': dict(self.counters),
+                'spans': list(self.spans),
+            }
+
+    def to_prometheus(self, prefix: str = 'genai') -> str:
+        """Render stage aggregates and counters in Prometheus text format."""
+        snapshot = self.snapshot()
+        lines = [
+            f"# HELP {prefix}_stage_duration_seconds Time spent per pipeline stage.",
+            f"# TYPE {prefix}_stage_duration_seconds summary",
+        ]
+        for name, stats in sorted(snapshot['stages'].items()):
+            for q in QUANTILES:
+                lines.append(f'{prefix}_stage_duration_seconds{{stage="{name}",quantile="{q}"}} '
+                             f'{stats[f"p{int(q * 100)}_seconds"]:.9f}')
+            lines.append(f'{prefix}_stage_duration_seconds_sum{{stage="{name}"}} '
+                         f'{stats["total_seconds"]:.9f}')
+            lines.append(f'{prefix}_stage_duration_seconds_count{{stage="{name}"}} {stats["count"]}')
+
+        lines += [
+            f"# HELP {prefix}_stage_errors_total Stage runs that raised.",
+            f"# TYPE {prefix}_stage_errors_total counter",
+        ]
+        for name, stats in sorted(snapshot['stages'].items()):
+            lines.append(f'{prefix}_stage_errors_total{{stage="{name}"}} {stats["errors"]}')
+
+        lines += [
+            f"# HELP {prefix}_stage_input_size_total Input size processed per stage.",
+            f"# TYPE {prefix}_stage_input_size_total counter",
+        ]
+        for name, stats in sorted(snapshot['stages'].items()):
+            lines.append(f'{prefix}_stage_input_size_total{{stage="{name}"}} '
+                         f'{stats["input_size_total"]}')
+
+        for name, value in sorted(snapshot['counters'].items()):
+            metric = f"{prefix}_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value:g}")
+
+        return "\n".join(lines) + "\n"
+
+    def export_json(self, path: str):
+        """Write :meth:`snapshot` to ``path``."""
+        import json
+        _atomic_write(path, json.dumps(self.snapshot(), indent=2))
+
+    def export_prometheus(self, path: str):
+        """Write :meth:`to_prometheus` to ``path`` (textfile-collector friendly)."""
+        _atomic_write(path, self.to_prometheus())
+
+
+def _atomic_write(path: str, text: str):
+    """Replace ``path`` in one step so scrapers never read a partial file."""
+    # Imported here: exporting is rare and tempfile is slow to import
+    import tempfile
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
@@ -0,0 +1,467 @@
+"""
+Priority job queue with per-tenant rate limits for agent workloads
+
+Interactive requests and bulk reprocessing share one pool of workers. A
+job is one posting or a list of them. Workers take one posting at a time
+from the most urgent job they may run, so a new interactive job waits
+for at most one posting of a bulk job, never for the whole batch.
+
+- Priority: lower numbers first (``INTERACTIVE`` = 0, ``BULK`` = 10),
+  then first come, first served.
+- Reserved capacity: jobs at ``BULK`` priority or below never occupy the
+  last ``reserve`` workers, which stay free for more urgent work. Bulk
+  jobs therefore only use leftover capacity.
+- Rate limits: each tenant has a token bucket. Each posting takes one
+  token; a tenant out of tokens is skipped, and other tenants' jobs run
+  in the meantime.
+- Cancellation: ``cancel`` stops a job after the postings already being
+  processed. ``resume`` queues it again from where it stopped.
+- Durable mode: with a ``path``, jobs, postings and results are kept in
+  SQLite. A queue reopened on the same file resumes unfinished jobs,
+  skipping postings whose results were already stored.
+- Retention: ``forget`` (or ``result(..., forget=True)``) drops a
+  finished job and its stored results; with ``retention`` finished jobs
+  are dropped automatically that many seconds after they finish.
+
+A failed posting does not fail its job; its result is an
+``{"error": ...}`` record, as in streaming output.
+
+Usage:
+    jobs = JobQueue(GenAIAgent(), workers=4, rates={'nightly': (5.0, 20)})
+    job_id = jobs.submit(job_text)                            # interactive
+    bulk_id = jobs.submit(texts, tenant='nightly', priority=BULK)
+    results = jobs.result(job_id, timeout=30)
+    jobs.status(bulk_id)    # {'state': 'running', 'done': 120, 'total': 5000, ...}
+    jobs.cancel(bulk_id)
+
+    jobs = JobQueue(GenAIAgent(), path="jobs.sqlite3", retention=7 * 24 * 3600)   # durable
+"""
+
+import bisect
+import itertools
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Union
+
+from serialization import dumps_str, loads
+
+
+INTERACTIVE = 0
+BULK = 10
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+CANCELLED = 'cancelled'
+
+# Bump when the tables change; older databases are rebuilt empty.
+QUEUE_SCHEMA = 2
+
+_SCHEMA = [
+    "CREATE TABLE jobs ("
+    " id TEXT PRIMARY KEY,"
+    " tenant TEXT NOT NULL,"
+    " priority INTEGER NOT NULL,"
+    " seq INTEGER NOT NULL,"
+    " single INTEGER NOT NULL,"
+    " state TEXT NOT NULL,"
+    " submitted_at REAL NOT NULL,"
+    " finished_at REAL)",
+    "CREATE TABLE items ("
+    " job_id TEXT NOT NULL,"
+    " idx INTEGER NOT NULL,"
+    " job_text TEXT NOT NULL,"
+    " result TEXT,"
+    " PRIMARY KEY (job_id, idx))",
+]
+
+
+class JobCancelled(Exception):
+    """Raised by :meth:`JobQueue.result` for a cancelled job."""
+
+
+class TokenBucket:
+    """Allow ``rate`` events per second, in bursts of up to ``capacity``."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self.clock = clock
+        self.tokens = self.capacity
+        self.updated = clock()
+
+    def take(self) -> float:
+        """Take a token if one is available and return 0, else the seconds until one is."""
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class _Job:
+    """A queued job and its progress."""
+
+    __slots__ = ('id', 'tenant', 'priority', 'seq', 'single', 'state', 'submitted_at',
+                 'finished_at', 'texts', 'results', 'pending', 'done', 'running', 'finished')
+
+    def __init__(self, job_id: str, tenant: str, priority: int, seq: int, single: bool,
+                 texts: List[str], submitted_at: float, state: str = QUEUED,
+                 results: Optional[List[Any]] = None, finished_at: Optional[float] = None):
+        self.id = job_id
+        self.tenant = tenant
+        self.priority = priority
+        self.seq = seq
+        self.single = single
+        self.state = state
+        self.submitted_at = submitted_at
+        self.finished_at = finished_at
+        self.texts = texts
+        self.results = results if results is not None else [None] * len(texts)
+        # Indexes of postings still to be handed to a worker, in order
+        self.pending: Deque[int] = deque(i for i, result in enumerate(self.results)
+                                         if result is None)
+        self.done = len(self.results) - len(self.pending)
+        self.running = 0
+        self.finished = threading.Event()
+
+    @property
+    def order(self) -> Tuple[int, int, str]:
+        return (self.priority, self.seq, self.id)
+
+
+class JobQueue:
+    """Runs ``agent.run_complete_workflow`` over submitted postings on worker threads."""
+
+    def __init__(self, agent, workers: int = 2, reserve: int = 1,
+                 rates: Optional[Dict[str, Tuple[float, float]]] = None,
+                 default_rate: Optional[Tuple[float, float]] = None,
+                 path: Optional[str] = None, retention: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """Start ``workers`` threads running jobs on ``agent``.
+
+        ``rates`` maps tenants to ``(postings per second, burst)``; tenants
+        not listed get ``default_rate``, or no limit if it is None.
+        ``reserve`` workers are kept for jobs more urgent than ``BULK``
+        (capped so at least one worker can run bulk jobs). With ``path``
+        the queue is durable and resumes the jobs stored there.
+        ``retention`` drops finished jobs, and their stored results, that
+        many seconds after they finish; see also :meth:`forget`.
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.agent = agent
+        self.workers = workers
+        self.bulk_slots = max(1, workers - reserve)
+        self.rates = dict(rates or {})
+        self.default_rate = default_rate
+        self.clock = clock
+        self.path = Path(os.path.expanduser(path)) if path else None
+        self.retention = retention
+
+        self._jobs: Dict[str, _Job] = {}
+        # (finished_at, job id) of DONE jobs, oldest first, for ``retention``
+        self._finished: Deque[Tuple[float, str]] = deque()
+        self._queued: List[Tuple[int, int, str]] = []
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._bulk_running = 0
+        self._closed = False
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._conn: Optional[sqlite3.Connection] = None
+        if self.path is not None:
+            self._open()
+
+        self._threads = [threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+                         for i in range(workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def _open(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with conn:
+            if conn.execute("PRAGMA user_version").fetchone()[0] != QUEUE_SCHEMA:
+                for table in ('jobs', 'items'):
+                    conn.execute(f"DROP TABLE IF EXISTS {table}")
+                for statement in _SCHEMA:
+                    conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {QUEUE_SCHEMA}")
+        self._conn = conn
+
+        rows = conn.execute("SELECT id, tenant, priority, seq, single, state, submitted_at,"
+                            " finished_at FROM jobs ORDER BY seq").fetchall()
+        last_seq = -1
+        for job_id, tenant, priority, seq, single, state, submitted_at, finished_at in rows:
+            last_seq = max(last_seq, seq)
+            if (state == DONE and self.retention is not None
+                    and finished_at + self.retention <= time.time()):
+                self._delete(job_id)
+                continue
+            items = conn.execute("SELECT job_text, result FROM items WHERE job_id = ? ORDER BY idx",
+                                 (job_id,)).fetchall()
+            results = [loads(result) if result is not None else None for _, result in items]
+            # Jobs interrupted while running carry on from their stored results
+            job = _Job(job_id, tenant, priority, seq, bool(single), [text for text, _ in items],
+                       submitted_at, QUEUED if state == RUNNING else state, results, finished_at)
+            self._jobs[job_id] = job
+            if job.state == QUEUED:
+                self._enqueue(job)
+            else:
+                job.finished.set()
+                if job.state == DONE:
+                    self._finished.append((finished_at, job_id))
+        self._finished = deque(sorted(self._finished))
+        self._seq = itertools.count(last_seq + 1)
+
+    def _store(self, sql: str, *params):
+        if self._conn is not None:
+            with self._conn:
+                self._conn.execute(sql, params)
+
+    def _enqueue(self, job: _Job):
+        if job.pending:
+            bisect.insort(self._queued, job.order)
+        elif job.running == 0:
+            self._finish(job)
+
+    def _delete(self, job_id: str):
+        if self._conn is not None:
+            with self._conn:
+                self._conn.execute("DELETE FROM items WHERE job_id = ?", (job_id,))
+                self._conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+
+    def _finish(self, job: _Job):
+        job.state = DONE
+        job.finished_at = time.time()
+        self._store("UPDATE jobs SET state = ?, finished_at = ? WHERE id = ?",
+                    DONE, job.finished_at, job.id)
+        job.finished.set()
+        self._finished.append((job.finished_at, job.id))
+        self._expire()
+
+    def _expire(self):
+        """Drop DONE jobs that finished more than ``retention`` seconds ago."""
+        if self.retention is None:
+            return
+        cutoff = time.time() - self.retention
+        while self._finished and self._finished[0][0] <= cutoff:
+            _, job_id = self._finished.popleft()
+            job = self._jobs.get(job_id)
+            if job is not None and job.state == DONE:
+                del self._jobs[job_id]
+                self._delete(job_id)
+
+    def submit(self, job_text: Union[str, List[str]], tenant: str = 'default',
+               priority: int = INTERACTIVE) -> str:
+        """Queue one posting, or a list of them, as a job; return its id."""
+        single = isinstance(job_text, str)
+        texts = [job_text] if single else list(job_text)
+        with self._cond:
+            if self._closed:
+                raise ValueError("JobQueue is closed")
+            job = _Job(uuid.uuid4().hex, tenant, priority, next(self._seq), single, texts,
+                       time.time())
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT INTO jobs (id, tenant, priority, seq, single, state, submitted_at)"
+                        " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (job.id, tenant, priority, job.seq, int(single), QUEUED, job.submitted_at))
+                    self._conn.executemany(
+                        "INSERT INTO items (job_id, idx, job_text) VALUES (?, ?, ?)",
+                        [(job.id, i, text) for i, text in enumerate(texts)])
+            self._jobs[job.id] = job
+            self._enqueue(job)
+            self._cond.notify_all()
+        return job.id
+
+    def _bucket(self, tenant: str) -> Optional[TokenBucket]:
+        bucket = self._buckets.get(tenant)
+        if bucket is None:
+            rate = self.rates.get(tenant, self.default_rate)
+            if rate is None:
+                return None
+            bucket = self._buckets[tenant] = TokenBucket(*rate, clock=self.clock)
+        return bucket
+
+    def _claim(self) -> Tuple[Optional[Tuple[_Job, int]], Optional[float]]:
+        """Pick the next posting to run, or how long to wait before trying again."""
+        wait = None
+        limited = set()
+        for order in self._queued:
+            job = self._jobs[order[2]]
+            if job.priority >= BULK and self._bulk_running >= self.bulk_slots:
+                continue
+            if job.tenant in limited:
+                continue
+            bucket = self._bucket(job.tenant)
+            if bucket is not None:
+                until = bucket.take()
+                if until:
+                    limited.add(job.tenant)
+                    wait = until if wait is None else min(wait, until)
+                    continue
+
+            index = job.pending.popleft()
+            if not job.pending:
+                self._queued.remove(order)
+            if job.state == QUEUED:
+                job.state = RUNNING
+                self._store("UPDATE jobs SET state = ? WHERE id = ?", RUNNING, job.id)
+            job.running += 1
+            if job.priority >= BULK:
+                self._bulk_running += 1
+            return (job, index), None
+        return None, wait
+
+    def _work(self):
+        while True:
+            with self._cond:
+                while True:
+                    if self._closed:
+                        return
+                    claimed, wait = self._claim()
+                    if claimed is not None:
+                        break
+                    self._cond.wait(wait)
+            job, index = claimed
+
+            try:
+                result = self.agent.run_complete_workflow(job.texts[index])
+            except Exception as e:
+                result = {'error': f"{type(e).__name__}: {e}"}
+
+            with self._cond:
+                job.running -= 1
+                if job.priority >= BULK:
+                    self._bulk_running -= 1
+                job.results[index] = result
+                job.done += 1
+                self._store("UPDATE items SET result = ? WHERE job_id = ? AND idx = ?",
+                            dumps_str(result), job.id, index)
+                if job.state in (QUEUED, RUNNING) and not job.pending and job.running == 0:
+                    self._finish(job)
+                self._cond.notify_all()
+
+    def status(self, job_id: str) -> Dict[str, Any]:
+        """State and progress of a job. Raises KeyError for an unknown id."""
+        with self._cond:
+            job = self._jobs[job_id]
+            return {
+                'id': job.id,
+                'state': job.state,
+                'tenant': job.tenant,
+                'priority': job.priority,
+                'done': job.done,
+                'total': len(job.texts),
+                'submitted_at': job.submitted_at,
+            }
+
+    def result(self, job_id: str, timeout: Optional[float] = None,
+               forget: bool = False) -> Union[Dict[str, Any], List[Any]]:
+        """Wait for a job and return its results (one dict for a single posting).
+
+        With ``forget`` the job is dropped once its results are returned.
+        Raises TimeoutError if it is still running after ``timeout``
+        seconds, and JobCancelled if it was cancelled.
+        """
+        with self._cond:
+            job = self._jobs[job_id]
+        if not job.finished.wait(timeout):
+            raise TimeoutError(f"Job {job_id} still {job.state} after {timeout} s")
+        if job.state == CANCELLED:
+            raise JobCancelled(f"Job {job_id} was cancelled after {job.done} of {len(job.texts)}")
+        results = job.results[0] if job.single else list(job.results)
+        if forget:
+            self.forget(job_id)
+        return results
+
+    def forget(self, job_id: str) -> bool:
+        """Drop a finished or cancelled job and its stored results.
+
+        Returns False, keeping the job, if it is still queued or running.
+        Raises KeyError for an unknown id.
+        """
+        with self._cond:
+            job = self._jobs[job_id]
+            if job.state not in (DONE, CANCELLED) or job.running:
+                return False
+            del self._jobs[job_id]
+            self._delete(job_id)
+        return True
+
+    def cancel(self, job_id: str) -> bool:
+        """Stop handing out the job's postings; return whether any were dropped.
+
+        Postings already being processed run to completion and their
+        results are kept for :meth:`resume`. A job with no postings left to
+        hand out is not cancelled: it finishes normally once they are done.
+        """
+        with self._cond:
+            job = self._jobs[job_id]
+            if job.state in (DONE, CANCELLED) or not job.pending:
+                return False
+            if job.order in self._queued:
+                self._queued.remove(job.order)
+            job.state = CANCELLED
+            self._store("UPDATE jobs SET state = ? WHERE id = ?", CANCELLED, job.id)
+            job.finished.set()
+            self._cond.notify_all()
+        return True
+
+    def resume(self, job_id: str) -> bool:
+        """Queue a cancelled job again for its unfinished postings; return whether it was cancelled."""
+        with self._cond:
+            job = self._jobs[job_id]
+            if job.state != CANCELLED:
+                return False
+            job.state = QUEUED
+            job.finished.clear()
+            self._store("UPDATE jobs SET state = ? WHERE id = ?", QUEUED, job.id)
+            self._enqueue(job)
+            self._cond.notify_all()
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """Jobs per state and postings waiting to be run."""
+        with self._cond:
+            states: Dict[str, int] = {}
+            for job in self._jobs.values():
+                states[job.state] = states.get(job.state, 0) + 1
+            return {
+                'jobs': states,
+                'queued_postings': sum(len(self._jobs[order[2]].pending) for order in self._queued),
+                'bulk_running': self._bulk_running,
+                'workers': self.workers,
+            }
+
+    def close(self, wait: bool = True):
+        """Stop the workers once their current postings finish; queued jobs stay queued."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,318 @@
+"""
+LLM backends for EmailGenerator
+
+``EmailGenerator`` fills fixed templates by default. Passing a backend lets
+each email section be written by a model instead:
+
+- EmailBackend: Interface every backend implements (``async complete``)
+- ChatCompletionsBackend: asyncio client for an OpenAI-compatible
+  ``/v1/chat/completions`` endpoint with pooled keep-alive connections, a
+  concurrency limit and retry with exponential backoff
+
+The client only uses the standard library (asyncio streams), so no HTTP
+package is needed at runtime and tests can run against a local stub server.
+
+Synchronous callers such as ``generate_intro_email`` run their requests
+with ``run_sync`` on one long-lived event loop per process. Connection
+pools belong to a loop, so they are kept, and reused, across calls.
+``close()`` releases a backend's idle connections there.
+
+Usage:
+    backend = ChatCompletionsBackend("http://localhost:8000", model="gpt-4o-mini")
+    generator = EmailGenerator(backend=backend)
+    email = generator.generate_intro_email(summary)
+"""
+
+import asyncio
+import json
+import os
+import random
+import ssl
+import threading
+import weakref
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any, Awaitable, Deque, Dict, List, Optional, Tuple, TypeVar
+from urllib.parse import urlsplit
+
+
+Message = Dict[str, str]
+T = TypeVar('T')
+
+# Status codes worth retrying: rate limiting and transient server errors.
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+class LLMBackendError(Exception):
+    """Raised when a backend cannot produce a completion."""
+
+
+class EmailBackend(ABC):
+    """Interface for services that write email sections."""
+
+    @abstractmethod
+    async def complete(self, messages: List[Message]) -> str:
+        """Return the model's reply to a list of chat messages."""
+
+    def signature(self) -> str:
+        """Describe everything that changes the output (used in cache keys)."""
+        return type(self).__name__
+
+    async def aclose(self):
+        """Release any held connections."""
+
+    def close(self):
+        """Release the connections held on the shared loop used by ``run_sync``."""
+        if _loop is not None and _loop_pid == os.getpid():
+            run_sync(self.aclose())
+
+
+# The loop behind run_sync, the thread running it and the process it was
+# started in (a forked child starts its own).
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_thread: Optional[threading.Thread] = None
+_loop_pid: Optional[int] = None
+_loop_lock = threading.Lock()
+
+
+def _shared_loop() -> asyncio.AbstractEventLoop:
+    global _loop, _loop_thread, _loop_pid
+    with _loop_lock:
+        if _loop is None or _loop_pid != os.getpid():
+            _loop = asyncio.new_event_loop()
+            _loop_thread = threading.Thread(target=_loop.run_forever, name="llm-backend-loop",
+                                            daemon=True)
+            _loop_thread.start()
+            _loop_pid = os.getpid()
+        return _loop
+
+
+def run_sync(coroutine: Awaitable[T]) -> T:
+    """Run ``coroutine`` on the shared backend loop and wait for its result.
+
+    Safe from any thread, including one whose own event loop is running
+    (that loop is blocked until the result is ready). Raises RuntimeError
+    when called from a coroutine on the shared loop itself; await there.
+    """
+    loop = _shared_loop()
+    if threading.current_thread() is _loop_thread:
+        coroutine.close()
+        raise RuntimeError("run_sync() called from the backend loop; await the coroutine instead")
+    return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
+
+
+class _Response:
+    """Minimal HTTP response."""
+
+    def __init__(self, status: int, headers: Dict[str, str], body: bytes):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+
+class _ConnectionPool:
+    """Keep-alive HTTP/1.1 connections to a single host, bounded in size."""
+
+    def __init__(self, host: str, port: int, use_ssl: bool, max_size: int):
+        self.host = host
+        self.port = port
+        self.ssl_context = ssl.create_default_context() if use_ssl else None
+        self.max_size = max_size
+        self.opened = 0
+        self._idle: Deque[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = deque()
+        self._slots = asyncio.Semaphore(max_size)
+
+    async def _connect(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        while self._idle:
+            reader, writer = self._idle.popleft()
+            if not reader.at_eof() and not writer.is_closing():
+                return reader, writer
+            writer.close()
+
+        self.opened += 1
+        return await asyncio.open_connection(
+            self.host, self.port, ssl=self.ssl_context,
+            server_hostname=self.host if self.ssl_context else None
+        )
+
+    async def request(self, method: str, path: str, headers: Dict[str, str],
+                      body: bytes, timeout: Optional[float] = None) -> _Response:
+        """Send one request once a slot is free.
+
+        ``timeout`` bounds the connect, write and read, not the time spent
+        waiting for a slot.
+        """
+        async with self._slots:
+            return await asyncio.wait_for(self._exchange(method, path, headers, body), timeout)
+
+    async def _exchange(self, method: str, path: str, headers: Dict[str, str],
+                        body: bytes) -> _Response:
+        reader, writer = await self._connect()
+        try:
+            head = [f"{method} {path} HTTP/1.1", f"Host: {self.host}:{self.port}",
+                    f"Content-Length: {len(body)}"]
+            head.extend(f"{name}: {value}" for name, value in headers.items())
+            writer.write(("\r\n".join(head) + "\r\n\r\n").encode('latin-1') + body)
+            await writer.drain()
+            response = await self._read_response(reader)
+        except BaseException:
+            writer.close()
+            raise
+
+        if response.headers.get('connection', '').lower() == 'close':
+            writer.close()
+        else:
+            self._idle.append((reader, writer))
+        return response
+
+    @staticmethod
+    async def _read_response(reader: asyncio.StreamReader) -> _Response:
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("connection closed before response")
+        status = int(status_line.split()[1])
+
+        headers: Dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b';')[0], 16)
+                if size == 0:
+                    await reader.readline()
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+            body = b"".join(chunks)
+        elif 'content-length' in headers:
+            body = await reader.readexactly(int(headers['content-length']))
+        else:
+            body = await reader.read()
+            headers['connection'] = 'close'
+
+        return _Response(status, headers, body)
+
+    def close(self):
+        while self._idle:
+            _, writer = self._idle.popleft()
+            writer.close()
+
+
+class ChatCompletionsBackend(EmailBackend):
+    """asyncio client for OpenAI-compatible chat-completions endpoints."""
+
+    def __init__(self, base_url: str, model: str, api_key: Optional[str] = None,
+                 max_concurrency: int = 8, temperature: float = 0.7,
+                 max_tokens: int = 400, timeout: float = 30.0,
+                 max_retries: int = 3, backoff: float = 0.5):
+        parts = urlsplit(base_url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise ValueError(f"Unsupported base URL: {base_url!r}")
+
+        self.base_url = base_url
+        self.model = model
+        self.api_key = api_key if api_key is not None else os.environ.get('OPENAI_API_KEY')
+        self.max_concurrency = max_concurrency
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+        self._host = parts.hostname
+        self._use_ssl = parts.scheme == 'https'
+        self._port = parts.port or (443 if self._use_ssl else 80)
+        self._path = parts.path.rstrip('/') + '/v1/chat/completions'
+
+        # asyncio primitives belong to one event loop, so each loop gets its
+        # own pool, dropped with it. Sync callers share run_sync's loop.
+        self._pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _ConnectionPool]" = \
+            weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._opened_by_closed_pools = 0
+        self.requests_sent = 0
+        self.retries = 0
+
+    @property
+    def connections_opened(self) -> int:
+        with self._lock:
+            return self._opened_by_closed_pools + sum(pool.opened for pool in self._pools.values())
+
+    def signature(self) -> str:
+        return (f"{type(self).__name__}:{self.base_url}:{self.model}:"
+                f"t={self.temperature}:max={self.max_tokens}")
+
+    def _get_pool(self) -> _ConnectionPool:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            pool = self._pools.get(loop)
+            if pool is None:
+                pool = _ConnectionPool(self._host, self._port, self._use_ssl,
+                                       self.max_concurrency)
+                self._pools[loop] = pool
+        return pool
+
+    def _payload(self, messages: List[Message]) -> bytes:
+        return json.dumps({
+            'model': self.model,
+            'messages': messages,
+            'temperature': self.temperature,
+            'max_tokens': self.max_tokens,
+        }).encode('utf-8')
+
+    async def complete(self, messages: List[Message]) -> str:
+        pool = self._get_pool()
+        body = self._payload(messages)
+        headers = {'Content-Type': 'application/json', 'Accept': 'application/json'}
+        if self.api_key:
+            headers['Authorization'] = f"Bearer {self.api_key}"
+
+        last_error = "no attempts made"
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                with self._lock:
+                    self.retries += 1
+                delay = self.backoff * (2 ** (attempt - 1))
+                await asyncio.sleep(delay + random.uniform(0, delay / 2))
+
+            with self._lock:
+                self.requests_sent += 1
+            try:
+                response = await pool.request('POST', self._path, headers, body, self.timeout)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as e:
+                last_error = f"{type(e).__name__}: {e}"
+                continue
+
+            if response.status in RETRYABLE_STATUS:
+                last_error = f"HTTP {response.status}"
+                continue
+            if response.status >= 400:
+                raise LLMBackendError(f"HTTP {response.status}: {response.body[:200]!r}")
+
+            return self._parse(response.body)
+
+        raise LLMBackendError(f"giving up after {self.max_retries + 1} attempts ({last_error})")
+
+    @staticmethod
+    def _parse(body: bytes) -> str:
+        try:
+            data: Any = json.loads(body)
+            return data['choices'][0]['message']['content'].strip()
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            raise LLMBackendError(f"Malformed completion response: {e}") from e
+
+    async def aclose(self):
+        """Close the idle connections held for the running loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            pool = self._pools.pop(loop, None)
+            if pool is not None:
+                self._opened_by_closed_pools += pool.opened
+        if pool is not None:
+            pool.close()
@@ -0,0 +1,233 @@
+"""
+Vectorized matching of candidate profiles against posting requirements
+
+Ranks many candidates against the ``must_haves`` and ``nice_to_haves`` of
+many postings, as found in ``extracted_data``. Requirements and candidate
+texts are embedded as hashed TF-IDF vectors: word unigrams and bigrams
+are hashed into ``dim`` buckets, so there is no vocabulary to build or
+store. Term frequencies are damped with log(1 + tf), weighted by inverse
+document frequency and L2-normalized.
+
+A posting's score is the weighted mean cosine similarity of the
+candidate to each of its requirement lines. Must-haves weigh
+``must_weight`` and nice-to-haves ``nice_weight``, and the weights of a
+posting sum to 1. That mean is linear in the requirement vectors, so
+each posting is stored as one profile: the weighted sum of its
+requirement vectors. Scoring is then a single matrix product:
+
+    scores = candidates @ profiles    (candidates x dim) @ (dim x postings)
+
+Its cost does not depend on how many requirement lines the postings
+have. Requirement lines shared by several postings are embedded once.
+Candidates are scored in chunks, with a running top-k per posting, so
+memory stays bounded however many candidates are ranked.
+
+Needs NumPy.
+
+Usage:
+    matcher = RequirementMatcher((key, results['extracted_data']) for key, results in postings)
+    best = matcher.top_matches(candidates, k=10)   # candidates: (candidate_id, profile text)
+    best['posting-1']                              # [(candidate_id, score), ...] best first
+    matcher.explain(profile_text, 'posting-1')     # score per requirement line
+
+    python benchmark.py --matching 5000            # throughput
+"""
+
+import math
+import re
+import zlib
+from itertools import islice
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from analytics import normalize, requirement_bullets
+
+
+# Hash buckets per vector. Requirement vocabularies are small, so a few
+# thousand buckets keep collisions rare while a chunk of candidates stays
+# a few tens of MB.
+DEFAULT_DIM = 1 << 12
+
+# Candidates embedded and scored per matrix product.
+CHUNK_SIZE = 1024
+
+DEFAULT_MUST_WEIGHT = 1.0
+DEFAULT_NICE_WEIGHT = 0.5
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+def requirement_lines(extracted: Dict[str, Any], field: str) -> List[str]:
+    """The normalized, non-empty requirement lines of ``extracted[field]``.
+
+    The heading fragments that older results start with are dropped (see
+    ``analytics.requirement_bullets``).
+    """
+    lines = []
+    for line in requirement_bullets(extracted, field):
+        line = normalize(line)
+        if line:
+            lines.append(line)
+    return lines
+
+
+class HashedTfidf:
+    """TF-IDF embedding of texts into a fixed number of hash buckets."""
+
+    def __init__(self, dim: int = DEFAULT_DIM):
+        if dim < 1:
+            raise ValueError("dim must be at least 1")
+        self.dim = dim
+        self.idf = np.ones(dim, dtype=np.float32)
+
+    def features(self, text: str) -> List[int]:
+        """Bucket of every unigram and bigram in ``text``, with repeats."""
+        words = _WORD_PATTERN.findall(text.lower())
+        terms = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+        return [zlib.crc32(term.encode('utf-8')) % self.dim for term in terms]
+
+    def counts(self, texts: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Sparse term counts of ``texts``: ``(rows, buckets, counts)``, sorted by row."""
+        rows, cols = [], []
+        for row, text in enumerate(texts):
+            buckets = self.features(text)
+            rows.extend([row] * len(buckets))
+            cols.extend(buckets)
+        flat = np.asarray(rows, dtype=np.int64) * self.dim + np.asarray(cols, dtype=np.int64)
+        flat, counts = np.unique(flat, return_counts=True)
+        return flat // self.dim, flat % self.dim, counts
+
+    def fit(self, texts: Iterable[str], chunk_size: int = CHUNK_SIZE) -> 'HashedTfidf':
+        """Set the inverse document frequencies from ``texts``.
+
+        Uses the smoothed form ``log((1 + n) / (1 + df)) + 1``, so terms
+        found everywhere keep a small positive weight.
+        """
+        texts = iter(texts)
+        documents = 0
+        frequencies = np.zeros(self.dim, dtype=np.int64)
+        while True:
+            chunk = list(islice(texts, chunk_size))
+            if not chunk:
+                break
+            documents += len(chunk)
+            frequencies += np.bincount(self.counts(chunk)[1], minlength=self.dim)
+        self.idf = (np.log((1 + documents) / (1 + frequencies)) + 1).astype(np.float32)
+        return self
+
+    def sparse(self, texts: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Unit-length TF-IDF vectors of ``texts`` as ``(rows, buckets, values)``."""
+        rows, cols, counts = self.counts(texts)
+        values = np.log1p(counts, dtype=np.float32) * self.idf[cols]
+        norms = np.sqrt(np.bincount(rows, weights=values * values, minlength=len(texts)))
+        values /= norms[rows].astype(np.float32)
+        return rows, cols, values
+
+    def transform(self, texts: List[str]) -> np.ndarray:
+        """Unit-length TF-IDF vectors of ``texts``, one row each (zero for empty texts)."""
+        rows, cols, values = self.sparse(texts)
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        vectors[rows, cols] = values
+        return vectors
+
+
+class RequirementMatcher:
+    """Scores candidate texts against the requirement lists of many postings."""
+
+    def __init__(self, postings: Iterable[Tuple[Hashable, Dict[str, Any]]],
+                 dim: int = DEFAULT_DIM, must_weight: float = DEFAULT_MUST_WEIGHT,
+                 nice_weight: float = DEFAULT_NICE_WEIGHT,
+                 corpus: Optional[Iterable[str]] = None,
+                 chunk_size: int = CHUNK_SIZE):
+        """Embed the requirements of ``postings``: ``(key, extracted_data)`` pairs.
+
+        IDF is fitted on the distinct requirement lines, plus ``corpus`` if
+        given (e.g. a sample of candidate profiles).
+        """
+        self.keys: List[Hashable] = []
+        # Per posting: each distinct requirement line and its share of the score
+        self.requirements: List[Dict[str, float]] = []
+        line_ids: Dict[str, int] = {}
+        for key, extracted in postings:
+            weights: Dict[str, float] = {}
+            for field, weight in (('must_haves', must_weight), ('nice_to_haves', nice_weight)):
+                for line in requirement_lines(extracted, field):
+                    weights[line] = max(weights.get(line, 0.0), weight)
+                    line_ids.setdefault(line, len(line_ids))
+            total = sum(weights.values())
+            self.keys.append(key)
+            self.requirements.append({line: weight / total for line, weight in weights.items()})
+        self._columns = {key: column for column, key in enumerate(self.keys)}
+
+        lines = list(line_ids)
+        self.vectorizer = HashedTfidf(dim)
+        self.vectorizer.fit(lines if corpus is None else [*lines, *corpus])
+
+        # Scoring is linear in the requirement vectors, so each posting's
+        # weighted sum of them is precomputed once: one dim-sized profile
+        # per posting, however many lines it has.
+        entries = sorted((line_ids[line], column, weight)
+                         for column, requirements in enumerate(self.requirements)
+                         for line, weight in requirements.items())
+        entry_lines = np.array([entry[0] for entry in entries], dtype=np.int64)
+        entry_columns = np.array([entry[1] for entry in entries], dtype=np.int64)
+        entry_weights = np.array([entry[2] for entry in entries], dtype=np.float32)
+        line_starts = np.searchsorted(entry_lines, np.arange(len(lines) + 1))
+        profiles = np.zeros(len(self.keys) * dim, dtype=np.float32)
+        for start in range(0, len(lines), chunk_size):
+            rows, cols, values = self.vectorizer.sparse(lines[start:start + chunk_size])
+            rows += start
+            # Pair every nonzero of a line with every posting listing that line
+            repeats = line_starts[rows + 1] - line_starts[rows]
+            nonzero = np.repeat(np.arange(len(rows)), repeats)
+            offsets = np.arange(len(nonzero)) - np.repeat(np.cumsum(repeats) - repeats, repeats)
+            entry = line_starts[rows[nonzero]] + offsets
+            np.add.at(profiles, entry_columns[entry] * dim + cols[nonzero],
+                      values[nonzero] * entry_weights[entry])
+        self.profiles = np.ascontiguousarray(profiles.reshape(len(self.keys), dim).T)
+
+    def score(self, texts: List[str]) -> np.ndarray:
+        """Scores of ``texts`` against every posting, ``len(texts) x len(keys)``."""
+        return self.vectorizer.transform(texts) @ self.profiles
+
+    def explain(self, text: str, key: Hashable) -> List[Tuple[str, float]]:
+        """Similarity of ``text`` to each requirement line of posting ``key``."""
+        lines = list(self.requirements[self._columns[key]])
+        if not lines:
+            return []
+        similarity = self.vectorizer.transform(lines) @ self.vectorizer.transform([text])[0]
+        return [(line, float(value)) for line, value in zip(lines, similarity)]
+
+    def top_matches(self, candidates: Iterable[Tuple[Hashable, str]], k: int = 10,
+                    chunk_size: int = CHUNK_SIZE) -> Dict[Hashable, List[Tuple[Hashable, float]]]:
+        """The ``k`` best ``(candidate key, score)`` pairs per posting key, best first."""
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        candidates = iter(candidates)
+        candidate_keys: List[Hashable] = []
+        best_scores = np.full((k, len(self.keys)), -math.inf, dtype=np.float32)
+        best_ids = np.full((k, len(self.keys)), -1, dtype=np.int64)
+
+        while True:
+            chunk = list(islice(candidates, chunk_size))
+            if not chunk:
+                break
+            ids = np.arange(len(candidate_keys), len(candidate_keys) + len(chunk))
+            candidate_keys.extend(key for key, _ in chunk)
+            scores = self.score([text for _, text in chunk])
+
+            scores = np.concatenate([best_scores, scores])
+            ids = np.concatenate([best_ids, np.broadcast_to(ids[:, None], (len(chunk), len(self.keys)))])
+            top = np.argpartition(-scores, k - 1, axis=0)[:k]
+            best_scores = np.take_along_axis(scores, top, axis=0)
+            best_ids = np.take_along_axis(ids, top, axis=0)
+
+        order = np.argsort(-best_scores, axis=0, kind='stable')
+        best_scores = np.take_along_axis(best_scores, order, axis=0)
+        best_ids = np.take_along_axis(best_ids, order, axis=0)
+        return {
+            key: [(candidate_keys[i], float(s))
+                  for i, s in zip(best_ids[:, column], best_scores[:, column]) if i >= 0]
+            for column, key in enumerate(self.keys)
+        }
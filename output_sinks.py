@@ -0,0 +1,282 @@
+"""
+Output sinks for workflow results
+
+``save_results`` has always written four files per result. On network
+filesystems the per-file metadata calls (create, open, close) cost more
+than producing the results, so a run can instead go to a single bundle:
+
+- DirectorySink: The classic layout, one folder per result holding
+  job_summary.md, vp_intro_email.md, extracted_data.json and
+  complete_results.json
+- BundleSink: Every result in one file, written through a large buffer to
+  a temporary name and renamed into place only once complete, so readers
+  never see a partial bundle. The format follows the file name:
+
+  - ``.json``: ``{"<key>": <complete results>, ...}``
+  - ``.tar``: The classic layout, with one ``<key>/`` folder per result
+  - ``.zip``: As ``.tar``, deflate-compressed
+
+  ``.json`` and ``.tar`` take a ``.gz`` or ``.zst`` suffix for gzip or
+  zstd compression (``.tgz`` also works); zstd needs the ``zstandard``
+  package.
+
+The results are serialized once: the extracted data is rendered one time
+and reused inside ``complete_results.json``. JSON is compact unless the
+sink is created with ``pretty=True`` (``--pretty`` on the command line),
+and is encoded by the fastest library installed (see ``serialization``).
+
+Usage:
+    python cli.py --input job.txt --bundle results.json.gz
+    python cli.py --input-dir ./postings --bundle corpus.tar.zst
+    python cli.py --input job.txt --pretty
+
+    with open_sink("corpus.tar.gz") as sink:
+        sink.write("posting-1", agent.run_complete_workflow(job_text))
+"""
+
+import os
+import time
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Optional, Union
+
+from serialization import dumps_str
+
+# gzip, tarfile, tempfile and zipfile are imported by the bundle code that
+# uses them, so writing plain folders doesn't pay for loading them.
+
+
+FILE_NAMES = ("job_summary.md", "vp_intro_email.md", "extracted_data.json",
+              "complete_results.json")
+
+BUNDLE_FORMATS = ('json', 'tar', 'zip')
+COMPRESSIONS = {'.gz': 'gzip', '.tgz': 'gzip', '.zst': 'zstd'}
+
+# Write buffer for bundles; large enough that most batches flush rarely.
+BUFFER_SIZE = 1024 * 1024
+
+
+def complete_results_json(results: Dict[str, Any], extracted_json: Optional[str] = None,
+                          pretty: bool = False) -> str:
+    """``dumps_str(results, pretty)``, reusing an already rendered ``extracted_data``.
+
+    ``extracted_json`` must have been rendered with the same ``pretty``. A
+    nested value at depth one is the top-level rendering with every line
+    after the first indented two more spaces, which is all this relies on.
+    """
+    if not results:
+        return "{}"
+    items = []
+    for key, value in results.items():
+        if key == 'extracted_data' and extracted_json is not None:
+            text = extracted_json
+        else:
+            text = dumps_str(value, pretty)
+        if pretty:
+            items.append(f"  {dumps_str(key)}: " + text.replace("\n", "\n  "))
+        else:
+            items.append(f"{dumps_str(key)}:{text}")
+    if pretty:
+        return "{\n" + ",\n".join(items) + "\n}"
+    return "{" + ",".join(items) + "}"
+
+
+def render_files(results: Dict[str, Any], pretty: bool = False) -> Dict[str, str]:
+    """Return the classic output files for ``results`` as ``{file name: text}``."""
+    extracted_json = dumps_str(results['extracted_data'], pretty)
+    return {
+        "job_summary.md": "# Job Description Summary\n\n" + results['job_summary'],
+        "vp_intro_email.md": results['intro_email'],
+        "extracted_data.json": extracted_json,
+        "complete_results.json": complete_results_json(results, extracted_json, pretty),
+    }
+
+
+class OutputSink:
+    """Destination for results, used as a context manager.
+
+    Leaving the ``with`` block normally commits everything written; leaving
+    it with an exception discards what a bundle has written so far.
+    """
+
+    def write(self, key: str, results: Dict[str, Any]):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def abort(self):
+        self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+
+class DirectorySink(OutputSink):
+    """The classic layout: ``<root>/<key>/`` holds the four result files."""
+
+    def __init__(self, root: Union[str, Path], pretty: bool = False):
+        self.root = Path(root)
+        self.pretty = pretty
+
+    def write(self, key: str, results: Dict[str, Any]) -> Dict[str, Path]:
+        """Write one result; return the path of every file written, by file name."""
+        directory = self.root / key if key else self.root
+        directory.mkdir(parents=True, exist_ok=True)
+        paths = {}
+        for name, text in render_files(results, self.pretty).items():
+            path = paths[name] = directory / name
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text)
+        return paths
+
+
+def bundle_format(path: Union[str, Path]):
+    """Return ``(format, compression)`` for a bundle path, e.g. ``('tar', 'gzip')``."""
+    suffixes = Path(path).suffixes
+    compression = COMPRESSIONS.get(suffixes[-1]) if suffixes else None
+    if suffixes and suffixes[-1] == '.tgz':
+        return 'tar', 'gzip'
+    if compression is not None:
+        suffixes = suffixes[:-1]
+    fmt = suffixes[-1][1:] if suffixes else ''
+    if fmt not in BUNDLE_FORMATS:
+        raise ValueError(f"Unknown bundle format for '{path}' "
+                         f"(use .json, .tar or .zip, optionally with .gz or .zst)")
+    if fmt == 'zip' and compression is not None:
+        raise ValueError("Zip bundles are already compressed; drop the .gz/.zst suffix")
+    return fmt, compression
+
+
+def _compressor(raw: BinaryIO, compression: Optional[str]) -> BinaryIO:
+    if compression is None:
+        return raw
+    if compression == 'gzip':
+        import gzip
+        return gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=6)
+    try:
+        import zstandard
+    except ImportError:
+        raise ValueError("zstd compression requires the zstandard package") from None
+    return zstandard.ZstdCompressor().stream_writer(raw, closefd=False)
+
+
+class BundleSink(OutputSink):
+    """All results in one file, renamed into place when closed."""
+
+    def __init__(self, path: Union[str, Path], buffer_size: int = BUFFER_SIZE,
+                 pretty: bool = False):
+        self.path = Path(path)
+        self.pretty = pretty
+        self.format, self.compression = bundle_format(self.path)
+        self.count = 0
+        self._mtime = time.time()
+
+        import tarfile
+        import tempfile
+        import zipfile
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, self._tmp_path = tempfile.mkstemp(dir=self.path.parent,
+                                              prefix=f".tmp-{self.path.name}-")
+        os.fchmod(fd, 0o644)
+        self._raw = os.fdopen(fd, 'wb', buffering=buffer_size)
+        self._closed = False
+        self._stream: BinaryIO = self._raw
+        self._archive = None
+        try:
+            self._stream = _compressor(self._raw, self.compression)
+            if self.format == 'tar':
+                self._archive = tarfile.open(fileobj=self._stream, mode='w|')
+            elif self.format == 'zip':
+                self._archive = zipfile.ZipFile(self._raw, 'w', zipfile.ZIP_DEFLATED)
+            else:
+                self._stream.write(b"{")
+        except BaseException:
+            self.abort()
+            raise
+
+    def write(self, key: str, results: Dict[str, Any]):
+        """Add one result under ``key``."""
+        if self.format == 'json':
+            entry = complete_results_json(results, pretty=self.pretty)
+            separator = "," if self.count else ""
+            if self.pretty:
+                entry = entry.replace("\n", "\n  ")
+                self._stream.write(f"{separator}\n  {dumps_str(key)}: {entry}".encode('utf-8'))
+            else:
+                self._stream.write(f"{separator}{dumps_str(key)}:{entry}".encode('utf-8'))
+        else:
+            prefix = f"{key}/" if key else ""
+            for name, text in render_files(results, self.pretty).items():
+                data = text.encode('utf-8')
+                if self.format == 'zip':
+                    self._archive.writestr(prefix + name, data)
+                else:
+                    import io
+                    import tarfile
+                    info = tarfile.TarInfo(prefix + name)
+                    info.size = len(data)
+                    info.mode = 0o644
+                    info.mtime = self._mtime
+                    self._archive.addfile(info, io.BytesIO(data))
+        self.count += 1
+
+    def _close_streams(self):
+        """Write the archive or JSON trailer and flush every layer to the file."""
+        if self._archive is not None:
+            self._archive.close()
+        elif self.format == 'json':
+            self._stream.write(b"\n}\n" if self.count and self.pretty else b"}\n")
+        if self._stream is not self._raw:
+            self._stream.close()
+        self._raw.flush()
+
+    def close(self):
+        """Finish the bundle and move it to its final path."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._close_streams()
+            os.fsync(self._raw.fileno())
+            self._raw.close()
+            os.replace(self._tmp_path, self.path)
+        except BaseException:
+            self._raw.close()
+            os.unlink(self._tmp_path)
+            raise
+
+    def abort(self):
+        """Discard the bundle; any existing file at ``path`` is left untouched."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            # Closed properly so the archive objects don't write on collection
+            self._close_streams()
+        except Exception:
+            pass
+        self._raw.close()
+        os.unlink(self._tmp_path)
+
+
+def is_bundle_path(path: Union[str, Path]) -> bool:
+    """Whether ``path`` names a bundle (``.json``, ``.tar.gz``, ...) rather than a folder."""
+    try:
+        bundle_format(path)
+    except ValueError:
+        return False
+    return True
+
+
+def open_sink(path: Union[str, Path], pretty: bool = False) -> OutputSink:
+    """A :class:`BundleSink` if ``path`` names a bundle, else a :class:`DirectorySink`."""
+    if is_bundle_path(path):
+        return BundleSink(path, pretty=pretty)
+    return DirectorySink(path, pretty)
@@ -0,0 +1,121 @@
+"""
+Compact result types for holding many analyses in memory
+
+The pipeline's dict results are convenient for JSON but expensive in bulk:
+every result carries a dict per level, lists with spare capacity and, in
+the analysis, a reference to the full posting text. The frozen, slotted
+dataclasses here hold the same data with tuples instead of lists, keep the
+original text only when asked to, and convert losslessly to and from the
+dict form with ``to_dict``/``from_dict``.
+
+They also support ``result["field"]`` so code written against the dicts,
+such as ``JobDescriptionSummarizer.generate_summary``, accepts them as-is.
+
+Usage:
+    analysis = agent.analyze(job_text)                  # original text dropped
+    analysis = agent.analyze(job_text, keep_text=True)  # original text kept
+    json.dumps(analysis.to_dict())
+
+    python benchmark.py --memory 20000                  # compare memory use
+"""
+
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+
+class _ItemAccess:
+    """``obj["field"]`` as a read-only alias for ``obj.field``."""
+
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__dataclass_fields__
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default) if key in self.__dataclass_fields__ else default
+
+
+@dataclass(frozen=True, slots=True)
+class ExtractedInfo(_ItemAccess):
+    """Structured fields of one posting (``extract_key_information`` output)."""
+
+    timeline: Tuple[str, ...]
+    metrics: Tuple[str, ...]
+    must_haves: Tuple[str, ...]
+    nice_to_haves: Tuple[str, ...]
+    extracted_at: str
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "ExtractedInfo":
+        return cls(tuple(data['timeline']), tuple(data['metrics']), tuple(data['must_haves']),
+                   tuple(data['nice_to_haves']), data['extracted_at'])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'timeline': list(self.timeline),
+            'metrics': list(self.metrics),
+            'must_haves': list(self.must_haves),
+            'nice_to_haves': list(self.nice_to_haves),
+            'extracted_at': self.extracted_at,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class JobAnalysis(_ItemAccess):
+    """One analyzed posting (``analyze_job_description`` output).
+
+    ``original_text`` is None unless retention was requested; ``to_dict``
+    then leaves the key out.
+    """
+
+    summary: str
+    extracted_info: ExtractedInfo
+    processed_at: str
+    original_text: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any], keep_text: bool = True) -> "JobAnalysis":
+        return cls(data['summary'], ExtractedInfo.from_dict(data['extracted_info']),
+                   data['processed_at'], data.get('original_text') if keep_text else None)
+
+    def to_dict(self) -> Dict[str, Any]:
+        result: Dict[str, Any] = {}
+        if self.original_text is not None:
+            result['original_text'] = self.original_text
+        result['summary'] = self.summary
+        result['extracted_info'] = self.extracted_info.to_dict()
+        result['processed_at'] = self.processed_at
+        return result
+
+
+@dataclass(frozen=True, slots=True)
+class WorkflowResult(_ItemAccess):
+    """One complete workflow run (``run_complete_workflow`` output)."""
+
+    job_summary: str
+    intro_email: str
+    extracted_data: ExtractedInfo
+    workflow_completed_at: str
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "WorkflowResult":
+        """Build from a workflow dict; keys beyond the four standard ones are rejected."""
+        extra = set(data) - {field.name for field in fields(cls)}
+        if extra:
+            raise ValueError(f"Cannot represent extra result keys: {', '.join(sorted(extra))}")
+        return cls(data['job_summary'], data['intro_email'],
+                   ExtractedInfo.from_dict(data['extracted_data']), data['workflow_completed_at'])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'job_summary': self.job_summary,
+            'intro_email': self.intro_email,
+            'extracted_data': self.extracted_data.to_dict(),
+            'workflow_completed_at': self.workflow_completed_at,
+        }
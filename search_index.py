@@ -0,0 +1,247 @@
+"""
+Full-text search over processed postings and generated emails
+
+Results are indexed into a local SQLite database as they are written.
+There are three tables:
+
+- postings: one row per result key, holding the results themselves
+- postings_fts: an FTS5 table over each posting's requirements, metrics,
+  timeline, summary and email
+- metrics: each metric's threshold as a number, indexed so
+  "at least 30%" is a range lookup rather than a scan
+
+Writing a key that is already indexed replaces its entry, so re-running a
+batch over edited postings updates the index in place. Queries combine a
+free-text FTS5 match (``langchain OR "agent frameworks"``), a phrase the
+requirements must contain, and a minimum metric threshold. They return
+in milliseconds even over millions of postings.
+
+Usage:
+    python cli.py --input-dir ./postings --index postings.db      # fill while running
+    python cli.py --index postings.db --index-outputs ./results   # add existing outputs
+    python cli.py --index postings.db --search "" --requires LangChain --min-metric 30
+
+    index = ResultIndex("postings.db")
+    index.write("posting-1", agent.run_complete_workflow(job_text))
+    index.search(requires="LangChain", min_metric=30)
+"""
+
+import os
+import re
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from cache import SQLiteStore
+from output_sinks import OutputSink
+from serialization import dumps_str, loads
+
+
+# Bump when the tables change; older databases are rebuilt empty.
+INDEX_SCHEMA = 1
+
+# Columns of postings_fts, in order; any of them can prefix a query term
+# (``requirements: langchain``).
+FTS_COLUMNS = ('requirements', 'metrics', 'timeline', 'summary', 'email')
+
+# Records indexed per transaction by write_many and index_stream.
+BATCH_SIZE = 500
+
+_METRIC_ENTRY = re.compile(r"(\d+)% ")
+
+_SCHEMA = [
+    "CREATE TABLE postings ("
+    " id INTEGER PRIMARY KEY,"
+    " key TEXT NOT NULL UNIQUE,"
+    " results TEXT NOT NULL,"
+    " completed_at TEXT)",
+    "CREATE VIRTUAL TABLE postings_fts USING fts5("
+    + ", ".join(FTS_COLUMNS) + ", tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TABLE metrics ("
+    " posting_id INTEGER NOT NULL,"
+    " value INTEGER NOT NULL,"
+    " description TEXT NOT NULL)",
+    "CREATE INDEX metrics_value ON metrics (value, posting_id)",
+    "CREATE INDEX metrics_posting ON metrics (posting_id)",
+]
+
+
+def _fts_row(results: Dict[str, Any]) -> Tuple[str, ...]:
+    extracted = results.get('extracted_data') or {}
+    requirements = list(extracted.get('must_haves', ())) + list(extracted.get('nice_to_haves', ()))
+    return (
+        "\n".join(requirements),
+        "\n".join(extracted.get('metrics', ())),
+        "\n".join(extracted.get('timeline', ())),
+        results.get('job_summary') or "",
+        results.get('intro_email') or "",
+    )
+
+
+def _metric_rows(posting_id: int, results: Dict[str, Any]) -> List[Tuple[int, int, str]]:
+    rows = []
+    for entry in (results.get('extracted_data') or {}).get('metrics', ()):
+        match = _METRIC_ENTRY.match(entry)
+        if match is not None:
+            rows.append((posting_id, int(match.group(1)), entry[match.end():]))
+    return rows
+
+
+def phrase(text: str) -> str:
+    """Quote ``text`` as one FTS5 phrase, so its punctuation is not query syntax."""
+    return '"' + text.replace('"', '""') + '"'
+
+
+class ResultIndex(SQLiteStore, OutputSink):
+    """SQLite FTS5 index of workflow results, usable as an output sink."""
+
+    def __init__(self, path: str):
+        self.path = Path(os.path.expanduser(path))
+        super().__init__(self.path)
+
+    def _setup(self, conn: sqlite3.Connection):
+        # IMMEDIATE so concurrent workers opening a new index create it once
+        conn.execute("BEGIN IMMEDIATE")
+        with conn:
+            if conn.execute("PRAGMA user_version").fetchone()[0] != INDEX_SCHEMA:
+                for table in ('postings', 'postings_fts', 'metrics'):
+                    conn.execute(f"DROP TABLE IF EXISTS {table}")
+                for statement in _SCHEMA:
+                    conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {INDEX_SCHEMA}")
+
+    def _write(self, conn: sqlite3.Connection, key: str, results: Dict[str, Any]):
+        posting_id = conn.execute(
+            "INSERT INTO postings (key, results, completed_at) VALUES (?, ?, ?)"
+            " ON CONFLICT (key) DO UPDATE SET"
+            " results = excluded.results, completed_at = excluded.completed_at"
+            " RETURNING id",
+            (key, dumps_str(results), results.get('workflow_completed_at'))
+        ).fetchone()[0]
+        conn.execute("DELETE FROM postings_fts WHERE rowid = ?", (posting_id,))
+        conn.execute("DELETE FROM metrics WHERE posting_id = ?", (posting_id,))
+        conn.execute(f"INSERT INTO postings_fts (rowid, {', '.join(FTS_COLUMNS)})"
+                     f" VALUES (?{', ?' * len(FTS_COLUMNS)})",
+                     (posting_id,) + _fts_row(results))
+        conn.executemany("INSERT INTO metrics (posting_id, value, description) VALUES (?, ?, ?)",
+                         _metric_rows(posting_id, results))
+
+    def write(self, key: str, results: Dict[str, Any]):
+        """Index ``results`` under ``key``, replacing any earlier entry for it."""
+        with self._lock, self.conn:
+            self._write(self.conn, key, results)
+
+    def write_many(self, items: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        """Index ``(key, results)`` pairs in one transaction; return how many."""
+        count = 0
+        with self._lock, self.conn:
+            for key, results in items:
+                self._write(self.conn, key, results)
+                count += 1
+        return count
+
+    def index_stream(self, records: Iterable[Dict[str, Any]], key_field: str = 'id'
+                     ) -> Iterator[Dict[str, Any]]:
+        """Pass streaming output records through, indexing every successful one.
+
+        Records are committed in batches of ``BATCH_SIZE``; the last batch
+        when the iteration finishes.
+        """
+        pending = []
+        for record in records:
+            if 'error' not in record:
+                pending.append((str(record[key_field]), record))
+                if len(pending) >= BATCH_SIZE:
+                    self.write_many(pending)
+                    pending = []
+            yield record
+        self.write_many(pending)
+
+    def remove(self, key: str) -> bool:
+        """Drop ``key`` from the index; return whether it was indexed."""
+        with self._lock, self.conn:
+            row = self.conn.execute("DELETE FROM postings WHERE key = ? RETURNING id",
+                                    (key,)).fetchone()
+            if row is None:
+                return False
+            self.conn.execute("DELETE FROM postings_fts WHERE rowid = ?", row)
+            self.conn.execute("DELETE FROM metrics WHERE posting_id = ?", row)
+        return True
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """The results indexed under ``key``, or None."""
+        with self._lock:
+            row = self.conn.execute("SELECT results FROM postings WHERE key = ?",
+                                    (key,)).fetchone()
+        return loads(row[0]) if row is not None else None
+
+    def search(self, query: Optional[str] = None, requires: Optional[str] = None,
+               min_metric: Optional[int] = None, limit: int = 20) -> List[Dict[str, Any]]:
+        """Indexed postings matching every given condition, best matches first.
+
+        ``query`` is an FTS5 query over all columns; ``requires`` is a
+        phrase the must-haves or nice-to-haves must contain; ``min_metric``
+        keeps postings with a metric threshold of at least that many
+        percent. Each hit has the posting's ``key``, ``completed_at``,
+        ``must_haves`` and ``metrics``. Raises ValueError for a malformed
+        ``query``.
+        """
+        terms = []
+        if query:
+            terms.append(f"({query})")
+        if requires:
+            terms.append(f"requirements : {phrase(requires)}")
+
+        where, params = [], []
+        if terms:
+            sql = ("SELECT p.key, p.results, p.completed_at FROM postings_fts"
+                   " JOIN postings p ON p.id = postings_fts.rowid")
+            where.append("postings_fts MATCH ?")
+            params.append(" AND ".join(terms))
+            order = "ORDER BY postings_fts.rank"
+        else:
+            sql = "SELECT p.key, p.results, p.completed_at FROM postings p"
+            order = "ORDER BY p.id"
+        if min_metric is not None:
+            where.append("EXISTS (SELECT 1 FROM metrics m"
+                         " WHERE m.posting_id = p.id AND m.value >= ?)")
+            params.append(min_metric)
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" {order} LIMIT ?"
+        params.append(limit)
+
+        try:
+            with self._lock:
+                rows = self.conn.execute(sql, params).fetchall()
+        except sqlite3.OperationalError as e:
+            raise ValueError(f"Invalid search query: {e}") from None
+
+        hits = []
+        for key, results, completed_at in rows:
+            extracted = loads(results).get('extracted_data') or {}
+            hits.append({
+                'key': key,
+                'completed_at': completed_at,
+                'must_haves': extracted.get('must_haves', []),
+                'metrics': extracted.get('metrics', []),
+            })
+        return hits
+
+    def index_outputs(self, output_dir: str) -> int:
+        """Index every ``complete_results.json`` under ``output_dir``; return how many.
+
+        Each is keyed by its folder relative to ``output_dir``, as in bundles.
+        """
+        root = Path(output_dir)
+
+        def items():
+            for path in sorted(root.rglob("complete_results.json")):
+                key = path.parent.relative_to(root).as_posix()
+                yield ('' if key == '.' else key), loads(path.read_bytes())
+
+        return self.write_many(items())
+
+    def count(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM postings").fetchone()[0]
@@ -0,0 +1,158 @@
+"""
+JSON encoding for results, using the fastest library installed
+
+Every component that writes results (JSONL streams, output sinks, the
+cache and the HTTP service) encodes through this module. Three encoders
+are known, tried in this order:
+
+- orjson: Fastest; encodes straight to UTF-8 bytes
+- msgspec: Similar speed; pretty output is reformatted afterwards
+- json: The standard library, always available
+
+Output is compact by default (no whitespace); ``pretty=True`` gives
+two-space indentation. Either way non-ASCII characters are written as
+UTF-8, and every encoder gives the same data and layout. Objects with a
+``to_dict`` method (the ``results`` types) are encoded through it.
+
+Set ``GENAI_JSON_ENCODER=json`` (or ``orjson``/``msgspec``) to force an
+encoder, or call :func:`set_encoder`.
+
+Usage:
+    from serialization import dumps, dumps_str, loads
+    out.write(dumps(results))                 # compact UTF-8 bytes
+    text = dumps_str(results, pretty=True)    # indented str
+"""
+
+import os
+from typing import Any, Callable, Dict, Optional, Union
+
+
+ENCODER_ENV = 'GENAI_JSON_ENCODER'
+PREFERENCE = ('orjson', 'msgspec', 'json')
+
+
+def _default(obj: Any) -> Any:
+    to_dict = getattr(obj, 'to_dict', None)
+    if to_dict is None:
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+    return to_dict()
+
+
+class Encoder:
+    """One JSON library behind a common interface."""
+
+    def __init__(self, name: str, dumps: Callable[[Any, bool], bytes],
+                 loads: Callable[[Union[bytes, str]], Any]):
+        self.name = name
+        self._dumps = dumps
+        self.loads = loads
+
+    def dumps(self, obj: Any, pretty: bool = False) -> bytes:
+        """Encode ``obj`` as UTF-8 JSON, indented if ``pretty``."""
+        return self._dumps(obj, pretty)
+
+    def __repr__(self):
+        return f"Encoder({self.name!r})"
+
+
+def _stdlib_encoder() -> Encoder:
+    import json
+
+    compact = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), default=_default)
+    indented = json.JSONEncoder(ensure_ascii=False, indent=2, default=_default)
+
+    def dumps(obj: Any, pretty: bool) -> bytes:
+        return (indented if pretty else compact).encode(obj).encode('utf-8')
+
+    return Encoder('json', dumps, json.loads)
+
+
+def _orjson_encoder() -> Encoder:
+    import orjson
+
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATACLASS
+    pretty_options = options | orjson.OPT_INDENT_2
+
+    def dumps(obj: Any, pretty: bool) -> bytes:
+        return orjson.dumps(obj, default=_default, option=pretty_options if pretty else options)
+
+    return Encoder('orjson', dumps, orjson.loads)
+
+
+def _msgspec_encoder() -> Encoder:
+    import msgspec
+
+    encoder = msgspec.json.Encoder(enc_hook=_default)
+    decoder = msgspec.json.Decoder()
+
+    def dumps(obj: Any, pretty: bool) -> bytes:
+        data = encoder.encode(obj)
+        return msgspec.json.format(data, indent=2) if pretty else data
+
+    def loads(data: Union[bytes, str]) -> Any:
+        try:
+            return decoder.decode(data)
+        except msgspec.DecodeError as e:
+            # Callers expect the stdlib's ValueError for bad input
+            raise ValueError(str(e)) from e
+
+    return Encoder('msgspec', dumps, loads)
+
+
+_FACTORIES: Dict[str, Callable[[], Encoder]] = {
+    'orjson': _orjson_encoder,
+    'msgspec': _msgspec_encoder,
+    'json': _stdlib_encoder,
+}
+
+
+def get_encoder(name: Optional[str] = None) -> Encoder:
+    """Return the encoder called ``name``, or the fastest one installed.
+
+    Raises ValueError for an unknown name and ImportError if the named
+    library is not installed.
+    """
+    if name is not None:
+        if name not in _FACTORIES:
+            raise ValueError(f"Unknown JSON encoder '{name}' (choose from {', '.join(PREFERENCE)})")
+        return _FACTORIES[name]()
+
+    for candidate in PREFERENCE:
+        try:
+            return _FACTORIES[candidate]()
+        except ImportError:
+            continue
+    raise AssertionError("the stdlib encoder is always available")
+
+
+# Chosen on first use, so importing this module doesn't import the library
+_encoder: Optional[Encoder] = None
+
+
+def set_encoder(name: Optional[str] = None) -> Encoder:
+    """Switch the module-wide encoder (None picks the fastest installed)."""
+    global _encoder
+    _encoder = get_encoder(name)
+    return _encoder
+
+
+def current_encoder() -> Encoder:
+    """The module-wide encoder, chosen from ``GENAI_JSON_ENCODER`` on first use."""
+    if _encoder is None:
+        return set_encoder(os.environ.get(ENCODER_ENV) or None)
+    return _encoder
+
+
+def dumps(obj: Any, pretty: bool = False) -> bytes:
+    """Encode ``obj`` with the current encoder as UTF-8 bytes."""
+    return (_encoder or current_encoder()).dumps(obj, pretty)
+
+
+def dumps_str(obj: Any, pretty: bool = False) -> str:
+    """Encode ``obj`` with the current encoder as ``str``."""
+    return (_encoder or current_encoder()).dumps(obj, pretty).decode('utf-8')
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decode JSON from bytes or ``str``; raises ValueError on invalid input."""
+    return (_encoder or current_encoder()).loads(data)
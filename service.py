@@ -0,0 +1,454 @@
+#!/usr/bin/env python3
+"""
+HTTP service for the GenAI Agent
+
+A long-running local service so callers don't pay process start-up for
+every document. Requests are collected by a micro-batcher (up to
+``max_batch`` requests, or whatever arrived within ``max_wait_ms`` of the
+first) and each batch is handed to a pool of warm worker processes, one
+GenAIAgent per worker.
+
+Endpoints:
+    POST /analyze    {"job_text": "..."}     -> process_job_description result
+    POST /email      {"job_context": "...", "voice_profile": "CTO"}
+                                             -> {"intro_email": "..."}
+    POST /workflow   {"job_text": "..."}     -> run_complete_workflow result
+    GET  /voice-profiles                     -> available voice profiles
+    GET  /health                             -> liveness and pool status
+    GET  /metrics                            -> Prometheus text format
+
+Voice profiles given with ``--voice-profiles`` are reloaded whenever their
+files change, in every worker, without restarting the service.
+
+Usage:
+    python service.py --port 8080 --workers 4
+    python service.py --voice-profiles ./voices
+    curl -s localhost:8080/workflow -d '{"job_text": "Must-Haves\\n* Python"}'
+"""
+
+import argparse
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import (
+    Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError as FutureTimeout
+)
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from genai_agent import GenAIAgent
+from serialization import dumps
+from voice_profiles import VoiceProfileRegistry
+
+
+REQUEST_TIMEOUT = 60.0
+MAX_BODY_BYTES = 10 * 1024 * 1024
+
+# One warm agent per worker process, created by _init_worker.
+_worker_agent: Optional[GenAIAgent] = None
+
+
+def _init_worker(cache=None, voice_profile_paths: Tuple[str, ...] = (),
+                 agent_options: Optional[Dict[str, Any]] = None):
+    """Create the per-worker agent once, before any request arrives."""
+    global _worker_agent
+    voice_profiles = VoiceProfileRegistry(voice_profile_paths) if voice_profile_paths else None
+    _worker_agent = GenAIAgent(cache=cache, voice_profiles=voice_profiles, **(agent_options or {}))
+
+
+def _op_analyze(agent: GenAIAgent, payload: Dict[str, Any]) -> Dict[str, Any]:
+    return agent.analyze_job_description(payload['job_text'])
+
+
+def _op_email(agent: GenAIAgent, payload: Dict[str, Any]) -> Dict[str, Any]:
+    return {'intro_email': agent.generate_vp_intro_email(payload.get('job_context'),
+                                                         agent.new_session(),
+                                                         payload.get('voice_profile'))}
+
+
+def _op_workflow(agent: GenAIAgent, payload: Dict[str, Any]) -> Dict[str, Any]:
+    return agent.run_complete_workflow(payload['job_text'])
+
+
+OPERATIONS: Dict[str, Callable[[GenAIAgent, Dict[str, Any]], Dict[str, Any]]] = {
+    'analyze': _op_analyze,
+    'email': _op_email,
+    'workflow': _op_workflow,
+}
+
+
+def _run_batch(items: List[Tuple[str, Dict[str, Any]]]) -> List[Tuple[bool, Any]]:
+    """Run a batch of ``(operation, payload)`` items on the worker's agent.
+
+    Returns ``(ok, result_or_error)`` per item; one failing item never fails
+    the rest of the batch.
+    """
+    agent = _worker_agent if _worker_agent is not None else GenAIAgent()
+    results = []
+    for op, payload in items:
+        try:
+            results.append((True, OPERATIONS[op](agent, payload)))
+        except Exception as e:
+            results.append((False, f"{type(e).__name__}: {e}"))
+    return results
+
+
+class ServiceMetrics:
+    """Thread-safe counters rendered in Prometheus text format."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.requests: Dict[Tuple[str, int], int] = {}
+        self.latency_sum: Dict[str, float] = {}
+        self.latency_count: Dict[str, int] = {}
+        self.batches = 0
+        self.batch_items = 0
+        self.in_flight = 0
+
+    def request_started(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def request_finished(self, endpoint: str, status: int, seconds: float):
+        with self._lock:
+            self.in_flight -= 1
+            key = (endpoint, status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            self.latency_sum[endpoint] = self.latency_sum.get(endpoint, 0.0) + seconds
+            self.latency_count[endpoint] = self.latency_count.get(endpoint, 0) + 1
+
+    def batch_dispatched(self, size: int):
+        with self._lock:
+            self.batches += 1
+            self.batch_items += size
+
+    def render(self) -> str:
+        with self._lock:
+            lines = [
+                "# HELP genai_requests_total HTTP requests by endpoint and status.",
+                "# TYPE genai_requests_total counter",
+            ]
+            for (endpoint, status), count in sorted(self.requests.items()):
+                lines.append(f'genai_requests_total{{endpoint="{endpoint}",status="{status}"}} {count}')
+
+            lines += [
+                "# HELP genai_request_seconds Request latency by endpoint.",
+                "# TYPE genai_request_seconds summary",
+            ]
+            for endpoint in sorted(self.latency_count):
+                lines.append(f'genai_request_seconds_sum{{endpoint="{endpoint}"}} '
+                             f'{self.latency_sum[endpoint]:.6f}')
+                lines.append(f'genai_request_seconds_count{{endpoint="{endpoint}"}} '
+                             f'{self.latency_count[endpoint]}')
+
+            lines += [
+                "# HELP genai_batches_total Micro-batches sent to the worker pool.",
+                "# TYPE genai_batches_total counter",
+                f"genai_batches_total {self.batches}",
+                "# HELP genai_batch_items_total Requests carried by those batches.",
+                "# TYPE genai_batch_items_total counter",
+                f"genai_batch_items_total {self.batch_items}",
+                "# HELP genai_requests_in_flight Requests currently being served.",
+                "# TYPE genai_requests_in_flight gauge",
+                f"genai_requests_in_flight {self.in_flight}",
+                "# HELP genai_uptime_seconds Seconds since the service started.",
+                "# TYPE genai_uptime_seconds gauge",
+                f"genai_uptime_seconds {time.time() - self.started:.3f}",
+            ]
+        return "\n".join(lines) + "\n"
+
+
+class MicroBatcher:
+    """Group requests that arrive together into worker-pool calls.
+
+    A collected batch is split into at most ``workers`` chunks, one
+    pool call each, so a burst is spread over the whole pool instead of
+    running serially on one worker.
+    """
+
+    def __init__(self, executor: Executor, max_batch: int = 16, max_wait: float = 0.005,
+                 metrics: Optional[ServiceMetrics] = None, workers: int = 1):
+        self.executor = executor
+        self.workers = max(1, workers)
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.metrics = metrics
+        self._queue: "queue.Queue[Optional[Tuple[str, Dict[str, Any], Future]]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._dispatch_loop, name="micro-batcher",
+                                        daemon=True)
+        self._thread.start()
+
+    def submit(self, op: str, payload: Dict[str, Any]) -> Future:
+        """Queue one request; the future resolves to its result."""
+        future: Future = Future()
+        self._queue.put((op, payload, future))
+        return future
+
+    def _collect(self, first) -> list:
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _dispatch_loop(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+
+            batch = self._collect(first)
+            if self.metrics is not None:
+                self.metrics.batch_dispatched(len(batch))
+
+            chunks = min(self.workers, len(batch))
+            size, extra = divmod(len(batch), chunks)
+            start = 0
+            for i in range(chunks):
+                end = start + size + (i < extra)
+                self._dispatch(batch[start:end])
+                start = end
+
+    def _dispatch(self, chunk: list):
+        futures = [future for _, _, future in chunk]
+        try:
+            pending = self.executor.submit(_run_batch, [(op, payload) for op, payload, _ in chunk])
+        except Exception as e:
+            for future in futures:
+                future.set_exception(e)
+            return
+        pending.add_done_callback(lambda done: self._resolve(done, futures))
+
+    @staticmethod
+    def _resolve(done: Future, futures: List[Future]):
+        error = done.exception()
+        if error is not None:
+            for future in futures:
+                future.set_exception(error)
+            return
+
+        for future, (ok, value) in zip(futures, done.result()):
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(RuntimeError(value))
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+
+class AgentRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server: "AgentHTTPServer"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        return status
+
+    def _send_json(self, status: int, data: Any):
+        return self._send(status, dumps(data), 'application/json')
+
+    def _timed(self, endpoint: str, handler: Callable[[], int]):
+        metrics = self.server.metrics
+        started = time.perf_counter()
+        metrics.request_started()
+        status = 500
+        try:
+            status = handler()
+        finally:
+            metrics.request_finished(endpoint, status, time.perf_counter() - started)
+
+    def do_GET(self):
+        routes = {
+            '/health': self._health,
+            '/metrics': self._metrics,
+            '/voice-profiles': self._voice_profiles,
+        }
+        handler = routes.get(self.path)
+        if handler is None:
+            self._timed('unknown', lambda: self._send_json(404, {'error': 'Not found'}))
+        else:
+            self._timed(self.path.lstrip('/'), handler)
+
+    def do_POST(self):
+        op = self.path.lstrip('/')
+        if op not in OPERATIONS:
+            self._discard_body()
+            self._timed('unknown', lambda: self._send_json(404, {'error': 'Not found'}))
+            return
+        self._timed(op, lambda: self._operation(op))
+
+    def _discard_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if 0 < length <= MAX_BODY_BYTES:
+            self.rfile.read(length)
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            raise ValueError("request body too large")
+        data = json.loads(self.rfile.read(length) or b'{}')
+        if not isinstance(data, dict):
+            raise ValueError("request body must be a JSON object")
+        return data
+
+    def _operation(self, op: str) -> int:
+        try:
+            payload = self._read_json()
+        except ValueError as e:
+            return self._send_json(400, {'error': f"Invalid request: {e}"})
+
+        if op != 'email' and not isinstance(payload.get('job_text'), str):
+            return self._send_json(400, {'error': "Field 'job_text' (string) is required"})
+        if op == 'email' and not isinstance(payload.get('job_context', ''), str):
+            return self._send_json(400, {'error': "Field 'job_context' must be a string"})
+        voice = payload.get('voice_profile')
+        if op == 'email' and voice is not None:
+            if not isinstance(voice, str):
+                return self._send_json(400, {'error': "Field 'voice_profile' must be a string"})
+            if self.server.voice_profiles.find(voice) is None:
+                return self._send_json(400, {'error': f"Unknown voice profile: {voice!r}"})
+
+        future = self.server.batcher.submit(op, payload)
+        try:
+            result = future.result(timeout=self.server.request_timeout)
+        except FutureTimeout:
+            return self._send_json(504, {'error': 'Timed out waiting for a worker'})
+        except Exception as e:
+            return self._send_json(500, {'error': str(e)})
+        return self._send_json(200, result)
+
+    def _health(self) -> int:
+        return self._send_json(200, {
+            'status': 'ok',
+            'workers': self.server.workers,
+            'uptime_seconds': round(time.time() - self.server.metrics.started, 3),
+        })
+
+    def _metrics(self) -> int:
+        body = self.server.metrics.render().encode('utf-8')
+        return self._send(200, body, 'text/plain; version=0.0.4')
+
+    def _voice_profiles(self) -> int:
+        registry = self.server.voice_profiles
+        return self._send_json(200, {
+            'default': registry.default_name,
+            'voice_profiles': [registry.profile(name).to_dict() for name in registry.names()],
+            'errors': registry.errors,
+        })
+
+
+class AgentHTTPServer(ThreadingHTTPServer):
+    """Threaded HTTP front end over a micro-batched, warm worker pool.
+
+    ``workers`` processes each hold one GenAIAgent; ``workers=0`` runs the
+    agents on threads inside this process instead (useful for tests and
+    platforms where forking is expensive). ``agent_options`` are further
+    GenAIAgent arguments, such as ``email_backend``, ``section_timeout``
+    and ``fallback``; with worker processes they must be picklable.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 8080, workers: Optional[int] = None,
+                 max_batch: int = 16, max_wait_ms: float = 5.0, cache=None,
+                 request_timeout: float = REQUEST_TIMEOUT, verbose: bool = False,
+                 voice_profile_paths: Tuple[str, ...] = (),
+                 agent_options: Optional[Dict[str, Any]] = None):
+        super().__init__((host, port), AgentRequestHandler)
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.request_timeout = request_timeout
+        self.verbose = verbose
+        self.metrics = ServiceMetrics()
+        self.voice_profiles = VoiceProfileRegistry(voice_profile_paths)
+        voice_profile_paths = tuple(str(path) for path in voice_profile_paths)
+
+        if self.workers > 0:
+            self.executor: Executor = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_init_worker,
+                initargs=(cache, voice_profile_paths, agent_options)
+            )
+            # Start every worker now so the first requests don't pay for it.
+            for future in [self.executor.submit(_run_batch, []) for _ in range(self.workers)]:
+                future.result()
+        else:
+            _init_worker(cache, voice_profile_paths, agent_options)
+            self.executor = ThreadPoolExecutor(max_workers=1)
+
+        self.batcher = MicroBatcher(self.executor, max_batch, max_wait_ms / 1000.0, self.metrics,
+                                    workers=self.workers)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def server_close(self):
+        super().server_close()
+        self.batcher.close()
+        self.executor.shutdown(wait=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP service for the GenAI Agent")
+    parser.add_argument('--host', type=str, default='127.0.0.1',
+                        help='Interface to bind (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8080, help='Port to listen on (default: 8080)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes (default: number of CPUs; 0 = in-process)')
+    parser.add_argument('--max-batch', type=int, default=16,
+                        help='Most requests sent to a worker at once (default: 16)')
+    parser.add_argument('--max-wait-ms', type=float, default=5.0,
+                        help='How long to wait for a batch to fill (default: 5)')
+    parser.add_argument('--cache-dir', type=str, default=None,
+                        help='Result cache directory (default: ~/.cache/genai-agent)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Always recompute results instead of using the result cache')
+    parser.add_argument('--voice-profiles', type=str, action='append', default=[],
+                        help='Voice profile YAML/JSON file or directory (repeatable)')
+    parser.add_argument('--verbose', action='store_true', help='Log every request')
+    args = parser.parse_args()
+
+    cache = None
+    if not args.no_cache:
+        from cache import ResultCache
+        cache = ResultCache(args.cache_dir)
+
+    server = AgentHTTPServer(args.host, args.port, args.workers, args.max_batch,
+                             args.max_wait_ms, cache, verbose=args.verbose,
+                             voice_profile_paths=tuple(args.voice_profiles))
+    print(f"GenAI Agent service listening on {server.url} ({server.workers} workers)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down...", file=sys.stderr)
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
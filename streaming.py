@@ -0,0 +1,119 @@
+"""
+Streaming JSONL pipeline for the GenAI Agent
+
+Reads job postings one JSON record per line (from a file or stdin), runs
+the complete workflow on each record as it arrives and writes one JSON
+result per line. Everything is generator based, so memory use stays flat
+no matter how large the input is, and the output can be piped straight
+into other tools.
+
+Input records need a text field (``text`` by default) and may carry an id
+field (``id`` by default; the 1-based line number is used otherwise)::
+
+    {"id": "job-42", "text": "Vibe Coder-in-Residence ..."}
+
+Each output line holds the id plus the workflow results, or an ``error``
+for records that could not be processed::
+
+    {"id": "job-42", "job_summary": "...", "intro_email": "...", ...}
+    {"id": 7, "error": "JSONDecodeError: Expecting value: line 1 column 1 (char 0)"}
+
+Usage:
+    python cli.py --input-jsonl postings.jsonl --output-jsonl results.jsonl
+    cat postings.jsonl | python cli.py --input-jsonl - | jq .job_summary
+"""
+
+import json
+import sys
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, Optional, TextIO, Tuple
+
+from genai_agent import GenAIAgent
+from serialization import dumps_str
+
+
+@contextmanager
+def open_stream(path: str, mode: str):
+    """Open ``path`` for text I/O, treating ``-`` as stdin/stdout."""
+    if path == '-':
+        yield sys.stdin if 'r' in mode else sys.stdout
+        return
+    with open(path, mode, encoding='utf-8') as f:
+        yield f
+
+
+def iter_records(lines: Iterable[str], text_field: str = 'text',
+                 id_field: str = 'id') -> Iterator[Tuple[Any, Optional[str], Optional[str]]]:
+    """Yield ``(record_id, job_text, error)`` for every non-blank line.
+
+    Exactly one of ``job_text`` and ``error`` is set; a malformed line only
+    produces an error tuple and never stops the iteration.
+    """
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, None, f"JSONDecodeError: {e}"
+            continue
+
+        if not isinstance(record, dict):
+            yield line_number, None, "ValueError: record is not a JSON object"
+            continue
+
+        record_id = record.get(id_field, line_number)
+        job_text = record.get(text_field)
+        if not isinstance(job_text, str):
+            yield record_id, None, f"KeyError: missing text field '{text_field}'"
+            continue
+
+        yield record_id, job_text, None
+
+
+def process_records(records: Iterable[Tuple[Any, Optional[str], Optional[str]]],
+                    agent: Optional[GenAIAgent] = None) -> Iterator[Dict[str, Any]]:
+    """Run the complete workflow lazily over ``iter_records`` output."""
+    agent = agent or GenAIAgent()
+
+    for record_id, job_text, error in records:
+        if error is not None:
+            yield {'id': record_id, 'error': error}
+            continue
+
+        try:
+            results = agent.run_complete_workflow(job_text)
+        except Exception as e:
+            yield {'id': record_id, 'error': f"{type(e).__name__}: {e}"}
+            continue
+
+        yield {'id': record_id, **results}
+
+
+def write_jsonl(results: Iterable[Dict[str, Any]], out: TextIO) -> Dict[str, int]:
+    """Write each result as one compact JSON line; return success/failure counts."""
+    counts = {'succeeded': 0, 'failed': 0}
+
+    for result in results:
+        out.write(dumps_str(result))
+        out.write('\n')
+        counts['failed' if 'error' in result else 'succeeded'] += 1
+
+    out.flush()
+    return counts
+
+
+def run_stream(input_path: str, output_path: str = '-', text_field: str = 'text',
+               id_field: str = 'id', agent: Optional[GenAIAgent] = None,
+               index=None) -> Dict[str, int]:
+    """Stream ``input_path`` through the agent into ``output_path`` (``-`` = stdio).
+
+    Successful results are also added to ``index`` (a
+    ``search_index.ResultIndex``) under their id, if given.
+    """
+    with open_stream(input_path, 'r') as src, open_stream(output_path, 'w') as out:
+        results = process_records(iter_records(src, text_field, id_field), agent)
+        if index is not None:
+            results = index.index_stream(results)
+        return write_jsonl(results, out)
@@ -0,0 +1,103 @@
+"""
+Dependency-ordered concurrent execution of async tasks
+
+A graph maps task names to :class:`Task` entries. Each task names the
+tasks it depends on and receives their results. ``run_graph`` starts every
+task as soon as its dependencies are done, so independent tasks run
+concurrently and a graph takes as long as its slowest chain rather than
+the sum of its tasks.
+
+Each task can have a ``fallback``. If the task raises, or runs longer
+than the graph's per-task ``timeout``, the fallback's value is used in
+its place and its dependents carry on. A task without a fallback fails
+the whole graph, and every task still running is cancelled.
+
+EmailGenerator uses this to request email sections from an LLM backend
+(see ``genai_agent.EMAIL_SECTION_DEPENDENCIES``).
+
+Usage:
+    async def closing(done):
+        return await backend.complete(closing_prompt(done['metrics']))
+
+    results = await run_graph({
+        'metrics': Task(metrics, fallback=lambda done: STATIC['metrics']),
+        'closing': Task(closing, depends_on=('metrics',)),
+    }, timeout=5.0)
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+
+class Task(NamedTuple):
+    """One node of a graph run by :func:`run_graph`."""
+
+    # Called with {dependency name: result}; returns the task's awaitable
+    run: Callable[[Dict[str, Any]], Awaitable[Any]]
+    depends_on: Tuple[str, ...] = ()
+    # Called with the same mapping when ``run`` fails or times out
+    fallback: Optional[Callable[[Dict[str, Any]], Any]] = None
+
+
+def topological_order(dependencies: Mapping[str, Iterable[str]]) -> List[str]:
+    """Order names so each follows everything it depends on.
+
+    Ties keep the mapping's order. Raises ValueError for a dependency that
+    is not in the mapping, or for a cycle.
+    """
+    remaining = {name: set(depends_on) for name, depends_on in dependencies.items()}
+    for name, depends_on in remaining.items():
+        unknown = depends_on - remaining.keys()
+        if unknown:
+            raise ValueError(f"Task '{name}' depends on unknown task(s): {', '.join(sorted(unknown))}")
+
+    order: List[str] = []
+    while remaining:
+        ready = [name for name, depends_on in remaining.items() if not depends_on]
+        if not ready:
+            raise ValueError(f"Dependency cycle among tasks: {', '.join(remaining)}")
+        for name in ready:
+            del remaining[name]
+            order.append(name)
+        for depends_on in remaining.values():
+            depends_on.difference_update(ready)
+    return order
+
+
+async def run_graph(tasks: Mapping[str, Task], timeout: Optional[float] = None,
+                    on_fallback: Optional[Callable[[str, BaseException], None]] = None
+                    ) -> Dict[str, Any]:
+    """Run every task once its dependencies are done; return {name: result}.
+
+    ``timeout`` bounds each task's own run, not the time spent waiting for
+    its dependencies. ``on_fallback(name, error)`` is called whenever a
+    fallback replaces a task's result. Raises ValueError for an invalid
+    graph, or the error of the first task without a fallback to fail
+    (TimeoutError if it timed out).
+    """
+    order = topological_order({name: task.depends_on for name, task in tasks.items()})
+    running: Dict[str, asyncio.Task] = {}
+
+    async def run_one(name: str) -> Any:
+        task = tasks[name]
+        done = {dependency: await running[dependency] for dependency in task.depends_on}
+        try:
+            return await asyncio.wait_for(task.run(done), timeout)
+        except Exception as e:
+            if task.fallback is None:
+                raise
+            if on_fallback is not None:
+                on_fallback(name, e)
+            return task.fallback(done)
+
+    for name in order:
+        running[name] = asyncio.ensure_future(run_one(name))
+    try:
+        results = await asyncio.gather(*running.values())
+    except BaseException:
+        for pending in running.values():
+            pending.cancel()
+        # Collect what the cancelled and failed tasks raised
+        await asyncio.gather(*running.values(), return_exceptions=True)
+        raise
+    return dict(zip(running, results))
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Tests for corpus analytics
+"""
+
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from analytics import (
+    CorpusAnalytics, CountMinSketch, TopK, iter_dump, iter_jsonl, milestone_days,
+    requirement_bullets
+)
+
+
+def posting(requirements, metric="≥ 5% production agents live", timeline="Day 1-30"):
+    bullets = "\n".join(f"* {r}" for r in requirements)
+    return f"""What You'll Do
+* {timeline} — Observe: shadow meetings
+
+Must-Haves
+{bullets}
+
+Nice-to-Haves
+* Experience building AI copilots
+
+Success Metrics
+* {metric}
+"""
+
+
+class TestSketches(unittest.TestCase):
+    """Test cases for CountMinSketch and TopK."""
+
+    def test_count_min_never_undercounts(self):
+        sketch = CountMinSketch(width=64, depth=4)
+        rng = random.Random(0)
+        truth = {}
+        for _ in range(5000):
+            item = f"item-{rng.randrange(500)}"
+            truth[item] = truth.get(item, 0) + 1
+            sketch.add(item)
+
+        self.assertEqual(sketch.total, 5000)
+        for item, count in truth.items():
+            self.assertGreaterEqual(sketch.estimate(item), count)
+        overcounts = sorted(sketch.estimate(item) - count for item, count in truth.items())
+        self.assertLessEqual(overcounts[len(overcounts) // 2], sketch.error_bound())
+
+    def test_top_k_finds_heavy_hitters_in_bounded_memory(self):
+        """Test frequent items are found even when they first appear late."""
+        topk = TopK(k=5, sketch=CountMinSketch(width=1024))
+        rng = random.Random(1)
+        stream = [f"rare-{i}" for i in range(3000)]
+        stream += [f"hot-{i}" for i in range(4) for _ in range(100 - 20 * i)]
+        rng.shuffle(stream)
+        stream += ["late"] * 120
+        for item in stream:
+            topk.add(item)
+
+        self.assertEqual([item for item, _ in topk.most_common(4)],
+                         ["late", "hot-0", "hot-1", "hot-2"])
+        self.assertIn("hot-3", dict(topk.most_common()))
+        self.assertEqual(len(topk._counts), 5)
+        self.assertLessEqual(len(topk._heap), 4 * 5 + 16)
+
+
+class TestCorpusAnalytics(unittest.TestCase):
+    """Test cases for CorpusAnalytics and its input sources."""
+
+    def test_counts_postings_not_mentions(self):
+        analytics = CorpusAnalytics(top=3)
+        for i in range(4):
+            analytics.add_text(posting(["Python", "python ", f"Skill {i}"]))
+        analytics.add_text(posting(["Rust"], metric="≥ 90% adoption", timeline="Week 2"))
+
+        report = analytics.report()
+        must_haves = report['fields']['must_haves']['most_common']
+        self.assertEqual(must_haves[0], {'item': 'python', 'postings': 4})
+        self.assertEqual(len(must_haves), 3)
+        self.assertEqual(report['fields']['metric_thresholds']['most_common'][:2],
+                         [{'item': '≥ 5%', 'postings': 4}, {'item': '≥ 90%', 'postings': 1}])
+        self.assertEqual(report['fields']['milestones']['most_common'],
+                         [{'item': '30 days', 'postings': 4}, {'item': '14 days', 'postings': 1}])
+        self.assertEqual(report['metric_thresholds'],
+                         {'count': 5, 'min': 5, 'max': 90, 'mean': 22.0})
+        self.assertEqual(report['documents'], 5)
+
+    def test_one_word_requirements_are_counted(self):
+        analytics = CorpusAnalytics()
+        analytics.add_text(posting(["Python", "Haves"]))
+        must_haves = analytics.report()['fields']['must_haves']['most_common']
+        self.assertEqual({e['item'] for e in must_haves}, {'haves', 'python'})
+
+    def test_legacy_heading_fragments_are_dropped(self):
+        legacy = {'must_haves': ["Haves", "Python"], 'nice_to_haves': ["to", "Haves", "Rust"]}
+        self.assertEqual(requirement_bullets(legacy, 'must_haves'), ["Python"])
+        self.assertEqual(requirement_bullets(legacy, 'nice_to_haves'), ["Rust"])
+
+        current = {'must_haves': ["Python", "Haves"], 'nice_to_haves': ["To", "Rust"]}
+        self.assertEqual(requirement_bullets(current, 'must_haves'), ["Python", "Haves"])
+        self.assertEqual(requirement_bullets(current, 'nice_to_haves'), ["To", "Rust"])
+
+    def test_milestone_days(self):
+        self.assertEqual(milestone_days("Day 31-60: Scale"), 30)
+        self.assertEqual(milestone_days("Month 2: Ship"), 60)
+        self.assertEqual(milestone_days("Week 1-2: Ramp"), 14)
+        self.assertIsNone(milestone_days("Day 60-31: Backwards"))
+
+    def test_sources_and_errors(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            jsonl = Path(tmp) / "postings.jsonl"
+            jsonl.write_text(json.dumps({'text': posting(["Go"])}) + "\n{broken\n",
+                             encoding='utf-8')
+            dump = Path(tmp) / "dump.txt"
+            dump.write_text(posting(["Go"]) + "\n=====\n" + posting(["Go", "SQL"]),
+                            encoding='utf-8')
+
+            report = CorpusAnalytics().add_records(iter_jsonl(str(jsonl))).report()
+            self.assertEqual((report['documents'], report['failed']), (1, 1))
+
+            report = CorpusAnalytics().add_records(iter_dump(str(dump))).report()
+            self.assertEqual(report['fields']['must_haves']['most_common'][0],
+                             {'item': 'go', 'postings': 2})
+
+    def test_cli_report(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for i in range(3):
+                (Path(tmp) / f"{i}.txt").write_text(posting(["Python"]), encoding='utf-8')
+            report_path = Path(tmp) / "report.json"
+            cli = Path(__file__).resolve().parent / "cli.py"
+
+            proc = subprocess.run(
+                [sys.executable, str(cli), '--input-dir', tmp, '--analytics', str(report_path)],
+                capture_output=True, text=True)
+
+            self.assertEqual(proc.returncode, 0, proc.stderr)
+            self.assertIn("3 postings", proc.stdout)
+            report = json.loads(report_path.read_text(encoding='utf-8'))
+            self.assertEqual(report['fields']['must_haves']['most_common'][0]['postings'], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
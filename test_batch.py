@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Tests for batch (corpus) mode
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from batch import MANIFEST_NAME, discover_inputs, plan_outputs, run_batch
+
+
+SAMPLE_JOB = """
+Must-Haves
+* Mastery of GenAI and agent frameworks
+
+Success Metrics
+* ≥ 5 production agents live by day 30
+"""
+
+
+class TestBatchMode(unittest.TestCase):
+    """Test cases for batch processing."""
+
+    def setUp(self):
+        """Create an input directory with good and bad documents."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.input_dir = Path(self.tmp.name) / "in"
+        self.output_dir = Path(self.tmp.name) / "out"
+        (self.input_dir / "region").mkdir(parents=True)
+
+        for name in ("a.txt", "b.txt", "region/a.txt"):
+            (self.input_dir / name).write_text(SAMPLE_JOB, encoding='utf-8')
+        (self.input_dir / "broken.txt").write_bytes(b"\xff\xfe not utf-8")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _plan(self, pattern="**/*.txt"):
+        inputs = discover_inputs(str(self.input_dir), pattern)
+        return plan_outputs(inputs, str(self.input_dir), str(self.output_dir))
+
+    def test_discover_respects_glob(self):
+        """Test only files matching the pattern are picked up."""
+        top_level = discover_inputs(str(self.input_dir), "*.txt")
+        recursive = discover_inputs(str(self.input_dir), "**/*.txt")
+
+        self.assertEqual(len(top_level), 3)
+        self.assertEqual(len(recursive), 4)
+
+    def test_plan_gives_each_document_its_own_folder(self):
+        """Test output folders are unique, including on stem collisions."""
+        (self.input_dir / "a.md").write_text(SAMPLE_JOB, encoding='utf-8')
+        plan = self._plan("**/*")
+        outputs = [output for _, output in plan]
+
+        self.assertEqual(len(outputs), len(set(outputs)))
+        self.assertIn(self.output_dir / "a_md", outputs)
+        self.assertIn(self.output_dir / "region" / "a", outputs)
+
+    def test_renamed_folders_do_not_collide_with_other_stems(self):
+        """Test a renamed folder never reuses another input's folder."""
+        for name in ("a.md", "a_txt.md", "a_txt_2.txt"):
+            (self.input_dir / name).write_text(SAMPLE_JOB, encoding='utf-8')
+        plan = self._plan("*")
+        outputs = {path.name: output.name for path, output in plan}
+
+        self.assertEqual(len(set(outputs.values())), len(plan))
+        self.assertEqual(outputs["a_txt.md"], "a_txt")
+        self.assertEqual(outputs["a_txt_2.txt"], "a_txt_2")
+        self.assertEqual(outputs["a.txt"], "a_txt_3")
+        self.assertEqual(outputs["a.md"], "a_md")
+
+    def test_bad_file_does_not_stop_batch(self):
+        """Test failures are recorded in the manifest and others still run."""
+        for jobs in (1, 2):
+            with self.subTest(jobs=jobs):
+                manifest = run_batch(self._plan(), str(self.output_dir), jobs=jobs)
+
+                self.assertEqual(manifest['total'], 4)
+                self.assertEqual(manifest['succeeded'], 3)
+                self.assertEqual(manifest['failed'], 1)
+
+                failed = [d for d in manifest['documents'] if d['status'] == 'error']
+                self.assertTrue(failed[0]['input'].endswith("broken.txt"))
+                self.assertIn("UnicodeDecodeError", failed[0]['error'])
+
+                with open(self.output_dir / MANIFEST_NAME, encoding='utf-8') as f:
+                    self.assertEqual(json.load(f), manifest)
+
+                for doc in manifest['documents']:
+                    if doc['status'] == 'ok':
+                        summary = Path(doc['output_dir']) / "job_summary.md"
+                        self.assertTrue(summary.exists())
+
+    def test_dedup_processes_each_cluster_once(self):
+        """Test duplicates get the representative's results and their differences."""
+        (self.input_dir / "c.txt").write_text(
+            SAMPLE_JOB + "* Based in Limerick, Ireland\n", encoding='utf-8')
+
+        manifest = run_batch(self._plan(), str(self.output_dir), jobs=1, dedup_threshold=0.5)
+
+        self.assertEqual(manifest['total'], 5)
+        self.assertEqual(manifest['succeeded'], 4)
+        self.assertEqual(manifest['duplicates'], 3)
+
+        docs = {Path(d['input']).relative_to(self.input_dir).as_posix(): d
+                for d in manifest['documents']}
+        self.assertNotIn('duplicate_of', docs['a.txt'])
+        self.assertEqual(docs['region/a.txt']['duplicate_of'], docs['a.txt']['input'])
+        self.assertEqual(docs['region/a.txt']['similarity'], 1.0)
+        self.assertEqual(docs['c.txt']['duplicate_of'], docs['a.txt']['input'])
+
+        with open(Path(docs['c.txt']['output_dir']) / "complete_results.json",
+                  encoding='utf-8') as f:
+            results = json.load(f)
+        self.assertEqual(results['differences'],
+                         {'added': ['* Based in Limerick, Ireland'], 'removed': []})
+
+    def test_bundle_replaces_output_folders(self):
+        """Test every document lands in one bundle, duplicates included."""
+        bundle = self.output_dir / "all.json"
+        for jobs in (1, 2):
+            with self.subTest(jobs=jobs):
+                manifest = run_batch(self._plan(), str(self.output_dir), jobs=jobs,
+                                     dedup_threshold=0.5, bundle=str(bundle))
+
+                self.assertEqual(manifest['succeeded'], 3)
+                self.assertEqual(manifest['bundle'], str(bundle))
+                self.assertEqual(sorted(p.name for p in self.output_dir.iterdir()),
+                                 ["all.json", MANIFEST_NAME])
+                with open(bundle, encoding='utf-8') as f:
+                    contents = json.load(f)
+                self.assertEqual(sorted(contents), ['a', 'b', 'region/a'])
+                self.assertEqual(contents['b']['duplicate_of'], str(self.input_dir / "a.txt"))
+                keys = sorted(d['bundle_key'] for d in manifest['documents'])
+                self.assertEqual(keys, ['a', 'b', 'broken', 'region/a'])
+
+
+if __name__ == '__main__':
+    unittest.main()
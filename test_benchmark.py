@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests for the benchmark harness
+"""
+
+import os
+import sys
+import unittest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from benchmark import (
+    compare_results, matching_benchmark, memory_benchmark, percentile, run_benchmarks,
+    serialization_benchmark, synthesize_posting
+)
+from genai_agent import JobDescriptionSummarizer
+
+
+class TestBenchmark(unittest.TestCase):
+    """Test cases for the benchmark harness."""
+
+    def test_synthetic_postings(self):
+        """Test generated postings are deterministic and scale as requested."""
+        self.assertEqual(synthesize_posting('small', 'few'), synthesize_posting('small', 'few'))
+        self.assertNotEqual(synthesize_posting('small', 'few', seed=1),
+                            synthesize_posting('small', 'few'))
+        self.assertGreater(len(synthesize_posting('large', 'few')),
+                           10 * len(synthesize_posting('small', 'few')))
+
+        summarizer = JobDescriptionSummarizer()
+        few = summarizer.extract_key_information(synthesize_posting('small', 'few'))
+        many = summarizer.extract_key_information(synthesize_posting('small', 'many'))
+        for field in ('timeline', 'metrics', 'must_haves', 'nice_to_haves'):
+            self.assertGreater(len(few[field]), 0)
+            self.assertGreater(len(many[field]), len(few[field]))
+
+    def test_percentile(self):
+        """Test interpolated percentiles."""
+        samples = [4.0, 1.0, 3.0, 2.0]
+        self.assertEqual(percentile(samples, 0), 1.0)
+        self.assertEqual(percentile(samples, 50), 2.5)
+        self.assertEqual(percentile(samples, 100), 4.0)
+
+    def test_run_benchmarks(self):
+        """Test the report covers every requested case and stage."""
+        report = run_benchmarks(['small-few'], repeat=2, warmup=0)
+        stages = report['cases']['small-few']['stages']
+
+        for stage in ('extract_key_information', '_extract_section', 'generate_summary',
+                      'save_results', 'run_complete_workflow'):
+            self.assertIn(stage, stages)
+            for key in ('p50_ms', 'p90_ms', 'p99_ms', 'ops_per_sec', 'mb_per_sec',
+                        'peak_memory_bytes'):
+                self.assertGreaterEqual(stages[stage][key], 0)
+
+    def test_memory_benchmark(self):
+        """Test compact results are measured and hold less than dicts."""
+        report = memory_benchmark(count=20)
+        variants = report['variants']
+
+        self.assertEqual(set(variants), {'dict', 'compact', 'compact_with_text'})
+        self.assertLess(variants['compact']['bytes'], variants['dict']['bytes'])
+        self.assertLess(variants['compact']['bytes'], variants['compact_with_text']['bytes'])
+        self.assertEqual(variants['dict']['ratio_to_dict'], 1.0)
+
+    def test_serialization_benchmark(self):
+        """Test every installed encoder is measured against the old output path."""
+        report = serialization_benchmark(count=5, case='small-few', repeat=1)
+        variants = report['variants']
+
+        self.assertIn('before', variants)
+        self.assertIn('json-compact', variants)
+        self.assertIn(f"{report['selected']}-pretty", variants)
+        self.assertLess(variants['json-compact']['bytes'], variants['json-pretty']['bytes'])
+        self.assertEqual(variants['before']['speedup'], 1.0)
+
+    @unittest.skipUnless(numpy is not None, "NumPy is not installed")
+    def test_matching_benchmark(self):
+        """Test vectorized ranking is measured against the per-pair loop."""
+        report = matching_benchmark(candidates=40, postings=5, k=3, loop_candidates=5)
+
+        self.assertEqual((report['candidates'], report['loop']['candidates']), (40, 5))
+        self.assertGreater(report['vectorized']['pairs_per_second'], 0)
+        self.assertGreater(report['speedup'], 1)
+
+    def test_compare_flags_regressions(self):
+        """Test only slowdowns beyond the threshold are reported."""
+        def report(p50):
+            return {'cases': {'small-few': {'stages': {'extract': {'p50_ms': p50}}}}}
+
+        self.assertEqual(compare_results(report(1.0), report(1.05), threshold=0.1), [])
+        self.assertEqual(compare_results(report(1.0), report(0.5), threshold=0.1), [])
+
+        regressions = compare_results(report(1.0), report(1.5), threshold=0.1)
+        self.assertEqual(len(regressions), 1)
+        self.assertAlmostEqual(regressions[0]['change'], 0.5)
+
+        # Tiny absolute changes are noise
+        self.assertEqual(compare_results(report(0.001), report(0.002), threshold=0.1), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
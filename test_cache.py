@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Tests for the content-addressed result cache
+"""
+
+import importlib.util
+import os
+import pickle
+import sys
+import tempfile
+import unittest
+from dataclasses import replace
+from unittest import mock
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import cache as cache_module
+from cache import OUTPUT_MODULES, ResultCache, cache_key
+from genai_agent import EmailGenerator, GenAIAgent
+
+
+SAMPLE_JOB = """
+Day 1-30 — Observe: Ship micro-agents
+Must-Haves
+* Mastery of GenAI and agent frameworks
+
+Success Metrics
+* ≥ 5 production agents live by day 30
+"""
+
+
+class TestResultCache(unittest.TestCase):
+    """Test cases for the result cache."""
+
+    def setUp(self):
+        """Set up a cache in a temporary directory."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ResultCache(self.tmp.name)
+        self.profile = EmailGenerator().vp_voice_profile
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmp.cleanup()
+
+    def test_workflow_hit_skips_recomputation(self):
+        """Test an unchanged posting is served from the cache."""
+        first = GenAIAgent(cache=self.cache).run_complete_workflow(SAMPLE_JOB)
+
+        agent = GenAIAgent(cache=self.cache)
+        session = agent.new_session()
+        with mock.patch.object(agent, 'analyze_job_description') as analyze:
+            second = agent.run_complete_workflow(SAMPLE_JOB, session)
+
+        analyze.assert_not_called()
+        self.assertEqual({**first, 'workflow_completed_at': None},
+                         {**second, 'workflow_completed_at': None})
+        self.assertEqual(session.job_analysis['summary'], first['job_summary'])
+        self.assertEqual(session.job_analysis['processed_at'], second['workflow_completed_at'])
+
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries']), (1, 1, 1))
+
+    def test_hit_reports_its_own_completion_time(self):
+        """Test a cache hit is stamped with the current run, not the cached one."""
+        with mock.patch('genai_agent.datetime') as clock:
+            clock.now.return_value.isoformat.return_value = '2026-01-01T00:00:00'
+            first = GenAIAgent(cache=self.cache).run_complete_workflow(SAMPLE_JOB)
+            clock.now.return_value.isoformat.return_value = '2026-01-02T00:00:00'
+            second = GenAIAgent(cache=self.cache).run_complete_workflow(SAMPLE_JOB)
+
+        self.assertEqual(first['workflow_completed_at'], '2026-01-01T00:00:00')
+        self.assertEqual(second['workflow_completed_at'], '2026-01-02T00:00:00')
+        self.assertEqual(second['extracted_data']['extracted_at'], '2026-01-01T00:00:00')
+
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries']), (1, 1, 1))
+
+    def test_key_depends_on_output_modules(self):
+        """Test editing the default email template invalidates cached results."""
+        self.assertIn('email_templates', OUTPUT_MODULES)
+        find_spec = importlib.util.find_spec
+        edited = os.path.join(self.tmp.name, 'email_templates.py')
+        with open(find_spec('email_templates').origin, encoding='utf-8') as f:
+            source = f.read()
+        with open(edited, 'w', encoding='utf-8') as f:
+            f.write(source.replace("Welcome to the Future", "Welcome to the Present"))
+
+        def edited_spec(name, *args):
+            return mock.Mock(origin=edited) if name == 'email_templates' else find_spec(name, *args)
+
+        with mock.patch.object(cache_module, '_code_version', None):
+            key = cache_key(SAMPLE_JOB, self.profile)
+        with mock.patch.object(cache_module, '_code_version', None), \
+                mock.patch('importlib.util.find_spec', edited_spec):
+            self.assertNotEqual(cache_key(SAMPLE_JOB, self.profile), key)
+
+    def test_key_depends_on_text_and_profile(self):
+        """Test edits to the posting or the voice profile change the key."""
+        key = cache_key(SAMPLE_JOB, self.profile)
+
+        self.assertEqual(key, cache_key(SAMPLE_JOB.replace('\n', '\r\n'), self.profile))
+        self.assertNotEqual(key, cache_key(SAMPLE_JOB + "x", self.profile))
+        self.assertNotEqual(key, cache_key(SAMPLE_JOB, replace(self.profile, name="Other VP")))
+
+    def test_normalized_text_gives_same_output(self):
+        """Test texts sharing a key produce the same workflow output."""
+        agent = GenAIAgent()
+        lf = agent.run_complete_workflow(SAMPLE_JOB)
+        crlf = agent.run_complete_workflow(SAMPLE_JOB.replace('\n', '\r\n'))
+
+        for field in ('job_summary', 'intro_email'):
+            self.assertEqual(lf[field], crlf[field])
+
+    def test_lru_eviction(self):
+        """Test the least recently used entries are evicted first."""
+        self.cache.max_bytes = 300
+        for key in ('a', 'b'):
+            self.cache.put(key, {'payload': 'x' * 100})
+        self.cache.get('a')
+        self.cache.put('c', {'payload': 'x' * 100})
+
+        self.assertIsNotNone(self.cache.get('a'))
+        self.assertIsNone(self.cache.get('b'))
+        self.assertIsNotNone(self.cache.get('c'))
+        self.assertEqual(self.cache.stats()['evictions'], 1)
+
+    def test_pickle_reopens_connection(self):
+        """Test the cache can be handed to worker processes."""
+        self.cache.put('a', {'value': 1})
+        clone = pickle.loads(pickle.dumps(self.cache))
+
+        self.assertEqual(clone.get('a'), {'value': 1})
+        clone.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Tests for memory-mapped processing of posting dumps
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import types
+import unittest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from chunking import find_postings, map_file, process_dump, run_dump
+from genai_agent import GenAIAgent
+
+
+SAMPLE_JOB = """Must-Haves
+* Mastery of GenAI and agent frameworks
+
+Success Metrics
+* ≥ 5 production agents live by day 30
+"""
+
+
+class TestChunking(unittest.TestCase):
+    """Test cases for splitting and processing dumps."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.postings = [SAMPLE_JOB.replace('agent frameworks', f'agent{i} frameworks')
+                         for i in range(5)]
+
+    def write_dump(self, text, name='dump.txt'):
+        path = os.path.join(self.temp_dir, name)
+        with open(path, 'wb') as f:
+            f.write(text.encode('utf-8'))
+        return path
+
+    def test_find_postings(self):
+        """Test postings are split at separator lines and blank ones skipped."""
+        path = self.write_dump("\n=======\n".join(self.postings) + "\n  =====  \n\n")
+
+        with map_file(path) as buf:
+            ranges = find_postings(buf)
+            self.assertIsInstance(ranges, types.GeneratorType)
+            texts = [buf[start:end].decode('utf-8') for start, end in ranges]
+
+        self.assertEqual([text.strip() for text in texts],
+                         [posting.strip() for posting in self.postings])
+
+    def test_separator_on_first_line(self):
+        """Test a dump that starts with a separator line."""
+        for head in ("=====\n", "  =======  \r\n", "=====\n\n=====\n"):
+            path = self.write_dump(head + "\n=====\n".join(self.postings[:2]), 'leading.txt')
+            with map_file(path) as buf:
+                texts = [buf[start:end].decode('utf-8') for start, end in find_postings(buf)]
+
+            self.assertEqual([text.strip() for text in texts],
+                             [posting.strip() for posting in self.postings[:2]])
+            self.assertNotIn("=====", texts[0])
+
+    def test_custom_separator_and_empty_file(self):
+        """Test a user-supplied separator and an empty input."""
+        path = self.write_dump("\f".join(self.postings))
+        with map_file(path) as buf:
+            self.assertEqual(len(list(find_postings(buf, r'\f'))), 5)
+
+        empty = self.write_dump('', 'empty.txt')
+        self.assertEqual(list(process_dump(empty)), [])
+
+    def test_process_dump(self):
+        """Test every posting gets its own result with id and byte range."""
+        path = self.write_dump("\n=====\n".join(self.postings))
+
+        results = list(process_dump(path))
+
+        self.assertEqual([r['id'] for r in results], [f'dump.txt#{i}' for i in range(1, 6)])
+        self.assertEqual(results[0]['offset'], 0)
+        for i, result in enumerate(results):
+            self.assertIn(f'agent{i} frameworks', result['extracted_data']['must_haves'][0])
+            expected = GenAIAgent().run_complete_workflow(self.postings[i])
+            self.assertEqual(result['job_summary'], expected['job_summary'])
+
+    def test_bad_postings_are_reported(self):
+        """Test oversized and undecodable postings become error records."""
+        path = os.path.join(self.temp_dir, 'bad.txt')
+        with open(path, 'wb') as f:
+            f.write(b"\xff\xfe broken\n=====\n" + SAMPLE_JOB.encode('utf-8') + b"\n=====\n" + b"x" * 200)
+
+        results = list(process_dump(path, max_posting_bytes=150))
+
+        self.assertIn('UnicodeDecodeError', results[0]['error'])
+        self.assertNotIn('error', results[1])
+        self.assertIn('limit 150', results[2]['error'])
+
+    def test_worker_processes_match_serial(self):
+        """Test the process pool returns the same results in file order."""
+        path = self.write_dump("\n=====\n".join(self.postings * 20))
+
+        serial = list(process_dump(path, jobs=1))
+        parallel = list(process_dump(path, jobs=2))
+
+        self.assertEqual([r['id'] for r in parallel], [r['id'] for r in serial])
+        self.assertEqual([r['job_summary'] for r in parallel], [r['job_summary'] for r in serial])
+
+    def test_run_dump_writes_jsonl(self):
+        """Test JSONL output and counts."""
+        path = self.write_dump("\n=====\n".join(self.postings[:2]))
+        out_path = os.path.join(self.temp_dir, 'out.jsonl')
+
+        counts = run_dump(path, out_path)
+
+        self.assertEqual(counts, {'succeeded': 2, 'failed': 0})
+        with open(out_path, 'r', encoding='utf-8') as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual([line['id'] for line in lines], ['dump.txt#1', 'dump.txt#2'])
+
+
+if __name__ == '__main__':
+    unittest.main()
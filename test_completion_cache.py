@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Tests for the LLM completion cache, run against a local stub model
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from completion_cache import (
+    CachedBackend, CompletionCache, completion_key, format_stats, normalize_text
+)
+from genai_agent import GenAIAgent, JobDescriptionSummarizer
+from llm_backend import EmailBackend
+
+
+def posting(requirement):
+    return f"""Must-Haves
+* {requirement}
+
+Success Metrics
+* ≥ 5 production agents live by day 30
+"""
+
+
+class StubModel(EmailBackend):
+    """Local model answering with a digest of the last message, counting calls."""
+
+    def __init__(self, model="stub-1", temperature=0.0):
+        self.model = model
+        self.temperature = temperature
+        self.requests = []
+
+    async def complete(self, messages):
+        self.requests.append(messages)
+        return f"[{self.model}] reply to {len(messages[-1]['content'])} chars"
+
+    def signature(self):
+        return f"StubModel:{self.model}:t={self.temperature}"
+
+
+class TestCompletionCache(unittest.TestCase):
+    """Test cases for CompletionCache and CachedBackend."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = CompletionCache(self.tmp.name)
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmp.cleanup()
+
+    def complete(self, backend, text, system="Be brief."):
+        messages = [{'role': 'system', 'content': system}, {'role': 'user', 'content': text}]
+        return asyncio.run(backend.complete(messages))
+
+    def test_repeats_are_served_from_cache(self):
+        model = StubModel()
+        backend = CachedBackend(model, self.cache)
+
+        first = self.complete(backend, "Summarize this posting.")
+        self.assertEqual(self.complete(backend, "Summarize this posting.  \r\n\n"), first)
+        self.assertEqual(len(model.requests), 1)
+
+        stats = backend.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['hit_rate']), (1, 1, 0.5))
+        self.assertGreaterEqual(stats['prompt_tokens_saved'], stats['prompt_tokens_sent'])
+        self.assertGreater(stats['completion_tokens_saved'], 0)
+        self.assertIn("50% hit rate", format_stats(stats))
+
+    def test_model_and_parameters_are_part_of_the_key(self):
+        messages = [{'role': 'user', 'content': "Hi"}]
+        self.assertNotEqual(completion_key(messages, StubModel().signature()),
+                            completion_key(messages, StubModel(temperature=0.7).signature()))
+        self.assertEqual(normalize_text("a  \r\nb\n\n"), "a\nb")
+
+        for model in (StubModel(), StubModel("stub-2"), StubModel(temperature=0.7)):
+            self.complete(CachedBackend(model, self.cache), "Hi")
+            self.assertEqual(len(model.requests), 1)
+        self.assertEqual(self.cache.stats()['entries'], 3)
+
+    def test_sqlite_calls_stay_off_the_event_loop(self):
+        """Test cache lookups and stores run on worker threads, not the loop's."""
+        threads = []
+
+        class RecordingCache(CompletionCache):
+            def get(self, key):
+                threads.append(threading.get_ident())
+                return super().get(key)
+
+            def put(self, key, completion, prompt_tokens=0):
+                threads.append(threading.get_ident())
+                super().put(key, completion, prompt_tokens)
+
+        cache = RecordingCache(self.tmp.name)
+        backend = CachedBackend(StubModel(), cache)
+
+        async def run():
+            messages = [{'role': 'user', 'content': "Hi"}]
+            await backend.complete(messages)
+            await backend.complete(messages)
+            return threading.get_ident()
+
+        loop_thread = asyncio.run(run())
+        self.assertEqual(len(threads), 3)
+        self.assertNotIn(loop_thread, threads)
+        self.assertEqual(cache.stats()['hits'], 1)
+        cache.close()
+
+    def test_expiry_and_eviction(self):
+        cache = CompletionCache(self.tmp.name, ttl=0.05, max_entries=10)
+        model = StubModel()
+        backend = CachedBackend(model, cache)
+
+        self.complete(backend, "Hi")
+        time.sleep(0.1)
+        self.complete(backend, "Hi")
+        self.assertEqual(len(model.requests), 2)
+        self.assertEqual(cache.stats()['expired'], 1)
+
+        cache.ttl = None
+        for i in range(12):
+            self.complete(backend, f"prompt {i}")
+        self.complete(backend, "prompt 11")
+        self.complete(backend, "prompt 0")
+        stats = cache.stats()
+        self.assertLessEqual(stats['entries'], 10)
+        self.assertGreater(stats['evictions'], 0)
+        self.assertEqual(len(model.requests), 2 + 12 + 1)
+        cache.close()
+
+    def test_summaries_share_a_prefix_and_reuse_completions(self):
+        model = StubModel()
+        backend = CachedBackend(model, self.cache)
+        agent = GenAIAgent(summary_backend=backend, email_backend=backend)
+        jobs = [posting("Rust"), posting("Python"), posting("Go")]
+
+        results = [agent.run_complete_workflow(job) for job in jobs]
+        self.assertTrue(results[0]['job_summary'].startswith("[stub-1]"))
+        summary_requests = [r for r in model.requests if 'Job description:' in r[-1]['content']]
+        self.assertEqual(len(summary_requests), 3)
+        self.assertEqual({r[0]['content'] for r in summary_requests},
+                         {JobDescriptionSummarizer().system_prompt()})
+        for request, job in zip(summary_requests, jobs):
+            self.assertTrue(request[-1]['content'].endswith(job))
+
+        sent = len(model.requests)
+        again = [agent.run_complete_workflow(job) for job in jobs]
+        self.assertEqual([(r['job_summary'], r['intro_email']) for r in again],
+                         [(r['job_summary'], r['intro_email']) for r in results])
+        self.assertEqual(len(model.requests), sent)
+
+        stats = backend.stats()
+        self.assertEqual(stats['hit_rate'], 0.5)
+        # Two prefixes in all: the summary framework and the voice's prompt
+        self.assertEqual(stats['prefix_hits'], sent - 2)
+        self.assertGreater(stats['prefix_tokens_reused'], 0)
+
+    def test_agent_signature_includes_summary_backend(self):
+        self.assertEqual(GenAIAgent().signature(), '')
+        self.assertEqual(GenAIAgent(summary_backend=StubModel()).signature(),
+                         ':summary=StubModel:stub-1:t=0.0')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Tests for duplicate and near-duplicate detection
+"""
+
+import os
+import sys
+import unittest
+from unittest import mock
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark import synthesize_posting
+from dedup import (
+    Deduplicator, line_differences, minhash_signature, process_deduplicated,
+    signature_similarity
+)
+from genai_agent import GenAIAgent
+
+
+class TestDeduplicator(unittest.TestCase):
+    """Test cases for fingerprinting and clustering."""
+
+    def setUp(self):
+        """Set up a posting, a regional repost and an unrelated posting."""
+        self.original = synthesize_posting('medium', 'few', seed=1)
+        self.repost = self.original.replace(
+            "Must-Haves\n", "Must-Haves\n* Based in Limerick, Ireland\n")
+        self.other = synthesize_posting('medium', 'few', seed=2)
+
+    def test_signature_similarity(self):
+        """Test small edits keep signatures close and unrelated text far."""
+        original = minhash_signature(self.original)
+
+        self.assertEqual(original, minhash_signature(self.original))
+        self.assertGreater(signature_similarity(original, minhash_signature(self.repost)), 0.9)
+        self.assertLess(signature_similarity(original, minhash_signature(self.other)), 0.2)
+
+    def test_clusters(self):
+        """Test exact and near duplicates join the first posting's cluster."""
+        dedup = Deduplicator(threshold=0.8)
+
+        self.assertFalse(dedup.add('a', self.original).is_duplicate)
+        self.assertFalse(dedup.add('b', self.other).is_duplicate)
+
+        exact = dedup.add('c', self.original.replace('\n', '\r\n'))
+        self.assertEqual((exact.representative, exact.similarity, exact.exact), ('a', 1.0, True))
+
+        near = dedup.add('d', self.repost)
+        self.assertEqual(near.representative, 'a')
+        self.assertFalse(near.exact)
+        self.assertEqual(dedup.clusters, 2)
+
+    def test_short_and_empty_texts(self):
+        """Test postings shorter than one shingle are still fingerprinted."""
+        dedup = Deduplicator()
+        self.assertFalse(dedup.add(1, "Must-Haves").is_duplicate)
+        self.assertFalse(dedup.add(2, "").is_duplicate)
+        self.assertTrue(dedup.add(3, "must-haves").is_duplicate)
+
+    def test_invalid_threshold(self):
+        """Test thresholds outside (0, 1] are rejected."""
+        with self.assertRaises(ValueError):
+            Deduplicator(threshold=0)
+
+    def test_line_differences(self):
+        """Test differences are reported line by line."""
+        self.assertEqual(line_differences(self.original, self.repost),
+                         {'added': ['* Based in Limerick, Ireland'], 'removed': []})
+
+    def test_process_deduplicated_runs_once_per_cluster(self):
+        """Test duplicates reuse the representative's results."""
+        agent = GenAIAgent()
+        items = [('a', self.original), ('b', self.repost), ('c', self.other)]
+
+        with mock.patch.object(agent, 'run_complete_workflow',
+                               wraps=agent.run_complete_workflow) as workflow:
+            results = list(process_deduplicated(items, agent))
+
+        self.assertEqual(workflow.call_count, 2)
+        self.assertEqual([r['id'] for r in results], ['a', 'b', 'c'])
+        self.assertEqual(results[1]['duplicate_of'], 'a')
+        self.assertEqual(results[1]['intro_email'], results[0]['intro_email'])
+        self.assertEqual(results[1]['differences']['added'], ['* Based in Limerick, Ireland'])
+        self.assertNotIn('duplicate_of', results[2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Tests for the precompiled email templates
+"""
+
+import asyncio
+import os
+import sys
+import unittest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from email_templates import INTRO_EMAIL_TEMPLATE, compile_template, email_slots
+from genai_agent import EMAIL_SECTION_PROMPTS, EmailGenerator, GenAIAgent, VoiceProfile
+
+
+EXTRACTED = {
+    'timeline': ["Day 1-30: Observe and automate"],
+    'metrics': ["30% reduction in calendar load"],
+    'must_haves': ["Shipped GenAI products", "Python"],
+    'nice_to_haves': [],
+}
+
+
+class FakeBackend:
+    """Backend answering every section with its name, counting calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def complete(self, messages):
+        self.calls += 1
+        return messages[-1]['content'].split('Section: ')[1].split('\n')[0].upper()
+
+    def signature(self):
+        return 'fake'
+
+
+class TestCompileTemplate(unittest.TestCase):
+    """Test cases for compile_template."""
+
+    def test_static_slots_are_baked_in(self):
+        """Test static values become literal text and only open slots remain."""
+        template = compile_template("{{greeting}}, {{ name }}! {{greeting}}",
+                                    static={'greeting': 'Hello'})
+        self.assertEqual(template.slots, ('name',))
+        self.assertEqual(template.render(name='Ada'), "Hello, Ada! Hello")
+
+    def test_braces_are_literal(self):
+        """Test braces in the source and in values are never interpreted."""
+        template = compile_template("{json: {{value}}} {{fixed}}", static={'fixed': '{{x}}'})
+        self.assertEqual(template.render(value='{0}'), "{json: {0}} {{x}}")
+
+    def test_missing_slots_use_defaults(self):
+        """Test unfilled slots render as their default or empty."""
+        template = compile_template("[{{a}}|{{b}}]", defaults={'a': 'A'})
+        self.assertEqual(template.render(), "[A|]")
+        self.assertEqual(template.render({'b': 'B', 'unused': 1}), "[A|B]")
+
+    def test_render_many(self):
+        """Test shared values apply to every row and rows override them."""
+        template = compile_template("{{greeting}} {{name}}")
+        emails = template.render_many([{'name': 'Ada'}, {'name': 'Bo', 'greeting': 'Hey'}],
+                                      shared={'greeting': 'Hi'})
+        self.assertEqual(emails, ["Hi Ada", "Hey Bo"])
+
+
+class TestEmailSlots(unittest.TestCase):
+    """Test cases for job slot values."""
+
+    def test_slots_from_summary_and_extracted_info(self):
+        slots = email_slots("\n# Coder-in-Residence\n\nDetails", EXTRACTED)
+        self.assertEqual(slots['summary_headline'], "Coder-in-Residence")
+        self.assertEqual(slots['top_requirement'], "Shipped GenAI products")
+        self.assertEqual(slots['requirement_count'], 2)
+        self.assertEqual(slots['first_milestone'], "Day 1-30: Observe and automate")
+        self.assertEqual(slots['key_metric'], "30% reduction in calendar load")
+
+    def test_summary_only(self):
+        self.assertEqual(email_slots("Summary"), {'job_summary': "Summary",
+                                                  'summary_headline': "Summary",
+                                                  'job_highlights': ''})
+
+
+class TestEmailGeneratorTemplates(unittest.TestCase):
+    """Test cases for template rendering in EmailGenerator."""
+
+    def setUp(self):
+        self.generator = EmailGenerator()
+
+    def test_template_compiled_once_per_voice(self):
+        """Test the compiled template is cached per voice and reused."""
+        first = self.generator.compiled_template()
+        self.assertIs(self.generator.compiled_template(), first)
+        self.assertEqual(set(first.slots),
+                         {'job_highlights', 'recipient_name', 'sender_name', 'sender_title'})
+        self.assertIn(self.generator.vp_voice_profile.role, first.render())
+
+    def test_default_template_includes_job_highlights(self):
+        email = self.generator.generate_intro_email("context", extracted_info=EXTRACTED)
+        self.assertIn("\n\nWhat the role looks like:\n"
+                      "- Top requirement: Shipped GenAI products\n"
+                      "- First milestone: Day 1-30: Observe and automate\n"
+                      "- Key metric: 30% reduction in calendar load\n\n", email)
+
+        # Without extracted information the paragraph and its spacing vanish
+        plain = self.generator.generate_intro_email("context")
+        self.assertNotIn("What the role looks like", plain)
+        self.assertNotIn("\n\n\n", plain)
+
+    def test_recipient_personalization(self):
+        email = self.generator.generate_intro_email(
+            "context", recipient={'recipient_name': 'Ada', 'sender_name': 'Sam'})
+        self.assertIn("Dear Ada,", email)
+        self.assertIn("Best regards,\nSam\nVP of Edge AI\n", email)
+
+    def test_bulk_matches_single_rendering(self):
+        """Test bulk rendering gives the same email as rendering one at a time."""
+        recipients = [{'recipient_name': f"Person {i}"} for i in range(50)]
+        emails = self.generator.render_intro_emails("context", recipients,
+                                                    extracted_info=EXTRACTED)
+        self.assertEqual(len(emails), 50)
+        self.assertEqual(emails[7], self.generator.generate_intro_email(
+            "context", extracted_info=EXTRACTED, recipient=recipients[7]))
+        self.assertIn("Dear Person 7,", emails[7])
+
+    def test_custom_template_uses_job_slots(self):
+        template = "{{subject}}\nHi {{recipient_name}}, we need: {{top_requirement}}. {{closing}}"
+        generator = EmailGenerator(template=template)
+        email = generator.generate_intro_email("Summary", extracted_info=EXTRACTED)
+        self.assertIn("Hi Team, we need: Shipped GenAI products.", email)
+        self.assertIn("Let's ship something extraordinary.", email)
+        self.assertNotEqual(generator.signature(), self.generator.signature())
+
+    def test_custom_voice_signs_with_its_name(self):
+        profile = VoiceProfile(name="CTO", role="Chief Technology Officer",
+                               communication_style={}, key_phrases=[], priorities=[],
+                               tone_descriptors=[])
+        email = self.generator.generate_intro_email("context", profile)
+        self.assertIn("As Chief Technology Officer", email)
+        self.assertTrue(email.rstrip().split("\n\nP.S.")[0].endswith("CTO"))
+
+    def test_workflow_fills_job_slots(self):
+        agent = GenAIAgent()
+        agent.email_generator = EmailGenerator(template="Focus: {{first_milestone}}")
+        results = agent.run_complete_workflow(
+            "Timeline\nDay 1-30: Ship the first agents\n\nMust-Haves\n- Python\n")
+        self.assertEqual(results['intro_email'], "Focus: Day 1-30: Ship the first agents")
+
+    def test_backend_sections_requested_once_for_bulk(self):
+        backend = FakeBackend()
+        generator = EmailGenerator(backend=backend)
+        emails = generator.render_intro_emails("context", [{'recipient_name': 'Ada'},
+                                                           {'recipient_name': 'Bo'}])
+        self.assertEqual(backend.calls, len(EMAIL_SECTION_PROMPTS))
+        self.assertIn("Dear Bo,\n\nOPENING", emails[1])
+        self.assertIn("Subject: Welcome", emails[0])
+
+    def test_backend_bulk_render_inside_running_loop(self):
+        generator = EmailGenerator(backend=FakeBackend())
+
+        async def render():
+            return generator.render_intro_emails("context", [{'recipient_name': 'Ada'}])
+
+        self.assertIn("Dear Ada,\n\nOPENING", asyncio.run(render())[0])
+
+    def test_default_template_unchanged(self):
+        self.assertIn("{{recipient_name}}", INTRO_EMAIL_TEMPLATE)
+        email = self.generator.generate_intro_email("context")
+        self.assertIn("Dear Team,", email)
+        self.assertIn("[VP Name]\nVP of Edge AI\n", email)
+
+
+if __name__ == '__main__':
+    unittest.main()
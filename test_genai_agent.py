@@ -6,11 +6,17 @@ Basic tests for GenAI Agent system
 import unittest
 import sys
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from genai_agent import GenAIAgent, JobDescriptionSummarizer, EmailGenerator, VoiceProfile
+from genai_agent import (
+    AgentSession, GenAIAgent, JobDescriptionSummarizer, EmailGenerator, SectionIndex,
+    VoiceProfile
+)
 
 
 class TestGenAIAgent(unittest.TestCase):
@@ -74,6 +80,78 @@ class TestGenAIAgent(unittest.TestCase):
         # Verify content quality
         self.assertGreater(len(results['job_summary']), 100)
         self.assertGreater(len(results['intro_email']), 500)
+    
+    def test_workflow_extracts_once(self):
+        """Test the workflow scans the job text only once."""
+        summarizer = self.agent.summarizer
+        with mock.patch.object(summarizer, 'extract_key_information',
+                               wraps=summarizer.extract_key_information) as extract:
+            self.agent.run_complete_workflow(self.sample_job)
+        
+        self.assertEqual(extract.call_count, 1)
+    
+    def test_workflow_reads_clock_once(self):
+        """Test every timestamp of one run is the same."""
+        session = self.agent.new_session()
+        results = self.agent.run_complete_workflow(self.sample_job, session)
+        
+        self.assertEqual(results['extracted_data']['extracted_at'],
+                         results['workflow_completed_at'])
+        self.assertEqual(session.job_analysis['processed_at'], results['workflow_completed_at'])
+
+
+class TestConcurrentAgent(unittest.TestCase):
+    """Test one shared agent serving many threads."""
+    
+    def setUp(self):
+        """Set up one agent and a distinct posting per request."""
+        self.agent = GenAIAgent()
+        self.jobs = [
+            f"""
+            Must-Haves
+            * Unique requirement {i}
+            
+            Success Metrics
+            * ≥ {i} agents live by day {i}
+            """
+            for i in range(200)
+        ]
+    
+    def test_no_cross_talk_between_threads(self):
+        """Test concurrent workflows only ever see their own posting."""
+        barrier = threading.Barrier(16)
+        
+        def run(i):
+            if i < 16:
+                barrier.wait()
+            session = self.agent.new_session()
+            results = self.agent.run_complete_workflow(self.jobs[i], session)
+            return i, results, session
+        
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            outcomes = list(pool.map(run, range(len(self.jobs))))
+        
+        for i, results, session in outcomes:
+            self.assertIn(f'Unique requirement {i}', results['extracted_data']['must_haves'])
+            self.assertEqual(results['extracted_data']['metrics'], [f'{i}% agents live by day {i}'])
+            self.assertIn(f'{i}% agents live by day {i}', results['job_summary'])
+            self.assertEqual(session.job_analysis['original_text'], self.jobs[i])
+        
+        # Stateless calls leave the shared default session untouched
+        self.assertEqual(self.agent.session_data, {})
+    
+    def test_sessions_are_isolated(self):
+        """Test each session's email context comes from its own analysis."""
+        first, second = AgentSession(), AgentSession()
+        self.agent.process_job_description(self.jobs[1], first)
+        self.agent.process_job_description(self.jobs[2], second)
+        
+        with mock.patch.object(self.agent.email_generator, 'generate_intro_email') as generate:
+            self.agent.generate_vp_intro_email(session=first)
+        
+        generate.assert_called_once_with(first.job_analysis['summary'], None)
+        self.assertIn('Unique requirement 1', first.job_analysis['summary'])
+        self.assertIn('Unique requirement 2', second.job_analysis['summary'])
 
 
 class TestJobDescriptionSummarizer(unittest.TestCase):
@@ -111,6 +189,68 @@ class TestJobDescriptionSummarizer(unittest.TestCase):
         # Should find the ≥ 5 metric
         metrics_found = any('5' in item for item in info['metrics'])
         self.assertTrue(metrics_found)
+    
+    def test_timeline_case_insensitive(self):
+        """Test timeline markers match regardless of case."""
+        info = self.summarizer.extract_key_information(
+            "WEEK 2: kickoff\nmonth 3 - review\nDays 4: not a marker"
+        )
+        
+        self.assertEqual(info['timeline'], ['WEEK 2: kickoff', 'month 3: review'])
+    
+    def test_summary_reuses_extracted_info(self):
+        """Test generate_summary accepts a precomputed extraction."""
+        info = self.summarizer.extract_key_information(self.sample_job)
+        
+        with mock.patch.object(self.summarizer, 'extract_key_information') as extract:
+            summary = self.summarizer.generate_summary(self.sample_job, info)
+        
+        extract.assert_not_called()
+        self.assertEqual(summary, self.summarizer.generate_summary(self.sample_job))
+    
+    def test_sections_in_any_order(self):
+        """Test requirement sections end at the next heading, whatever it is."""
+        job = """
+        Nice-to-Haves
+        * Edge deployment experience
+        
+        Success Metrics
+        * ≥ 5 production agents live by day 30
+        
+        Must-Haves
+        * Python
+        
+        Daily Responsibilities
+        * Ship agents
+        """
+        info = self.summarizer.extract_key_information(job)
+        
+        self.assertEqual(info['must_haves'], ['Python'])
+        self.assertEqual(info['nice_to_haves'], ['Edge deployment experience'])
+
+
+class TestSectionIndex(unittest.TestCase):
+    """Test cases for SectionIndex."""
+    
+    def test_ranges(self):
+        """Test each heading line maps to the text up to the next heading."""
+        text = "Intro\nMission\nShip it.\nWhat You'll Do (First 6 Months)\n* Day 1-30 — Observe\n"
+        index = SectionIndex(text)
+        
+        self.assertEqual(list(index.ranges), ['Mission', "What You'll Do"])
+        self.assertEqual(index.section('Mission'), "Mission\nShip it.\n")
+        self.assertEqual(index.bullets("What You'll Do"), ['Day 1', '30 — Observe'])
+        self.assertIsNone(index.bounds('Benefits'))
+        self.assertEqual(index.section('Benefits'), '')
+    
+    def test_inline_markers(self):
+        """Test names that are not heading lines fall back to a text search."""
+        index = SectionIndex("Must-Haves: * Python * SQL Nice-to-Haves: * Go")
+        
+        self.assertEqual(index.ranges, {})
+        self.assertEqual(index.bullets('Must-Haves', 'Nice-to-Haves'),
+                         ['Python', 'SQL'])
+        self.assertEqual(index.bullets('Nice-to-Haves'), ['Go'])
 
 
 class TestEmailGenerator(unittest.TestCase):
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Tests for incremental re-analysis of edited postings
+"""
+
+import os
+import sys
+import unittest
+from unittest import mock
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from genai_agent import GenAIAgent
+from incremental import PREAMBLE, diff_sections, extract_revision, split_sections
+
+
+POSTING = """Vibe Coder-in-Residence
+
+Mission
+Ship GenAI workflows daily.
+
+What You'll Do
+* Day 1-30 — Observe → Automate: shadow meetings
+* Day 31-60 — Scale → Compose: chain agents
+
+Must-Haves
+* Track record of shipping GenAI products
+* Mastery of agent frameworks
+
+Nice-to-Haves
+* Experience building AI copilots
+
+Success Metrics
+* ≥ 5 production agents live by day 30
+"""
+
+
+def without_timestamps(info):
+    return {key: value for key, value in info.items() if key != 'extracted_at'}
+
+
+class TestIncrementalAnalysis(unittest.TestCase):
+    """Test cases for GenAIAgent.revise_job_description."""
+
+    def setUp(self):
+        self.agent = GenAIAgent()
+        self.session = self.agent.new_session()
+
+    def assertMatchesFullRun(self, results, text):
+        full = self.agent.run_complete_workflow(text)
+        self.assertEqual(results['job_summary'], full['job_summary'])
+        self.assertEqual(results['intro_email'], full['intro_email'])
+        self.assertEqual(without_timestamps(results['extracted_data']),
+                         without_timestamps(full['extracted_data']))
+
+    def test_first_revision_is_analyzed_in_full(self):
+        results = self.agent.revise_job_description(POSTING, self.session)
+
+        changes = results['changes']
+        self.assertEqual(changes['sections']['added'],
+                         [PREAMBLE, "Mission", "What You'll Do", "Must-Haves",
+                          "Nice-to-Haves", "Success Metrics"])
+        self.assertEqual(changes['sections_scanned'], 6)
+        self.assertTrue(changes['email_regenerated'])
+        self.assertMatchesFullRun(results, POSTING)
+        self.assertEqual(self.session.job_analysis['summary'], results['job_summary'])
+
+    def test_edit_rescans_only_changed_section(self):
+        self.agent.revise_job_description(POSTING, self.session)
+        analysis = self.session.job_analysis
+        edited = POSTING.replace("Mastery of agent frameworks", "Mastery of MCP")
+
+        with mock.patch.object(self.agent.summarizer, 'extract_key_information') as full:
+            results = self.agent.revise_job_description(edited, self.session)
+        full.assert_not_called()
+
+        changes = results['changes']
+        self.assertEqual(changes['sections'], {'added': [], 'removed': [],
+                                               'modified': ["Must-Haves"]})
+        self.assertEqual(changes['fields'], ['must_haves'])
+        self.assertEqual(changes['sections_scanned'], 1)
+        self.assertTrue(changes['summary_changed'])
+        self.assertFalse(changes['full_reanalysis'])
+        self.assertIs(self.session.job_analysis, analysis)
+        self.assertMatchesFullRun(results, edited)
+
+    def test_unused_edit_keeps_summary_and_email(self):
+        """Test an edit no extracted field depends on regenerates nothing."""
+        first = self.agent.revise_job_description(POSTING, self.session)
+        edited = POSTING.replace("Ship GenAI workflows daily.", "Ship GenAI workflows hourly.")
+
+        with mock.patch.object(self.agent.email_generator, 'generate_intro_email') as email:
+            results = self.agent.revise_job_description(edited, self.session)
+        email.assert_not_called()
+
+        changes = results['changes']
+        self.assertEqual(changes['sections']['modified'], ["Mission"])
+        self.assertEqual(changes['fields'], [])
+        self.assertFalse(changes['summary_changed'])
+        self.assertFalse(changes['email_regenerated'])
+        self.assertEqual(results['intro_email'], first['intro_email'])
+
+    def test_added_and_removed_sections(self):
+        self.agent.revise_job_description(POSTING, self.session)
+        edited = POSTING.replace("Nice-to-Haves\n* Experience building AI copilots\n\n", "")
+        edited = edited.replace("What You'll Do", "Benefits\n* ≥ 20 % equity refresh\n\nWhat You'll Do")
+
+        results = self.agent.revise_job_description(edited, self.session)
+
+        changes = results['changes']
+        self.assertEqual(changes['sections']['added'], ["Benefits"])
+        self.assertEqual(changes['sections']['removed'], ["Nice-to-Haves"])
+        self.assertEqual(changes['fields'], ['metrics', 'nice_to_haves'])
+        self.assertFalse(changes['full_reanalysis'])
+        self.assertMatchesFullRun(results, edited)
+
+    def test_match_across_sections_falls_back_to_full_extraction(self):
+        """Test a timeline entry running into the next heading is still found."""
+        text = "Intro\nDay 5\nMust-Haves\n* Python\n"
+        fields, state, _ = extract_revision(text)
+        self.assertIsNone(fields)
+
+        results = self.agent.revise_job_description(text, self.session)
+        self.assertTrue(results['changes']['full_reanalysis'])
+        self.assertEqual(results['extracted_data']['timeline'], ["Day 5: Must-Haves"])
+
+    def test_session_reanalyzed_elsewhere_is_diffed_from_its_text(self):
+        self.agent.process_job_description(POSTING, self.session)
+        edited = POSTING.replace("day 30", "day 20")
+
+        results = self.agent.revise_job_description(edited, self.session)
+
+        self.assertEqual(results['changes']['sections']['modified'], ["Success Metrics"])
+        self.assertMatchesFullRun(results, edited)
+
+    def test_repeated_headings_get_distinct_names(self):
+        text = "Mission\nA\nMission\nB\n"
+        self.assertEqual([name for name, _, _ in split_sections(text)],
+                         ["Mission", "Mission (2)"])
+        self.assertEqual(diff_sections({'a': '1', 'b': '2'}, {'b': '3', 'c': '4'}),
+                         {'added': ['c'], 'removed': ['a'], 'modified': ['b']})
+
+
+if __name__ == '__main__':
+    unittest.main()
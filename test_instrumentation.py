@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Tests for per-stage tracing
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from cli import save_results
+from genai_agent import GenAIAgent
+from instrumentation import NULL_TRACER, Tracer
+
+
+SAMPLE_JOB = """
+Vibe Coder-in-Residence (GenAI Tech EA)
+
+What You'll Do (First 6 Months)
+* Day 1-30 — Observe → Automate: Ship micro-agents that cut repeat tasks
+
+Must-Haves
+* Mastery of GenAI and agent frameworks
+
+Success Metrics
+* ≥ 5 production agents live by day 30
+"""
+
+
+class TestTracer(unittest.TestCase):
+    """Test cases for Tracer and NullTracer."""
+
+    def test_spans_record_duration_parent_and_size(self):
+        """Test nested spans are aggregated with their parent stage."""
+        tracer = Tracer()
+        with tracer.span('outer', input_size=10):
+            with tracer.span('inner', input_size=3):
+                pass
+            with tracer.span('inner', input_size=4):
+                pass
+
+        snapshot = tracer.snapshot()
+        self.assertEqual(snapshot['stages']['inner']['count'], 2)
+        self.assertEqual(snapshot['stages']['inner']['input_size_total'], 7)
+        self.assertEqual(snapshot['stages']['outer']['count'], 1)
+        self.assertEqual([(s['stage'], s['parent']) for s in snapshot['spans']],
+                         [('inner', 'outer'), ('inner', 'outer'), ('outer', None)])
+        self.assertGreaterEqual(snapshot['stages']['outer']['total_seconds'],
+                                snapshot['stages']['inner']['total_seconds'])
+
+    def test_errors_are_counted_and_reraised(self):
+        """Test a failing stage is recorded and the exception propagates."""
+        tracer = Tracer()
+        with self.assertRaises(ValueError):
+            with tracer.span('parse'):
+                raise ValueError("bad input")
+
+        self.assertEqual(tracer.snapshot()['stages']['parse']['errors'], 1)
+        self.assertEqual(tracer.spans[-1]['error'], 'ValueError')
+
+    def test_null_tracer_records_nothing_cheaply(self):
+        """Test the default tracer is a shared no-op."""
+        span = NULL_TRACER.span('stage', input_size=1)
+        self.assertIs(span, NULL_TRACER.span('other'))
+
+        started = time.perf_counter()
+        for _ in range(100000):
+            with NULL_TRACER.span('stage', input_size=1):
+                pass
+        # Generous bound: well under a microsecond per span on any machine.
+        self.assertLess(time.perf_counter() - started, 1.0)
+
+    def test_exports(self):
+        """Test JSON and Prometheus exports."""
+        tracer = Tracer()
+        with tracer.span('extract', input_size=42):
+            pass
+        tracer.incr('workflows')
+
+        metrics = tracer.to_prometheus()
+        self.assertIn('genai_stage_duration_seconds_count{stage="extract"} 1', metrics)
+        self.assertIn('genai_stage_input_size_total{stage="extract"} 42', metrics)
+        self.assertIn('genai_workflows_total 1', metrics)
+
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        path = os.path.join(temp_dir, 'trace.json')
+        tracer.export_json(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        self.assertEqual(data['counters'], {'workflows': 1})
+        self.assertEqual(os.listdir(temp_dir), ['trace.json'])
+
+
+class TestAgentTracing(unittest.TestCase):
+    """Test the agent reports each pipeline stage."""
+
+    def test_workflow_stages(self):
+        """Test a workflow and save produce the expected stage tree."""
+        tracer = Tracer()
+        agent = GenAIAgent(tracer=tracer)
+        results = agent.run_complete_workflow(SAMPLE_JOB)
+
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        save_results(results, temp_dir, verbose=False, tracer=tracer)
+
+        spans = {s['stage']: s['parent'] for s in tracer.snapshot()['spans']}
+        self.assertEqual(spans, {
+            'extract': 'analyze',
+            'summary': 'analyze',
+            'analyze': 'workflow',
+            'email': 'workflow',
+            'workflow': None,
+            'save_results': None,
+        })
+        self.assertEqual(tracer.snapshot()['stages']['workflow']['input_size_total'],
+                         len(SAMPLE_JOB))
+        self.assertEqual(tracer.counters, {'workflows': 1, 'files_written': 4})
+
+    def test_untraced_results_unchanged(self):
+        """Test tracing does not change the output."""
+        traced = GenAIAgent(tracer=Tracer()).run_complete_workflow(SAMPLE_JOB)
+        plain = GenAIAgent().run_complete_workflow(SAMPLE_JOB)
+
+        self.assertEqual(traced['job_summary'], plain['job_summary'])
+        self.assertEqual(traced['intro_email'], plain['intro_email'])
+
+
+if __name__ == '__main__':
+    unittest.main()
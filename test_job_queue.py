@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Tests for the priority job queue
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from job_queue import BULK, CANCELLED, DONE, JobCancelled, JobQueue, TokenBucket
+
+
+class RecordingAgent:
+    """Agent taking ``delay`` seconds per posting and recording the order they start in.
+
+    Postings wait for ``gate`` (all of them, or only ``hold`` if given).
+    """
+
+    def __init__(self, delay=0.0, hold=None):
+        self.delay = delay
+        self.hold = hold
+        self.started = []
+        self.gate = threading.Event()
+        self.gate.set()
+        self._lock = threading.Lock()
+
+    def run_complete_workflow(self, job_text):
+        with self._lock:
+            self.started.append(job_text)
+        if self.hold in (None, job_text):
+            self.gate.wait()
+        if job_text == 'broken':
+            raise RuntimeError("bad posting")
+        time.sleep(self.delay)
+        return {'job_text': job_text}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Test cases for TokenBucket."""
+
+    def test_bursts_then_refills_at_rate(self):
+        clock = FakeClock()
+        bucket = TokenBucket(2.0, 3, clock=clock)
+
+        self.assertEqual([bucket.take() for _ in range(3)], [0, 0, 0])
+        self.assertAlmostEqual(bucket.take(), 0.5)
+        clock.now = 0.5
+        self.assertEqual(bucket.take(), 0)
+        clock.now = 100
+        self.assertEqual([bucket.take() for _ in range(4)][:3], [0, 0, 0])
+
+        with self.assertRaises(ValueError):
+            TokenBucket(0)
+
+
+class TestJobQueue(unittest.TestCase):
+    """Test cases for JobQueue."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_single_and_batch_results(self):
+        with JobQueue(RecordingAgent(), workers=2) as jobs:
+            single = jobs.submit("one")
+            batch = jobs.submit(["a", "broken", "c"], priority=BULK)
+
+            self.assertEqual(jobs.result(single, timeout=5), {'job_text': 'one'})
+            results = jobs.result(batch, timeout=5)
+            self.assertEqual(results[0], {'job_text': 'a'})
+            self.assertEqual(results[1], {'error': 'RuntimeError: bad posting'})
+            status = jobs.status(batch)
+            self.assertEqual((status['state'], status['done'], status['total']), (DONE, 3, 3))
+
+    def test_priority_then_submission_order(self):
+        agent = RecordingAgent()
+        agent.gate.clear()
+        with JobQueue(agent, workers=1, reserve=0) as jobs:
+            blocker = jobs.submit("blocker")
+            while not agent.started:
+                time.sleep(0.01)
+            bulk = jobs.submit(["bulk-1", "bulk-2"], priority=BULK)
+            first = jobs.submit("first")
+            second = jobs.submit("second")
+            agent.gate.set()
+            for job_id in (blocker, bulk, first, second):
+                jobs.result(job_id, timeout=5)
+
+        self.assertEqual(agent.started, ["blocker", "first", "second", "bulk-1", "bulk-2"])
+
+    def test_interactive_jobs_do_not_wait_behind_bulk(self):
+        agent = RecordingAgent(delay=0.05)
+        with JobQueue(agent, workers=2, reserve=1) as jobs:
+            bulk = jobs.submit([f"bulk-{i}" for i in range(40)], priority=BULK)
+            time.sleep(0.1)
+
+            latencies = []
+            for i in range(5):
+                started = time.perf_counter()
+                jobs.result(jobs.submit(f"interactive-{i}"), timeout=5)
+                latencies.append(time.perf_counter() - started)
+
+            # The reserved worker is free, so only the posting itself is waited for
+            self.assertLess(max(latencies), 0.5)
+            self.assertLessEqual(jobs.stats()['bulk_running'], 1)
+            jobs.cancel(bulk)
+
+    def test_rate_limited_tenant_is_skipped(self):
+        clock = FakeClock()
+        agent = RecordingAgent()
+        with JobQueue(agent, workers=1, rates={'greedy': (1.0, 1)}, clock=clock) as jobs:
+            greedy = jobs.submit(["g-1", "g-2"], tenant='greedy')
+            other = jobs.submit("other", tenant='polite')
+
+            jobs.result(other, timeout=5)
+            self.assertEqual(agent.started, ["g-1", "other"])
+            self.assertEqual(jobs.status(greedy)['done'], 1)
+
+            clock.now = 1.0
+            self.assertEqual(len(jobs.result(greedy, timeout=5)), 2)
+
+    def test_cancel_and_resume(self):
+        agent = RecordingAgent()
+        agent.gate.clear()
+        with JobQueue(agent, workers=1) as jobs:
+            job_id = jobs.submit(["a", "b", "c"], priority=BULK)
+            while not agent.started:
+                time.sleep(0.01)
+
+            self.assertTrue(jobs.cancel(job_id))
+            self.assertFalse(jobs.cancel(job_id))
+            agent.gate.set()
+            with self.assertRaises(JobCancelled):
+                jobs.result(job_id, timeout=5)
+            jobs.result(jobs.submit("after"), timeout=5)
+            self.assertEqual(agent.started, ["a", "after"])
+            self.assertEqual(jobs.status(job_id)['state'], CANCELLED)
+
+            self.assertTrue(jobs.resume(job_id))
+            self.assertEqual([r['job_text'] for r in jobs.result(job_id, timeout=5)], ["a", "b", "c"])
+            self.assertEqual(agent.started, ["a", "after", "b", "c"])
+
+    def test_cancel_with_every_posting_running_lets_the_job_finish(self):
+        agent = RecordingAgent()
+        agent.gate.clear()
+        with JobQueue(agent, workers=2) as jobs:
+            job_id = jobs.submit(["a", "b"])
+            while len(agent.started) < 2:
+                time.sleep(0.01)
+
+            self.assertFalse(jobs.cancel(job_id))
+            agent.gate.set()
+            self.assertEqual([r['job_text'] for r in jobs.result(job_id, timeout=5)], ["a", "b"])
+            self.assertEqual(jobs.status(job_id)['state'], DONE)
+
+    def test_durable_queue_resumes_after_restart(self):
+        path = os.path.join(self.temp_dir, "jobs.sqlite3")
+        agent = RecordingAgent(hold="b")
+        agent.gate.clear()
+        jobs = JobQueue(agent, workers=1, path=path)
+        done_id = jobs.submit("done")
+        job_id = jobs.submit(["a", "b", "c"], priority=BULK)
+        while "b" not in agent.started:
+            time.sleep(0.01)
+        # Stop with "b" in flight; it finishes and is stored before close returns
+        threading.Timer(0.05, agent.gate.set).start()
+        jobs.close()
+        self.assertEqual(agent.started, ["done", "a", "b"])
+
+        agent = RecordingAgent()
+        with JobQueue(agent, workers=1, path=path) as jobs:
+            self.assertEqual(jobs.result(done_id, timeout=5), {'job_text': 'done'})
+            results = jobs.result(job_id, timeout=5)
+            self.assertEqual([r['job_text'] for r in results], ["a", "b", "c"])
+            self.assertEqual(agent.started, ["c"])
+
+    def test_forget_drops_finished_jobs(self):
+        path = os.path.join(self.temp_dir, "jobs.sqlite3")
+        agent = RecordingAgent()
+        agent.gate.clear()
+        with JobQueue(agent, workers=1, path=path) as jobs:
+            running = jobs.submit("running")
+            kept = jobs.submit("kept")
+            collected = jobs.submit(["a", "b"], priority=BULK)
+            while not agent.started:
+                time.sleep(0.01)
+            self.assertFalse(jobs.forget(running))
+            agent.gate.set()
+
+            self.assertEqual(len(jobs.result(collected, timeout=5, forget=True)), 2)
+            jobs.result(running, timeout=5)
+            self.assertTrue(jobs.forget(running))
+            with self.assertRaises(KeyError):
+                jobs.status(collected)
+            self.assertEqual(jobs.stats()['jobs'], {DONE: 1})
+
+        with JobQueue(RecordingAgent(), workers=1, path=path) as jobs:
+            self.assertEqual(jobs.result(kept, timeout=5), {'job_text': 'kept'})
+            with self.assertRaises(KeyError):
+                jobs.status(running)
+
+    def test_retention_expires_done_jobs(self):
+        path = os.path.join(self.temp_dir, "jobs.sqlite3")
+        with JobQueue(RecordingAgent(), workers=1, path=path) as jobs:
+            old = jobs.submit("old")
+            jobs.result(old, timeout=5)
+
+        time.sleep(0.2)
+        with JobQueue(RecordingAgent(), workers=1, path=path, retention=0.1) as jobs:
+            with self.assertRaises(KeyError):
+                jobs.status(old)
+            first = jobs.submit("first")
+            jobs.result(first, timeout=5)
+            time.sleep(0.2)
+            jobs.result(jobs.submit("second"), timeout=5)
+            with self.assertRaises(KeyError):
+                jobs.status(first)
+            self.assertEqual(jobs.stats()['jobs'], {DONE: 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Tests for the LLM email backend, run against a local stub server
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from genai_agent import EMAIL_SECTION_DEPENDENCIES, EMAIL_SECTION_PROMPTS, EmailGenerator, GenAIAgent
+from llm_backend import ChatCompletionsBackend, LLMBackendError
+
+
+class StubChatServer(ThreadingHTTPServer):
+    """Chat-completions stub that records what it receives."""
+
+    daemon_threads = True
+
+    def __init__(self, delay=0.0, fail_first=0, fail_status=503):
+        super().__init__(('127.0.0.1', 0), StubChatHandler)
+        self.delay = delay
+        self.fail_remaining = fail_first
+        self.fail_status = fail_status
+        self.lock = threading.Lock()
+        self.requests = []
+        self.clients = set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class StubChatHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        server = self.server
+        payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        with server.lock:
+            server.requests.append((self.path, payload))
+            server.clients.add(self.client_address)
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            fail = server.fail_remaining > 0
+            server.fail_remaining -= 1 if fail else 0
+
+        time.sleep(server.delay)
+
+        if fail:
+            status, body = server.fail_status, b'{"error": "busy"}'
+        else:
+            content = payload['messages'][-1]['content']
+            section = (content.split('Section: ')[1].split('\n')[0]
+                       if 'Section: ' in content else 'summary')
+            reply = {'choices': [{'message': {'role': 'assistant',
+                                              'content': f" [{section} from {payload['model']}] "}}]}
+            status, body = 200, json.dumps(reply).encode('utf-8')
+
+        with server.lock:
+            server.in_flight -= 1
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class TestChatCompletionsBackend(unittest.TestCase):
+    """Test cases for the chat-completions backend."""
+
+    def start_server(self, **kwargs):
+        server = StubChatServer(**kwargs)
+        thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server
+
+    def test_sections_generated_concurrently(self):
+        """Test independent sections are requested at once with the voice context."""
+        server = self.start_server(delay=0.2)
+        backend = ChatCompletionsBackend(server.url, model="stub-model")
+        generator = EmailGenerator(backend=backend)
+
+        started = time.perf_counter()
+        email = generator.generate_intro_email("Summary of the role")
+        elapsed = time.perf_counter() - started
+
+        self.assertLess(elapsed, 0.2 * len(EMAIL_SECTION_PROMPTS) * 0.6)
+        self.assertEqual(server.max_in_flight,
+                         len(EMAIL_SECTION_PROMPTS) - len(EMAIL_SECTION_DEPENDENCIES))
+        for section in EMAIL_SECTION_PROMPTS:
+            self.assertIn(f"[{section} from stub-model]", email)
+        self.assertTrue(email.startswith("Subject:"))
+
+        path, payload = server.requests[0]
+        self.assertEqual(path, '/v1/chat/completions')
+        self.assertIn(generator.vp_voice_profile.to_prompt_context(),
+                      payload['messages'][0]['content'])
+        self.assertIn("Summary of the role", payload['messages'][1]['content'])
+
+    def test_concurrency_limit_and_pooling(self):
+        """Test in-flight requests are capped and connections are reused."""
+        server = self.start_server(delay=0.05)
+        backend = ChatCompletionsBackend(server.url, model="stub-model", max_concurrency=2)
+        generator = EmailGenerator(backend=backend)
+
+        async def run():
+            emails = await asyncio.gather(*(
+                generator.agenerate_intro_email(f"context {i}") for i in range(4)
+            ))
+            await backend.aclose()
+            return emails
+
+        emails = asyncio.run(run())
+
+        self.assertEqual(len(emails), 4)
+        self.assertEqual(len(server.requests), 4 * len(EMAIL_SECTION_PROMPTS))
+        self.assertLessEqual(server.max_in_flight, 2)
+        self.assertLessEqual(backend.connections_opened, 2)
+        self.assertLessEqual(len(server.clients), 2)
+
+    def test_sync_calls_reuse_connections(self):
+        """Test sync calls share one loop, so keep-alive connections outlive a call."""
+        server = self.start_server()
+        backend = ChatCompletionsBackend(server.url, model="stub-model", max_concurrency=1)
+        generator = EmailGenerator(backend=backend)
+
+        generator.generate_intro_email("first")
+        generator.generate_intro_email("second")
+
+        self.assertEqual(len(server.requests), 2 * len(EMAIL_SECTION_PROMPTS))
+        self.assertEqual(backend.connections_opened, 1)
+        self.assertEqual(len(server.clients), 1)
+
+        backend.close()
+        generator.generate_intro_email("third")
+        self.assertEqual(backend.connections_opened, 2)
+        backend.close()
+
+    def test_sync_call_inside_running_loop(self):
+        """Test the sync API works from code already running an event loop."""
+        server = self.start_server()
+        generator = EmailGenerator(backend=ChatCompletionsBackend(server.url, model="stub-model"))
+
+        async def run():
+            return generator.generate_intro_email("context")
+
+        self.assertIn("[opening from stub-model]", asyncio.run(run()))
+
+    def test_waiting_for_a_slot_does_not_count_toward_timeout(self):
+        """Test requests queued behind the concurrency limit are not timed out."""
+        server = self.start_server(delay=0.1)
+        backend = ChatCompletionsBackend(server.url, model="stub-model", max_concurrency=1,
+                                         timeout=0.25, max_retries=0)
+
+        EmailGenerator(backend=backend).generate_intro_email("context")
+
+        # Four sections queue for one slot: the last waits ~0.3 s, longer than the timeout
+        self.assertEqual(backend.retries, 0)
+        self.assertEqual(backend.requests_sent, len(EMAIL_SECTION_PROMPTS))
+        backend.close()
+
+    def test_retry_with_backoff(self):
+        """Test transient errors are retried until a request succeeds."""
+        server = self.start_server(fail_first=2)
+        backend = ChatCompletionsBackend(server.url, model="stub-model",
+                                         max_concurrency=1, backoff=0.01)
+
+        email = EmailGenerator(backend=backend).generate_intro_email("context")
+
+        self.assertIn("[opening from stub-model]", email)
+        self.assertEqual(backend.retries, 2)
+        self.assertEqual(backend.requests_sent, len(EMAIL_SECTION_PROMPTS) + 2)
+
+    def test_gives_up_after_retries(self):
+        """Test persistent failures surface as LLMBackendError."""
+        server = self.start_server(fail_first=100)
+        backend = ChatCompletionsBackend(server.url, model="stub-model",
+                                         max_retries=1, backoff=0.01)
+
+        with self.assertRaises(LLMBackendError):
+            EmailGenerator(backend=backend).generate_intro_email("context")
+
+    def test_client_errors_are_not_retried(self):
+        """Test 4xx responses fail immediately."""
+        server = self.start_server(fail_first=100, fail_status=401)
+        backend = ChatCompletionsBackend(server.url, model="stub-model", max_concurrency=1)
+
+        with self.assertRaises(LLMBackendError):
+            EmailGenerator(backend=backend).generate_intro_email("context")
+        self.assertEqual(backend.retries, 0)
+
+    def test_agent_uses_backend(self):
+        """Test the agent workflow routes email generation through the backend."""
+        server = self.start_server()
+        agent = GenAIAgent(email_backend=ChatCompletionsBackend(server.url, model="stub-model"))
+
+        results = agent.run_complete_workflow("Must-Haves\n* Python\n")
+
+        self.assertIn("[closing from stub-model]", results['intro_email'])
+
+    def test_summary_and_email_share_one_pool(self):
+        """Test a workflow with both backends reuses connections, even inside a running loop."""
+        server = self.start_server()
+        backend = ChatCompletionsBackend(server.url, model="stub-model", max_concurrency=1)
+        agent = GenAIAgent(summary_backend=backend, email_backend=backend)
+
+        async def run():
+            return agent.run_complete_workflow("Must-Haves\n* Python\n")
+
+        results = asyncio.run(run())
+        agent.run_complete_workflow("Must-Haves\n* Rust\n")
+
+        self.assertEqual(results['job_summary'], "[summary from stub-model]")
+        self.assertEqual(len(server.requests), 2 * (1 + len(EMAIL_SECTION_PROMPTS)))
+        self.assertEqual(backend.connections_opened, 1)
+        backend.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tests for vectorized requirement matching
+"""
+
+import os
+import sys
+import unittest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from genai_agent import JobDescriptionSummarizer
+
+
+def posting(must_haves, nice_to_haves=()):
+    text = "Must-Haves\n" + "".join(f"* {line}\n" for line in must_haves)
+    if nice_to_haves:
+        text += "\nNice-to-Haves\n" + "".join(f"* {line}\n" for line in nice_to_haves)
+    return JobDescriptionSummarizer().extract_key_information(text + "\nSuccess Metrics\n")
+
+
+POSTINGS = {
+    'rust': posting(["Rust systems programming", "Distributed storage engines"]),
+    'genai': posting(["Mastery of LangChain and agent frameworks", "Shipping GenAI products"],
+                     ["Training large language models"]),
+    'empty': posting([]),
+}
+
+CANDIDATES = [
+    ('ana', "Five years of Rust systems programming on distributed storage engines."),
+    ('ben', "Built agent frameworks with LangChain; shipping GenAI products weekly."),
+    ('cy', "Training large language models."),
+    ('dee', "Pastry chef."),
+]
+
+
+@unittest.skipUnless(np is not None, "NumPy is not installed")
+class TestRequirementMatcher(unittest.TestCase):
+    """Test cases for HashedTfidf and RequirementMatcher."""
+
+    @classmethod
+    def setUpClass(cls):
+        from matching import RequirementMatcher
+        cls.matcher = RequirementMatcher(POSTINGS.items())
+
+    def test_vectors_are_unit_length(self):
+        from matching import HashedTfidf
+        vectorizer = HashedTfidf(dim=64).fit(["a b", "a c"])
+        vectors = vectorizer.transform(["a b a", "", "c"])
+
+        self.assertEqual(vectors.shape, (3, 64))
+        np.testing.assert_allclose(np.linalg.norm(vectors, axis=1), [1, 0, 1], rtol=1e-6)
+        self.assertLess(vectorizer.idf[vectorizer.features("a")[0]],
+                        vectorizer.idf[vectorizer.features("b")[0]])
+
+    def test_top_matches_rank_candidates_per_posting(self):
+        best = self.matcher.top_matches(CANDIDATES, k=2, chunk_size=3)
+
+        self.assertEqual(len(best['rust']), 2)
+        self.assertEqual(best['rust'][0][0], 'ana')
+        self.assertEqual(best['genai'][0][0], 'ben')
+        self.assertGreater(best['rust'][0][1], 0.3)
+        # cy repeats the nice-to-have exactly, which carries 1/5 of the weight
+        self.assertAlmostEqual(best['genai'][1][1], 0.2, places=5)
+        self.assertEqual([score for _, score in best['empty']], [0.0, 0.0])
+
+        everyone = self.matcher.top_matches(CANDIDATES, k=10)
+        self.assertEqual(len(everyone['genai']), len(CANDIDATES))
+        self.assertEqual(everyone['genai'][-1], ('dee', 0.0))
+
+    def test_scores_are_weighted_mean_similarity(self):
+        """Test the batched scores match a per-requirement computation."""
+        scores = self.matcher.score([text for _, text in CANDIDATES])
+        self.assertEqual(scores.shape, (len(CANDIDATES), len(POSTINGS)))
+
+        column = self.matcher.keys.index('genai')
+        weights = self.matcher.requirements[column]
+        self.assertEqual(weights['training large language models'], 0.2)
+        self.assertNotIn('haves', weights)
+        for row, (_, text) in enumerate(CANDIDATES):
+            expected = sum(weights[line] * similarity
+                           for line, similarity in self.matcher.explain(text, 'genai'))
+            self.assertAlmostEqual(float(scores[row, column]), expected, places=5)
+
+
+if __name__ == '__main__':
+    unittest.main()
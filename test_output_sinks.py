@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Tests for the output sinks
+"""
+
+import gzip
+import json
+import os
+import sys
+import tarfile
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+from unittest import mock
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from genai_agent import GenAIAgent
+from output_sinks import (
+    BundleSink, DirectorySink, bundle_format, complete_results_json, is_bundle_path,
+    open_sink, render_files
+)
+from serialization import dumps_str
+
+
+SAMPLE_JOB = """
+Must-Haves
+* Mastery of GenAI and agent frameworks
+
+Success Metrics
+* ≥ 5 production agents live by day 30
+"""
+
+
+class TestOutputSinks(unittest.TestCase):
+    """Test cases for directory and bundle sinks."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.results = GenAIAgent().run_complete_workflow(SAMPLE_JOB)
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_complete_results_match_json_dump(self):
+        """Test reusing the rendered extracted data gives the encoder's exact output."""
+        results = dict(self.results, differences={'added': ['a\nb'], 'removed': []})
+        for pretty in (False, True):
+            with self.subTest(pretty=pretty):
+                extracted = dumps_str(results['extracted_data'], pretty)
+                self.assertEqual(complete_results_json(results, extracted, pretty),
+                                 dumps_str(results, pretty))
+        self.assertEqual(complete_results_json({}), "{}")
+
+    def test_pretty_output(self):
+        compact = DirectorySink(self.root / "compact").write("", self.results)
+        pretty = DirectorySink(self.root / "pretty", pretty=True).write("", self.results)
+
+        self.assertNotIn("\n", compact['complete_results.json'].read_text(encoding='utf-8'))
+        text = pretty['complete_results.json'].read_text(encoding='utf-8')
+        self.assertTrue(text.startswith('{\n  "job_summary": '))
+        self.assertEqual(json.loads(text), self.results)
+
+        path = self.root / "pretty.json"
+        with open_sink(path, pretty=True) as sink:
+            sink.write("a", self.results)
+        self.assertEqual(json.loads(path.read_text(encoding='utf-8')), {'a': self.results})
+
+    def test_directory_sink_keeps_classic_layout(self):
+        paths = DirectorySink(self.root).write("posting", self.results)
+
+        self.assertEqual(sorted(p.name for p in (self.root / "posting").iterdir()),
+                         sorted(paths))
+        with open(paths['complete_results.json'], encoding='utf-8') as f:
+            self.assertEqual(json.load(f), self.results)
+        summary = paths['job_summary.md'].read_text(encoding='utf-8')
+        self.assertTrue(summary.startswith("# Job Description Summary\n\n"))
+
+    def test_bundle_formats(self):
+        self.assertEqual(bundle_format("a.json"), ('json', None))
+        self.assertEqual(bundle_format("a.tar.gz"), ('tar', 'gzip'))
+        self.assertEqual(bundle_format("a.tgz"), ('tar', 'gzip'))
+        self.assertEqual(bundle_format("a.json.zst"), ('json', 'zstd'))
+        for bad in ("results", "a.txt", "a.zip.gz"):
+            with self.subTest(path=bad):
+                self.assertFalse(is_bundle_path(bad))
+        self.assertIsInstance(open_sink(self.root / "out"), DirectorySink)
+
+    def test_json_bundle(self):
+        for name, opener in (("all.json", open), ("all.json.gz", gzip.open)):
+            with self.subTest(bundle=name):
+                path = self.root / name
+                with open_sink(path) as sink:
+                    sink.write("a", self.results)
+                    sink.write("b/c", self.results)
+                with opener(path, 'rt', encoding='utf-8') as f:
+                    self.assertEqual(json.load(f), {'a': self.results, 'b/c': self.results})
+
+        with BundleSink(self.root / "empty.json"):
+            pass
+        self.assertEqual(json.loads((self.root / "empty.json").read_text()), {})
+
+    def test_archive_bundles_hold_classic_layout(self):
+        expected = render_files(self.results)
+        for name in ("all.tar", "all.tar.gz", "all.zip"):
+            with self.subTest(bundle=name):
+                path = self.root / name
+                with open_sink(path) as sink:
+                    sink.write("x/posting", self.results)
+
+                if name.endswith(".zip"):
+                    with zipfile.ZipFile(path) as archive:
+                        files = {n: archive.read(n).decode() for n in archive.namelist()}
+                else:
+                    with tarfile.open(path) as archive:
+                        files = {m.name: archive.extractfile(m).read().decode()
+                                 for m in archive.getmembers()}
+                self.assertEqual(files, {f"x/posting/{n}": t for n, t in expected.items()})
+
+    def test_bundle_appears_only_when_complete(self):
+        """Test a bundle is invisible until closed and discarded on error."""
+        path = self.root / "all.tar.gz"
+        path.write_text("previous")
+
+        sink = BundleSink(path)
+        sink.write("a", self.results)
+        self.assertEqual(path.read_text(), "previous")
+        sink.close()
+        self.assertNotEqual(path.read_bytes(), b"previous")
+
+        path.write_text("previous")
+        with self.assertRaises(RuntimeError):
+            with BundleSink(path) as sink:
+                sink.write("a", self.results)
+                raise RuntimeError("boom")
+        self.assertEqual(path.read_text(), "previous")
+        self.assertEqual([p.name for p in self.root.iterdir()], ["all.tar.gz"])
+
+    def test_missing_zstandard_is_reported(self):
+        with mock.patch.dict(sys.modules, {'zstandard': None}):
+            with self.assertRaisesRegex(ValueError, "zstandard"):
+                BundleSink(self.root / "all.tar.zst")
+        self.assertEqual(list(self.root.iterdir()), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
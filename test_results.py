@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Tests for the compact result types
+"""
+
+import dataclasses
+import json
+import os
+import sys
+import unittest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from genai_agent import GenAIAgent, JobDescriptionSummarizer
+from results import ExtractedInfo, JobAnalysis, WorkflowResult
+
+
+JOB = """Must-Haves
+* Track record of shipping GenAI products
+
+Success Metrics
+* ≥ 5 production agents live by day 30
+"""
+
+
+class TestResultTypes(unittest.TestCase):
+    """Test cases for ExtractedInfo, JobAnalysis and WorkflowResult."""
+
+    def setUp(self):
+        self.agent = GenAIAgent()
+
+    def test_round_trip_is_lossless(self):
+        analysis = self.agent.analyze_job_description(JOB)
+        results = self.agent.run_complete_workflow(JOB)
+
+        self.assertEqual(JobAnalysis.from_dict(analysis).to_dict(), analysis)
+        self.assertEqual(WorkflowResult.from_dict(results).to_dict(), results)
+        json.dumps(JobAnalysis.from_dict(analysis).to_dict())
+
+    def test_original_text_is_opt_in(self):
+        compact = self.agent.analyze(JOB)
+        self.assertIsNone(compact.original_text)
+        self.assertNotIn('original_text', compact.to_dict())
+        self.assertEqual(self.agent.analyze(JOB, keep_text=True).original_text, JOB)
+
+    def test_frozen_and_slotted(self):
+        info = self.agent.analyze(JOB).extracted_info
+        self.assertIsInstance(info, ExtractedInfo)
+        self.assertIsInstance(info.must_haves, tuple)
+        self.assertFalse(hasattr(info, '__dict__'))
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            info.metrics = ()
+
+    def test_item_access(self):
+        """Test dict-style reads work so existing consumers accept the types."""
+        analysis = self.agent.analyze(JOB)
+        self.assertEqual(analysis['summary'], analysis.summary)
+        self.assertIn('must_haves', analysis.extracted_info)
+        self.assertIsNone(analysis.get('missing'))
+        with self.assertRaises(KeyError):
+            analysis['missing']
+
+        summarizer = JobDescriptionSummarizer()
+        self.assertEqual(summarizer.generate_summary(JOB, analysis.extracted_info),
+                         analysis.summary)
+
+    def test_workflow_extra_keys_rejected(self):
+        results = dict(self.agent.run_complete_workflow(JOB), duplicate_of='a.txt')
+        with self.assertRaisesRegex(ValueError, "duplicate_of"):
+            WorkflowResult.from_dict(results)
+
+    def test_compact_session(self):
+        session = self.agent.new_session()
+        analysis = self.agent.process_job_description(JOB, session, compact=True)
+
+        self.assertIs(session.job_analysis, analysis)
+        self.assertIsNone(analysis.original_text)
+        email = self.agent.generate_vp_intro_email(session=session)
+        self.assertIn("Subject:", email)
+
+
+if __name__ == '__main__':
+    unittest.main()
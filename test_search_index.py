@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Tests for the search index over results
+"""
+
+import os
+import pickle
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from batch import run_batch
+from cli import save_results
+from genai_agent import GenAIAgent
+from search_index import ResultIndex, phrase
+
+
+def posting(requirement, threshold):
+    return f"""Must-Haves
+* {requirement}
+
+Success Metrics
+* ≥ {threshold}% production agents live by day 30
+"""
+
+
+class TestResultIndex(unittest.TestCase):
+    """Test cases for ResultIndex."""
+
+    @classmethod
+    def setUpClass(cls):
+        agent = GenAIAgent()
+        cls.results = {
+            'langchain-high': agent.run_complete_workflow(posting("Mastery of LangChain", 40)),
+            'langchain-low': agent.run_complete_workflow(posting("Mastery of LangChain", 10)),
+            'rust': agent.run_complete_workflow(posting("Rust systems experience", 80)),
+        }
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.index = ResultIndex(str(self.root / "index.db"))
+        self.index.write_many(self.results.items())
+
+    def tearDown(self):
+        self.index.close()
+        self.tmp.cleanup()
+
+    def keys(self, **kwargs):
+        return sorted(hit['key'] for hit in self.index.search(**kwargs))
+
+    def test_requirement_and_metric_filters(self):
+        self.assertEqual(self.keys(requires="langchain"), ['langchain-high', 'langchain-low'])
+        self.assertEqual(self.keys(requires="LangChain", min_metric=30), ['langchain-high'])
+        self.assertEqual(self.keys(min_metric=50), ['rust'])
+        self.assertEqual(self.keys(query="rust OR langchain", min_metric=80), ['rust'])
+        self.assertEqual(len(self.keys()), 3)
+
+        hit = self.index.search(requires="rust")[0]
+        self.assertEqual(hit['metrics'], self.results['rust']['extracted_data']['metrics'])
+        self.assertEqual(self.index.get('rust'), self.results['rust'])
+
+    def test_rewriting_a_key_updates_in_place(self):
+        self.index.write('rust', self.results['langchain-low'])
+
+        self.assertEqual(self.index.count(), 3)
+        self.assertEqual(self.keys(requires="rust"), [])
+        self.assertEqual(self.keys(requires="langchain"),
+                         ['langchain-high', 'langchain-low', 'rust'])
+        self.assertEqual(self.keys(min_metric=50), [])
+
+        self.assertTrue(self.index.remove('rust'))
+        self.assertFalse(self.index.remove('rust'))
+        self.assertEqual(self.keys(requires="langchain"), ['langchain-high', 'langchain-low'])
+
+    def test_pickle_reopens_connection(self):
+        """Test the index can be handed to worker processes."""
+        clone = pickle.loads(pickle.dumps(self.index))
+        self.assertEqual(clone.get('rust'), self.results['rust'])
+        clone.close()
+
+    def test_bad_query_raises_value_error(self):
+        with self.assertRaisesRegex(ValueError, "Invalid search query"):
+            self.index.search("AND (")
+        self.assertEqual(phrase('say "hi"'), '"say ""hi"""')
+
+    def test_stream_and_existing_outputs(self):
+        records = [{'id': 7, **self.results['rust']}, {'id': 8, 'error': "ValueError: bad"}]
+        index = ResultIndex(str(self.root / "stream.db"))
+        self.assertEqual(list(index.index_stream(iter(records))), records)
+        self.assertEqual([hit['key'] for hit in index.search(requires="rust")], ['7'])
+
+        for key, results in self.results.items():
+            save_results(results, str(self.root / "out" / key), verbose=False)
+        index = ResultIndex(str(self.root / "outputs.db"))
+        self.assertEqual(index.index_outputs(str(self.root / "out")), 3)
+        self.assertEqual(sorted(hit['key'] for hit in index.search(min_metric=30)),
+                         ['langchain-high', 'rust'])
+
+    def test_batch_fills_index(self):
+        inputs = self.root / "in"
+        inputs.mkdir()
+        tasks = []
+        for name, threshold in (("a", 40), ("b", 10)):
+            (inputs / f"{name}.txt").write_text(posting("LangChain", threshold), encoding='utf-8')
+            tasks.append((inputs / f"{name}.txt", self.root / "out" / name))
+        index = ResultIndex(str(self.root / "batch.db"))
+
+        manifest = run_batch(tasks, str(self.root / "out"), jobs=1, index=index)
+
+        self.assertEqual(manifest['failed'], 0)
+        self.assertEqual([hit['key'] for hit in index.search(requires="langchain",
+                                                             min_metric=30)], ['a'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Tests for the JSON encoding layer
+"""
+
+import json
+import os
+import sys
+import unittest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import serialization
+from genai_agent import GenAIAgent
+from serialization import dumps, dumps_str, get_encoder, loads
+
+
+JOB = """Must-Haves
+* Track record of shipping GenAI products
+
+Success Metrics
+* ≥ 5 production agents live by day 30
+"""
+
+
+def installed_encoders():
+    encoders = []
+    for name in serialization.PREFERENCE:
+        try:
+            encoders.append(get_encoder(name))
+        except ImportError:
+            pass
+    return encoders
+
+
+class TestSerialization(unittest.TestCase):
+    """Test cases for dumps/loads and the encoder selection."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.results = GenAIAgent().run_complete_workflow(JOB)
+
+    def tearDown(self):
+        serialization.set_encoder(os.environ.get(serialization.ENCODER_ENV) or None)
+
+    def test_encoders_agree(self):
+        """Test every installed encoder gives the same data and layout."""
+        for encoder in installed_encoders():
+            with self.subTest(encoder=encoder.name):
+                compact = encoder.dumps(self.results)
+                self.assertIsInstance(compact, bytes)
+                self.assertEqual(compact.decode('utf-8'),
+                                 json.dumps(self.results, ensure_ascii=False,
+                                            separators=(',', ':')))
+                pretty = encoder.dumps(self.results, pretty=True).decode('utf-8')
+                self.assertEqual(pretty, json.dumps(self.results, indent=2, ensure_ascii=False))
+                self.assertEqual(encoder.loads(compact), self.results)
+
+    def test_compact_by_default(self):
+        self.assertNotIn(b"\n", dumps(self.results))
+        self.assertIn("—", dumps_str(self.results))
+        self.assertTrue(dumps_str({'a': [1]}, pretty=True).startswith('{\n  "a": [\n'))
+
+    def test_result_types_encode_through_to_dict(self):
+        analysis = GenAIAgent().analyze(JOB)
+        for encoder in installed_encoders():
+            with self.subTest(encoder=encoder.name):
+                self.assertEqual(loads(encoder.dumps(analysis)), analysis.to_dict())
+                with self.assertRaises(TypeError):
+                    encoder.dumps(object())
+
+    def test_invalid_input_raises_value_error(self):
+        for encoder in installed_encoders():
+            with self.subTest(encoder=encoder.name):
+                with self.assertRaises(ValueError):
+                    encoder.loads(b"{not json")
+
+    def test_encoder_selection(self):
+        self.assertEqual(serialization.set_encoder('json').name, 'json')
+        self.assertEqual(dumps({'a': 'é'}), '{"a":"é"}'.encode('utf-8'))
+        self.assertEqual(serialization.set_encoder().name, installed_encoders()[0].name)
+        with self.assertRaisesRegex(ValueError, "Unknown JSON encoder"):
+            get_encoder('pickle')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Tests for the HTTP service, run entirely on localhost
+"""
+
+import json
+import os
+import sys
+import threading
+import unittest
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from service import AgentHTTPServer, MicroBatcher
+
+
+SAMPLE_JOB = """
+Must-Haves
+* Mastery of GenAI and agent frameworks
+
+Success Metrics
+* ≥ 5 production agents live by day 30
+"""
+
+
+class SectionBackend:
+    """Backend answering every email section with its name."""
+
+    async def complete(self, messages):
+        return messages[-1]['content'].split('Section: ')[1].split('\n')[0].upper()
+
+    def signature(self):
+        return 'sections'
+
+
+class ServiceTestCase(unittest.TestCase):
+    """Start a service on an ephemeral localhost port."""
+
+    workers = 0
+    max_wait_ms = 50.0
+    agent_options = None
+
+    def setUp(self):
+        self.server = AgentHTTPServer('127.0.0.1', 0, workers=self.workers,
+                                      max_batch=8, max_wait_ms=self.max_wait_ms,
+                                      agent_options=self.agent_options)
+        thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+    def request(self, path, payload=None):
+        data = None if payload is None else json.dumps(payload).encode('utf-8')
+        req = urllib.request.Request(self.server.url + path, data=data)
+        try:
+            with urllib.request.urlopen(req, timeout=30) as response:
+                return response.status, response.read().decode('utf-8')
+        except urllib.error.HTTPError as e:
+            return e.code, e.read().decode('utf-8')
+
+    def request_json(self, path, payload=None):
+        status, body = self.request(path, payload)
+        return status, json.loads(body)
+
+
+class TestAgentService(ServiceTestCase):
+    """Test cases for endpoints, batching and metrics."""
+
+    def test_workflow(self):
+        """Test the complete workflow endpoint."""
+        status, result = self.request_json('/workflow', {'job_text': SAMPLE_JOB})
+
+        self.assertEqual(status, 200)
+        self.assertIn('Success Metrics', result['job_summary'])
+        self.assertIn('Subject:', result['intro_email'])
+        self.assertEqual(result['extracted_data']['metrics'], ['5% production agents live by day 30'])
+
+    def test_analyze_and_email(self):
+        """Test the analysis and email endpoints."""
+        status, analysis = self.request_json('/analyze', {'job_text': SAMPLE_JOB})
+        self.assertEqual(status, 200)
+        self.assertEqual(analysis['original_text'], SAMPLE_JOB)
+
+        status, email = self.request_json('/email', {'job_context': analysis['summary']})
+        self.assertEqual(status, 200)
+        self.assertIn('Dear Team,', email['intro_email'])
+
+    def test_bad_requests(self):
+        """Test invalid input is rejected without reaching the workers."""
+        self.assertEqual(self.request('/workflow', {'text': SAMPLE_JOB})[0], 400)
+        self.assertEqual(self.request('/workflow', ['not', 'an', 'object'])[0], 400)
+        self.assertEqual(self.request('/nope', {})[0], 404)
+        self.assertEqual(self.request('/nope')[0], 404)
+
+    def test_concurrent_requests_are_batched(self):
+        """Test requests arriving together share worker batches."""
+        jobs = [SAMPLE_JOB.replace('agent frameworks', f'agent{i} frameworks') for i in range(16)]
+
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(lambda job: self.request_json('/workflow', {'job_text': job}),
+                                    jobs))
+
+        for i, (status, result) in enumerate(results):
+            self.assertEqual(status, 200)
+            self.assertIn(f'agent{i} frameworks', result['extracted_data']['must_haves'][0])
+
+        self.assertEqual(self.server.metrics.batch_items, 16)
+        self.assertLess(self.server.metrics.batches, 16)
+
+    def test_health_and_metrics(self):
+        """Test health and Prometheus metrics endpoints."""
+        self.request('/workflow', {'job_text': SAMPLE_JOB})
+
+        status, health = self.request_json('/health')
+        self.assertEqual(status, 200)
+        self.assertEqual(health['status'], 'ok')
+
+        status, metrics = self.request('/metrics')
+        self.assertEqual(status, 200)
+        self.assertIn('genai_requests_total{endpoint="workflow",status="200"} 1', metrics)
+        self.assertIn('genai_batches_total 1', metrics)
+        self.assertIn('genai_request_seconds_count{endpoint="workflow"} 1', metrics)
+
+    def test_voice_profiles(self):
+        """Test the voice profile listing."""
+        status, result = self.request_json('/voice-profiles')
+
+        self.assertEqual(status, 200)
+        self.assertEqual(result['voice_profiles'][0]['name'], 'VP of Edge AI')
+        self.assertEqual(result['default'], 'VP of Edge AI')
+
+    def test_email_voice_profile(self):
+        """Test emails can pick a registered voice and unknown voices are rejected."""
+        status, email = self.request_json('/email', {'job_context': 'x',
+                                                     'voice_profile': 'VP of Edge AI'})
+        self.assertEqual(status, 200)
+        self.assertIn('As Vice President of Edge AI,', email['intro_email'])
+
+        status, error = self.request_json('/email', {'voice_profile': 'CEO'})
+        self.assertEqual(status, 400)
+        self.assertIn("Unknown voice profile: 'CEO'", error['error'])
+
+        for voice in (["CFO"], {'name': "CFO"}, 7):
+            status, error = self.request_json('/email', {'voice_profile': voice})
+            self.assertEqual(status, 400)
+            self.assertIn("'voice_profile' must be a string", error['error'])
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    """Thread pool recording the size of every batch submitted to it."""
+
+    def __init__(self, max_workers):
+        super().__init__(max_workers=max_workers)
+        self.chunks = []
+
+    def submit(self, fn, items, *args, **kwargs):
+        self.chunks.append(len(items))
+        return super().submit(fn, items, *args, **kwargs)
+
+
+class TestMicroBatcher(unittest.TestCase):
+    """Test cases for splitting batches over the worker pool."""
+
+    def test_burst_is_spread_over_workers(self):
+        executor = CountingExecutor(max_workers=4)
+        self.addCleanup(executor.shutdown)
+        batcher = MicroBatcher(executor, max_batch=16, max_wait=0.2, workers=4)
+        self.addCleanup(batcher.close)
+
+        futures = [batcher.submit('analyze', {'job_text': SAMPLE_JOB}) for _ in range(10)]
+        for future in futures:
+            self.assertEqual(future.result(timeout=30)['original_text'], SAMPLE_JOB)
+
+        self.assertEqual(executor.chunks, [3, 3, 2, 2])
+
+
+class TestAgentOptions(ServiceTestCase):
+    """Test agent options reach the workers' agents."""
+
+    agent_options = {'email_backend': SectionBackend(), 'section_timeout': 5, 'fallback': True}
+
+    def test_email_uses_the_configured_backend(self):
+        status, result = self.request_json('/email', {'job_context': "Summary"})
+        self.assertEqual(status, 200)
+        self.assertIn("Dear Team,\n\nOPENING", result['intro_email'])
+
+
+class TestAgentServiceProcessPool(ServiceTestCase):
+    """Test the service with real worker processes."""
+
+    workers = 2
+    max_wait_ms = 5.0
+
+    def test_workflow_on_worker_processes(self):
+        """Test requests are served by the warm process pool."""
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(
+                lambda _: self.request_json('/workflow', {'job_text': SAMPLE_JOB}), range(8)
+            ))
+
+        self.assertTrue(all(status == 200 for status, _ in results))
+        self.assertEqual(self.request_json('/health')[1]['workers'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
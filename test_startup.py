@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Tests for CLI startup time
+"""
+
+import os
+import subprocess
+import sys
+import time
+import unittest
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+CLI = Path(__file__).resolve().parent / "cli.py"
+
+# Cold start of ``cli.py --help`` beyond a bare interpreter, in milliseconds.
+# Loading the agent alone costs more than this; slow machines can raise it.
+COLD_START_BUDGET_MS = float(os.environ.get('GENAI_COLD_START_BUDGET_MS', 60))
+
+# Modules ``--help`` must not load; each belongs to a command that needs it.
+DEFERRED_MODULES = ('genai_agent', 'asyncio', 'tarfile', 'zipfile', 'orjson',
+                    'output_sinks', 'instrumentation', 'serialization')
+
+
+def run_ms(*args):
+    started = time.perf_counter()
+    subprocess.run([sys.executable, *args], capture_output=True, check=True)
+    return (time.perf_counter() - started) * 1000
+
+
+class TestStartup(unittest.TestCase):
+    """Test cases for the CLI's import time."""
+
+    def test_help_imports_nothing_heavy(self):
+        proc = subprocess.run([sys.executable, '-X', 'importtime', str(CLI), '--help'],
+                              capture_output=True, text=True)
+
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+        imported = {line.rsplit('|', 1)[-1].strip() for line in proc.stderr.splitlines()
+                    if line.startswith('import time:')}
+        self.assertFalse(imported & set(DEFERRED_MODULES))
+
+    def test_cold_start_budget(self):
+        """Test ``--help`` starts within budget of a bare interpreter."""
+        overheads = [run_ms(str(CLI), '--help') - run_ms('-c', 'pass') for _ in range(5)]
+
+        self.assertLess(min(overheads), COLD_START_BUDGET_MS,
+                        f"cli.py --help took {min(overheads):.1f} ms over a bare interpreter")
+
+    def test_profile_startup_reports_imports(self):
+        proc = subprocess.run([sys.executable, str(CLI), '--profile-startup', '--help'],
+                              capture_output=True, text=True)
+
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+        self.assertIn("usage:", proc.stdout)
+        self.assertIn("== startup:", proc.stderr)
+        self.assertIn("argparse", proc.stderr)
+        self.assertNotIn("import time:", proc.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming JSONL pipeline
+"""
+
+import io
+import json
+import os
+import sys
+import tempfile
+import types
+import unittest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from streaming import iter_records, process_records, run_stream, write_jsonl
+
+
+SAMPLE_JOB = """
+Must-Haves
+* Mastery of GenAI and agent frameworks
+
+Success Metrics
+* ≥ 5 production agents live by day 30
+"""
+
+
+class TestStreaming(unittest.TestCase):
+    """Test cases for JSONL streaming."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.lines = [
+            json.dumps({'id': 'job-1', 'text': SAMPLE_JOB}) + '\n',
+            '\n',
+            '{not json\n',
+            json.dumps({'id': 'job-2', 'body': SAMPLE_JOB}) + '\n',
+            json.dumps({'text': SAMPLE_JOB}) + '\n',
+        ]
+
+    def test_iter_records(self):
+        """Test records are parsed lazily and errors are reported per line."""
+        records = iter_records(self.lines)
+        self.assertIsInstance(records, types.GeneratorType)
+
+        records = list(records)
+        self.assertEqual(len(records), 4)
+        self.assertEqual(records[0], ('job-1', SAMPLE_JOB, None))
+        self.assertEqual(records[1][0], 3)
+        self.assertIn('JSONDecodeError', records[1][2])
+        self.assertIn("missing text field 'text'", records[2][2])
+        self.assertEqual(records[3][0], 5)
+
+    def test_custom_fields(self):
+        """Test alternative text and id field names."""
+        records = list(iter_records(self.lines, text_field='body'))
+        self.assertEqual(records[2], ('job-2', SAMPLE_JOB, None))
+
+    def test_write_jsonl(self):
+        """Test one compact JSON line is written per input record."""
+        out = io.StringIO()
+        counts = write_jsonl(process_records(iter_records(self.lines)), out)
+
+        self.assertEqual(counts, {'succeeded': 2, 'failed': 2})
+
+        results = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([r['id'] for r in results], ['job-1', 3, 'job-2', 5])
+        self.assertIn('Success Metrics', results[0]['job_summary'])
+        self.assertIn('extracted_data', results[0])
+        self.assertIn('error', results[1])
+
+    def test_run_stream_files(self):
+        """Test streaming from one file into another."""
+        with tempfile.TemporaryDirectory() as tmp:
+            input_path = os.path.join(tmp, 'in.jsonl')
+            output_path = os.path.join(tmp, 'out.jsonl')
+            with open(input_path, 'w', encoding='utf-8') as f:
+                f.writelines(self.lines)
+
+            counts = run_stream(input_path, output_path)
+
+            with open(output_path, encoding='utf-8') as f:
+                self.assertEqual(len(f.readlines()), 4)
+        self.assertEqual(counts['succeeded'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
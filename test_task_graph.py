@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Tests for the task graph scheduler and scheduled email sections
+"""
+
+import asyncio
+import os
+import sys
+import time
+import unittest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from genai_agent import EMAIL_SECTION_PROMPTS, EmailGenerator, GenAIAgent
+from instrumentation import Tracer
+from task_graph import Task, run_graph, topological_order
+
+
+def after(delay, value):
+    async def run(done):
+        await asyncio.sleep(delay)
+        return value(done) if callable(value) else value
+    return run
+
+
+class SlowBackend:
+    """Backend taking ``delays[section]`` seconds per section, recording start order."""
+
+    def __init__(self, delays, default=0.1):
+        self.delays = delays
+        self.default = default
+        self.started = []
+
+    async def complete(self, messages):
+        content = messages[-1]['content']
+        section = content.split('Section: ')[1].split('\n')[0]
+        self.started.append(section)
+        if self.delays.get(section) == 'fail':
+            raise RuntimeError("backend down")
+        await asyncio.sleep(self.delays.get(section, self.default))
+        return f"[{section}]" + (" after metrics" if "[metrics]" in content else "")
+
+    def signature(self):
+        return 'slow'
+
+
+class TestTaskGraph(unittest.TestCase):
+    """Test cases for topological_order and run_graph."""
+
+    def test_order_and_validation(self):
+        self.assertEqual(topological_order({'c': ['a', 'b'], 'a': [], 'b': ['a']}),
+                         ['a', 'b', 'c'])
+        with self.assertRaisesRegex(ValueError, "unknown task"):
+            topological_order({'a': ['missing']})
+        with self.assertRaisesRegex(ValueError, "cycle"):
+            topological_order({'a': ['b'], 'b': ['a'], 'c': []})
+
+    def test_independent_tasks_overlap_and_dependents_wait(self):
+        tasks = {
+            'a': Task(after(0.1, 1)),
+            'b': Task(after(0.1, 2)),
+            'c': Task(after(0.1, 3)),
+            'sum': Task(after(0.0, lambda done: done['a'] + done['c']), ('a', 'c')),
+        }
+
+        started = time.perf_counter()
+        results = asyncio.run(run_graph(tasks))
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(results, {'a': 1, 'b': 2, 'c': 3, 'sum': 4})
+        self.assertLess(elapsed, 0.25)
+
+    def test_timeouts_and_errors_use_fallbacks(self):
+        async def broken(done):
+            raise RuntimeError("boom")
+
+        fell_back = []
+        tasks = {
+            'slow': Task(after(5, 'late'), fallback=lambda done: 'default'),
+            'broken': Task(broken, fallback=lambda done: 'fixed'),
+            'next': Task(after(0.0, lambda done: done['slow'] + '+'), ('slow',)),
+        }
+
+        started = time.perf_counter()
+        results = asyncio.run(run_graph(tasks, timeout=0.05,
+                                        on_fallback=lambda name, e: fell_back.append((name, type(e)))))
+
+        self.assertLess(time.perf_counter() - started, 1)
+        self.assertEqual(results, {'slow': 'default', 'broken': 'fixed', 'next': 'default+'})
+        self.assertEqual(sorted(fell_back), [('broken', RuntimeError), ('slow', TimeoutError)])
+
+    def test_failure_without_fallback_cancels_the_rest(self):
+        cancelled = []
+
+        async def long_running(done):
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        tasks = {'long': Task(long_running), 'slow': Task(after(5, None))}
+        with self.assertRaises(TimeoutError):
+            asyncio.run(run_graph({**tasks, 'quick': Task(after(0.0, None))}, timeout=0.05))
+        self.assertEqual(cancelled, [True])
+
+
+class TestScheduledSections(unittest.TestCase):
+    """Test cases for EmailGenerator's scheduled backend sections."""
+
+    def test_latency_is_the_slowest_chain(self):
+        backend = SlowBackend({'vision': 0.3})
+        generator = EmailGenerator(backend=backend)
+
+        started = time.perf_counter()
+        email = generator.generate_intro_email("Summary")
+        elapsed = time.perf_counter() - started
+
+        # vision alone (0.3 s) outlasts metrics -> closing (0.2 s)
+        self.assertLess(elapsed, 0.45)
+        self.assertEqual(backend.started[-1], 'closing')
+        self.assertIn("[closing] after metrics", email)
+        for section in EMAIL_SECTION_PROMPTS:
+            self.assertIn(f"[{section}]", email)
+
+    def test_slow_or_failing_sections_fall_back_to_template(self):
+        tracer = Tracer()
+        template = EmailGenerator().generate_intro_email("Summary")
+        generator = EmailGenerator(backend=SlowBackend({'vision': 5, 'execution': 'fail'}),
+                                   tracer=tracer, section_timeout=0.3, fallback=True)
+
+        started = time.perf_counter()
+        email = generator.generate_intro_email("Summary")
+
+        self.assertLess(time.perf_counter() - started, 1)
+        vision = generator._template_sections(generator._resolve_voice(None))['vision']
+        self.assertIn(vision, template)
+        self.assertIn(vision, email)
+        self.assertIn("[opening]", email)
+        self.assertNotIn("[vision]", email)
+        self.assertEqual(tracer.counters['email_section_fallbacks'], 2)
+
+    def test_agent_passes_timeout_and_fallback_on(self):
+        agent = GenAIAgent(email_backend=SlowBackend({'vision': 5}), section_timeout=0.3,
+                           fallback=True)
+        email = agent.run_complete_workflow("Must-Haves\n* Python\n")['intro_email']
+        self.assertIn("[opening]", email)
+        self.assertNotIn("[vision]", email)
+
+    def test_timeout_without_fallback_raises(self):
+        generator = EmailGenerator(backend=SlowBackend({'vision': 5}), section_timeout=0.05)
+
+        with self.assertRaises(TimeoutError):
+            generator.generate_intro_email("Summary")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Tests for the voice profile registry
+"""
+
+import dataclasses
+import json
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import unittest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from genai_agent import VP_EDGE_AI_PROFILE, EmailGenerator, GenAIAgent, VoiceProfile
+from voice_profiles import (
+    VoiceProfileError, VoiceProfileRegistry, builtin_registry, load_profile_file,
+    profile_from_dict
+)
+
+
+CTO_YAML = """\
+name: CTO
+role: Chief Technology Officer
+communication_style:
+  directness: high
+key_phrases: [build it right]
+priorities: [Reliability]
+tone_descriptors: [calm, precise]
+"""
+
+CFO = {
+    'name': 'CFO',
+    'role': 'Chief Financial Officer',
+    'communication_style': {'metrics_driven': True},
+    'key_phrases': ['return on investment'],
+    'priorities': ['Margins'],
+    'tone_descriptors': ['measured'],
+}
+
+
+class TestVoiceProfileRegistry(unittest.TestCase):
+    """Test cases for loading, validating and reloading profiles."""
+
+    def setUp(self):
+        """Create a profile directory with one YAML and one JSON file."""
+        self.voice_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.voice_dir)
+        self.cto_path = os.path.join(self.voice_dir, 'cto.yaml')
+        self.write(self.cto_path, CTO_YAML)
+        self.write(os.path.join(self.voice_dir, 'finance.json'), json.dumps({'profiles': [CFO]}))
+        self.write(os.path.join(self.voice_dir, 'notes.txt'), 'ignored')
+
+    def write(self, path, text, mtime=None):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+
+    def test_load_directory(self):
+        """Test YAML and JSON profiles load alongside the built-in voice."""
+        registry = VoiceProfileRegistry([self.voice_dir])
+
+        self.assertEqual(sorted(registry.names()), ['CFO', 'CTO', 'VP of Edge AI'])
+        self.assertEqual(registry.default_name, 'VP of Edge AI')
+        self.assertEqual(registry.profile('CTO').role, 'Chief Technology Officer')
+        self.assertIs(registry.get('CTO'), registry.get('CTO'))
+        self.assertEqual(registry.get('CFO').prompt_context,
+                         VoiceProfile(**CFO).to_prompt_context())
+
+    def test_validation(self):
+        """Test malformed profiles are rejected with the offending field."""
+        with self.assertRaisesRegex(VoiceProfileError, 'missing field'):
+            profile_from_dict({'name': 'X'})
+        with self.assertRaisesRegex(VoiceProfileError, "'key_phrases' must be a list"):
+            profile_from_dict({**CFO, 'key_phrases': 'one phrase'})
+        with self.assertRaisesRegex(VoiceProfileError, 'unknown field'):
+            profile_from_dict({**CFO, 'nickname': 'Money'})
+
+        broken = os.path.join(self.voice_dir, 'broken.yaml')
+        self.write(broken, "name: [unclosed")
+        with self.assertRaises(VoiceProfileError):
+            load_profile_file(broken)
+        with self.assertRaises(VoiceProfileError):
+            VoiceProfileRegistry([self.voice_dir])
+        with self.assertRaises(VoiceProfileError):
+            VoiceProfileRegistry([os.path.join(self.voice_dir, 'missing.yaml')])
+
+    def test_unknown_name(self):
+        """Test unknown names raise and unknown defaults are refused."""
+        registry = VoiceProfileRegistry([self.voice_dir], default='CTO')
+        self.assertEqual(registry.default.profile.name, 'CTO')
+        self.assertIsNone(registry.find('CEO'))
+        with self.assertRaises(VoiceProfileError):
+            registry.get('CEO')
+        with self.assertRaises(VoiceProfileError):
+            VoiceProfileRegistry([self.voice_dir], default='CEO')
+
+    def test_hot_reload(self):
+        """Test edited, added and broken files are picked up without a restart."""
+        registry = VoiceProfileRegistry([self.voice_dir], check_interval=0)
+        old_cto = registry.get('CTO')
+
+        self.write(self.cto_path, CTO_YAML.replace('Chief Technology Officer', 'CTO & Founder'),
+                   mtime=2000000000)
+        self.write(os.path.join(self.voice_dir, 'ceo.json'),
+                   json.dumps({**CFO, 'name': 'CEO', 'role': 'Chief Executive Officer'}))
+
+        self.assertEqual(registry.profile('CTO').role, 'CTO & Founder')
+        self.assertIsNot(registry.get('CTO'), old_cto)
+        self.assertIn('CEO', registry.names())
+
+        # A broken edit keeps the last good version and reports the error
+        self.write(self.cto_path, "role: [", mtime=2000000100)
+        self.assertEqual(registry.profile('CTO').role, 'CTO & Founder')
+        self.assertIn(self.cto_path, registry.errors)
+
+        os.remove(self.cto_path)
+        self.assertNotIn('CTO', registry.names())
+
+    def test_check_interval_limits_stats(self):
+        """Test files are not re-checked before the interval has passed."""
+        registry = VoiceProfileRegistry([self.voice_dir], check_interval=3600)
+        self.write(os.path.join(self.voice_dir, 'ceo.json'),
+                   json.dumps({**CFO, 'name': 'CEO'}))
+
+        self.assertNotIn('CEO', registry.names())
+        self.assertTrue(registry.reload())
+        self.assertIn('CEO', registry.names())
+
+
+class TestVoiceProfile(unittest.TestCase):
+    """Test cases for the immutable VoiceProfile."""
+
+    def test_shared_profile_cannot_be_changed(self):
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            VP_EDGE_AI_PROFILE.role = "Intern"
+        with self.assertRaises(AttributeError):
+            VP_EDGE_AI_PROFILE.key_phrases.append("synergy")
+        with self.assertRaises(TypeError):
+            VP_EDGE_AI_PROFILE.communication_style['urgency'] = 'low'
+
+    def test_copies_and_plain_data(self):
+        source = {**CFO, 'communication_style': {'directness': 'high'}}
+        profile = VoiceProfile(**source)
+        source['communication_style']['directness'] = 'none'
+
+        self.assertEqual(profile.communication_style['directness'], 'high')
+        self.assertEqual(pickle.loads(pickle.dumps(profile)), profile)
+        self.assertEqual(json.loads(json.dumps(profile.to_dict()))['key_phrases'],
+                         list(profile.key_phrases))
+        changed = dataclasses.replace(profile, role='Group CFO')
+        self.assertIn('Group CFO', changed.to_prompt_context())
+
+
+class TestEmailVoices(unittest.TestCase):
+    """Test EmailGenerator lookups through the registry."""
+
+    def setUp(self):
+        """Register an extra voice."""
+        self.registry = VoiceProfileRegistry()
+        self.registry.register(VoiceProfile(**CFO))
+
+    def test_builtin_voice_shared(self):
+        """Test generators share the compiled built-in voice."""
+        self.assertIs(EmailGenerator().vp_voice_profile, VP_EDGE_AI_PROFILE)
+        self.assertIs(builtin_registry(), builtin_registry())
+
+    def test_generate_by_name(self):
+        """Test emails can name their voice and sections are compiled once."""
+        generator = EmailGenerator(voice_profiles=self.registry)
+
+        email = generator.generate_intro_email("context", voice_profile='CFO')
+        self.assertIn('As Chief Financial Officer,', email)
+        sections = generator._template_sections(self.registry.get('CFO'))
+        generator.generate_intro_email("other context", voice_profile='CFO')
+        self.assertIs(generator._template_sections(self.registry.get('CFO')), sections)
+
+        default_email = generator.generate_intro_email("context")
+        self.assertIn('As Vice President of Edge AI,', default_email)
+
+    def test_sections_are_per_generator(self):
+        """Test a subclass's sections never leak into other generators sharing a voice."""
+        class CustomOpening(EmailGenerator):
+            def _generate_opening(self, context, voice_profile):
+                return "CUSTOM OPENING"
+
+        voice = builtin_registry().default
+        plain = EmailGenerator()._template_sections(voice)
+        custom = CustomOpening()._template_sections(voice)
+
+        self.assertEqual(custom['opening'], "CUSTOM OPENING")
+        self.assertNotEqual(plain['opening'], "CUSTOM OPENING")
+        self.assertNotEqual(EmailGenerator()._template_sections(voice)['opening'], "CUSTOM OPENING")
+
+    def test_compiled_templates_are_per_generator(self):
+        """Test generators sharing a voice and template still render their own sections."""
+        class CustomOpening(EmailGenerator):
+            def _generate_opening(self, context, voice_profile):
+                return "CUSTOM OPENING"
+
+        plain = EmailGenerator().generate_intro_email("context")
+        custom = CustomOpening().generate_intro_email("context")
+
+        self.assertIn("CUSTOM OPENING", custom)
+        self.assertNotIn("CUSTOM OPENING", plain)
+        self.assertNotIn("CUSTOM OPENING", EmailGenerator().generate_intro_email("context"))
+
+    def test_edited_voice_rebuilds_sections(self):
+        """Test sections follow a voice re-registered under the same name."""
+        generator = EmailGenerator(voice_profiles=self.registry)
+        generator.generate_intro_email("x", voice_profile='CFO')
+        self.registry.register(VoiceProfile(**{**CFO, 'role': 'Group CFO'}))
+
+        self.assertIn('As Group CFO,', generator.generate_intro_email("x", voice_profile='CFO'))
+
+    def test_unregistered_profile_object(self):
+        """Test a VoiceProfile outside the registry still works."""
+        profile = VoiceProfile(**{**CFO, 'role': 'Interim CFO'})
+        email = EmailGenerator(voice_profiles=self.registry).generate_intro_email('x', profile)
+        self.assertIn('As Interim CFO,', email)
+
+    def test_agent_voice(self):
+        """Test the agent passes a voice name through."""
+        agent = GenAIAgent(voice_profiles=self.registry)
+        email = agent.generate_vp_intro_email("context", voice_profile='CFO')
+        self.assertIn('As Chief Financial Officer,', email)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,271 @@
+"""
+Voice profile registry for EmailGenerator
+
+Executive voices are kept as data files rather than code. A registry loads
+every profile from YAML or JSON files (or directories of them), validates
+it, and compiles it once: the prompt context and the system prompt sent to
+an LLM backend are built with the profile and reused for every email. Each
+EmailGenerator builds its own template sections and compiled templates once
+per voice ``version``. Lookups by name are dictionary accesses.
+
+Files are checked for changes at most once per ``check_interval`` seconds
+and reloaded in place, so a running service picks up edited voices without
+a restart. A file that fails to load during a reload is reported in
+``errors`` and its previous profiles stay active.
+
+A file holds one profile, a list of profiles or ``{"profiles": [...]}``::
+
+    name: CTO
+    role: Chief Technology Officer
+    communication_style: {directness: high, technical_depth: expert}
+    key_phrases: [build it right, measure twice]
+    priorities: [Reliability, Developer velocity]
+    tone_descriptors: [calm, precise]
+
+Usage:
+    registry = VoiceProfileRegistry(["voices/"])
+    agent = GenAIAgent(voice_profiles=registry)
+    agent.email_generator.generate_intro_email(summary, voice_profile="CTO")
+"""
+
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from genai_agent import EMAIL_SYSTEM_PROMPT, VP_EDGE_AI_PROFILE, VoiceProfile
+
+
+PROFILE_SUFFIXES = ('.yaml', '.yml', '.json')
+DEFAULT_CHECK_INTERVAL = 1.0
+
+# Field name -> expected type of the field (and of list items)
+_FIELDS = {
+    'name': str,
+    'role': str,
+    'communication_style': dict,
+    'key_phrases': (list, str),
+    'priorities': (list, str),
+    'tone_descriptors': (list, str),
+}
+
+
+class VoiceProfileError(ValueError):
+    """Raised for invalid profile files and unknown profile names."""
+
+
+class CompiledVoice:
+    """A voice profile with its prompt context built once."""
+
+    __slots__ = ('profile', 'prompt_context', 'system_prompt', 'version')
+
+    def __init__(self, profile: VoiceProfile):
+        self.profile = profile
+        self.prompt_context = profile.to_prompt_context()
+        self.system_prompt = EMAIL_SYSTEM_PROMPT + self.prompt_context
+        # Changes whenever any field of the profile does; generators key
+        # what they build for a voice by its name and version.
+        self.version = hashlib.sha256(self.prompt_context.encode('utf-8')).hexdigest()[:16]
+
+
+def profile_from_dict(data: Any, source: str = '<dict>') -> VoiceProfile:
+    """Validate a mapping and build a :class:`VoiceProfile` from it."""
+    if not isinstance(data, dict):
+        raise VoiceProfileError(f"{source}: profile must be a mapping, got {type(data).__name__}")
+
+    missing = [field for field in _FIELDS if field not in data]
+    if missing:
+        raise VoiceProfileError(f"{source}: missing field(s) {', '.join(missing)}")
+    unknown = sorted(set(data) - set(_FIELDS))
+    if unknown:
+        raise VoiceProfileError(f"{source}: unknown field(s) {', '.join(unknown)}")
+
+    for field, expected in _FIELDS.items():
+        value = data[field]
+        if isinstance(expected, tuple):
+            container, item = expected
+            if not isinstance(value, container) or not all(isinstance(v, item) for v in value):
+                raise VoiceProfileError(f"{source}: '{field}' must be a list of strings")
+        elif not isinstance(value, expected):
+            raise VoiceProfileError(f"{source}: '{field}' must be a {expected.__name__}")
+
+    if not data['name'].strip():
+        raise VoiceProfileError(f"{source}: 'name' must not be empty")
+    return VoiceProfile(**data)
+
+
+def load_profile_file(path: Union[str, Path]) -> List[VoiceProfile]:
+    """Load and validate every profile in one YAML or JSON file."""
+    path = Path(path)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            if path.suffix in ('.yaml', '.yml'):
+                import yaml
+                data = yaml.safe_load(f)
+            else:
+                data = json.load(f)
+    except (OSError, ValueError) as e:
+        raise VoiceProfileError(f"{path}: {e}") from e
+    except ImportError as e:
+        raise VoiceProfileError(f"{path}: PyYAML is required for YAML profiles") from e
+    except Exception as e:
+        # yaml.YAMLError and friends
+        raise VoiceProfileError(f"{path}: {type(e).__name__}: {e}") from e
+
+    if isinstance(data, dict) and 'profiles' in data:
+        data = data['profiles']
+    items = data if isinstance(data, list) else [data]
+    return [profile_from_dict(item, f"{path}[{i}]") for i, item in enumerate(items)]
+
+
+class VoiceProfileRegistry:
+    """Named voice profiles loaded from files, compiled once and hot-reloaded.
+
+    ``paths`` are profile files or directories (searched for
+    ``*.yaml``/``*.yml``/``*.json``). The built-in VP of Edge AI profile is
+    registered first unless ``include_builtin`` is False; a file profile with
+    the same name replaces it. ``default`` names the profile used when none
+    is requested.
+    """
+
+    def __init__(self, paths: Iterable[Union[str, Path]] = (), include_builtin: bool = True,
+                 default: Optional[str] = None,
+                 check_interval: float = DEFAULT_CHECK_INTERVAL):
+        self.paths = [Path(p) for p in paths]
+        self.include_builtin = include_builtin
+        self.check_interval = check_interval
+        self.errors: Dict[str, str] = {}
+        self.reloads = 0
+
+        self._lock = threading.Lock()
+        self._builtin = CompiledVoice(VP_EDGE_AI_PROFILE) if include_builtin else None
+        self._files: Dict[Path, Tuple[int, int]] = {}
+        self._by_file: Dict[Path, List[CompiledVoice]] = {}
+        self._extra: Dict[str, CompiledVoice] = {}
+        self._profiles: Dict[str, CompiledVoice] = {}
+        self._next_check = 0.0
+
+        self.reload(strict=True)
+        self.default_name = default or (VP_EDGE_AI_PROFILE.name if include_builtin
+                                        else next(iter(self._profiles), None))
+        if self.default_name not in self._profiles:
+            raise VoiceProfileError(f"Unknown default voice profile: {self.default_name!r}")
+
+    def _discover(self) -> Dict[Path, Tuple[int, int]]:
+        """Stat every profile file under ``paths``."""
+        found: Dict[Path, Tuple[int, int]] = {}
+        for path in self.paths:
+            files = ([p for p in sorted(path.iterdir()) if p.suffix in PROFILE_SUFFIXES]
+                     if path.is_dir() else [path])
+            for file in files:
+                try:
+                    stat = file.stat()
+                except OSError:
+                    continue
+                found[file] = (stat.st_mtime_ns, stat.st_size)
+        return found
+
+    def reload(self, strict: bool = False) -> bool:
+        """Re-read changed, new and deleted files; return True if anything changed.
+
+        With ``strict`` any invalid file raises :class:`VoiceProfileError`;
+        otherwise the error is recorded in ``errors`` and the file's previous
+        profiles are kept.
+        """
+        with self._lock:
+            self._next_check = time.monotonic() + self.check_interval
+            found = self._discover()
+            if strict:
+                missing = [str(p) for p in self.paths if not p.exists()]
+                if missing:
+                    raise VoiceProfileError(f"Voice profile path not found: {', '.join(missing)}")
+            if found == self._files and self._profiles:
+                return False
+
+            by_file = {path: voices for path, voices in self._by_file.items() if path in found}
+            for path, signature in found.items():
+                if self._files.get(path) == signature and path in by_file:
+                    continue
+                try:
+                    by_file[path] = [CompiledVoice(p) for p in load_profile_file(path)]
+                    self.errors.pop(str(path), None)
+                except VoiceProfileError as e:
+                    if strict:
+                        raise
+                    self.errors[str(path)] = str(e)
+
+            profiles: Dict[str, CompiledVoice] = {}
+            if self._builtin is not None:
+                profiles[self._builtin.profile.name] = self._builtin
+            for voices in by_file.values():
+                for voice in voices:
+                    profiles[voice.profile.name] = voice
+            profiles.update(self._extra)
+
+            changed = self._profiles.keys() != profiles.keys() or any(
+                self._profiles[name] is not voice for name, voice in profiles.items()
+            )
+            self._files = found
+            self._by_file = by_file
+            self._profiles = profiles
+            if changed:
+                self.reloads += 1
+            return changed
+
+    def _maybe_reload(self):
+        if self.paths and time.monotonic() >= self._next_check:
+            self.reload()
+
+    def register(self, profile: VoiceProfile) -> CompiledVoice:
+        """Add (or replace) a profile given in code."""
+        voice = CompiledVoice(profile)
+        with self._lock:
+            self._extra[profile.name] = voice
+            self._profiles = {**self._profiles, profile.name: voice}
+        return voice
+
+    def get(self, name: Optional[str] = None) -> CompiledVoice:
+        """Return the compiled profile called ``name`` (default profile if None)."""
+        self._maybe_reload()
+        try:
+            return self._profiles[self.default_name if name is None else name]
+        except KeyError:
+            raise VoiceProfileError(f"Unknown voice profile: {name!r}") from None
+
+    def find(self, name: str) -> Optional[CompiledVoice]:
+        """Return the compiled profile called ``name``, or None."""
+        self._maybe_reload()
+        return self._profiles.get(name)
+
+    def profile(self, name: Optional[str] = None) -> VoiceProfile:
+        """Return the :class:`VoiceProfile` called ``name``."""
+        return self.get(name).profile
+
+    @property
+    def default(self) -> CompiledVoice:
+        return self.get()
+
+    def names(self) -> List[str]:
+        self._maybe_reload()
+        return list(self._profiles)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._profiles
+
+    def __len__(self) -> int:
+        return len(self._profiles)
+
+
+_shared_registry: Optional[VoiceProfileRegistry] = None
+_shared_lock = threading.Lock()
+
+
+def builtin_registry() -> VoiceProfileRegistry:
+    """Process-wide registry holding only the built-in profile."""
+    global _shared_registry
+    with _shared_lock:
+        if _shared_registry is None:
+            _shared_registry = VoiceProfileRegistry()
+        return _shared_registry